@@ -5,13 +5,51 @@ export const maxDuration = 60;
 
 const PDF_SERVICE_URL = process.env.PDF_SERVICE_URL || "http://localhost:8001";
 
+function withGameCounts(result: any) {
+  const allGames = result.games || [];
+  const completedCount = allGames.filter((g: any) => g.isCompleted).length;
+  const upcomingCount = allGames.length - completedCount;
+  return {
+    ...result,
+    games: allGames,
+    gameCount: allGames.length,
+    completedGamesCount: completedCount,
+    upcomingGamesCount: upcomingCount,
+    totalGamesInPdf: allGames.length,
+    source: "pdfplumber",
+  };
+}
+
 export async function POST(request: NextRequest) {
   try {
-    const formData = await request.formData();
-    const file = formData.get("file") as File;
-
     const { searchParams } = new URL(request.url);
     const school = searchParams.get("school");
+    const documentToken = searchParams.get("documentToken");
+
+    // School picked from a multi-school PDF the service already parsed:
+    // read it from the retained document. The client sends no PDF with a
+    // token, so when the lookup fails it is told to upload the PDF instead
+    if (documentToken && school) {
+      try {
+        const response = await fetch(
+          `${PDF_SERVICE_URL}/documents/${encodeURIComponent(documentToken)}/games?school=${encodeURIComponent(school)}`,
+          { signal: AbortSignal.timeout(15000) }
+        );
+        if (response.ok) {
+          return NextResponse.json(withGameCounts(await response.json()));
+        }
+        console.log(`[pdfplumber] Document token lookup failed (${response.status}), asking for the PDF`);
+      } catch (err) {
+        console.log(`[pdfplumber] Document token lookup error: ${err instanceof Error ? err.message : err}`);
+      }
+      return NextResponse.json(
+        { success: false, documentExpired: true },
+        { status: 404 }
+      );
+    }
+
+    const formData = await request.formData();
+    const file = formData.get("file") as File;
 
     if (!file || !file.name.toLowerCase().endsWith(".pdf")) {
       return NextResponse.json(
@@ -22,21 +60,21 @@ export async function POST(request: NextRequest) {
 
     const fileBuffer = await file.arrayBuffer();
 
-    // Step 1: Always try pdfplumber first
-    const fileBlob = new Blob([fileBuffer], { type: file.type || "application/pdf" });
-    const pdfFormData = new FormData();
-    pdfFormData.append("file", fileBlob, file.name);
-
+    // Step 1: Always try pdfplumber first. The PDF is sent as the raw
+    // request body, so neither side builds or parses a multipart form
     const url = school
-      ? `${PDF_SERVICE_URL}/extract?school=${encodeURIComponent(school)}`
-      : `${PDF_SERVICE_URL}/extract`;
+      ? `${PDF_SERVICE_URL}/extract/raw?school=${encodeURIComponent(school)}`
+      : `${PDF_SERVICE_URL}/extract/raw`;
 
     let pdfplumberError: string | null = null;
 
     try {
       const response = await fetch(url, {
         method: "POST",
-        body: pdfFormData,
+        // Ask the service to stop a little before we give up on it, so a
+        // slow PDF is cut short there instead of running on unread
+        headers: { "Content-Type": "application/pdf", "X-Request-Timeout": "14" },
+        body: fileBuffer,
         signal: AbortSignal.timeout(15000),
       });
 
@@ -52,17 +90,7 @@ export async function POST(request: NextRequest) {
 
         // pdfplumber found games — return them
         if (allGames.length > 0) {
-          const completedCount = allGames.filter((g: any) => g.isCompleted).length;
-          const upcomingCount = allGames.length - completedCount;
-          return NextResponse.json({
-            ...result,
-            games: allGames,
-            gameCount: allGames.length,
-            completedGamesCount: completedCount,
-            upcomingGamesCount: upcomingCount,
-            totalGamesInPdf: allGames.length,
-            source: "pdfplumber",
-          });
+          return NextResponse.json(withGameCounts(result));
         }
 
         // Step 3: pdfplumber returned 0 games — fall through to vision
@@ -21,8 +21,9 @@ export default function FileUpload() {
   const [availableSchools, setAvailableSchools] = useState<AvailableSchool[]>([]);
   const [selectedSchool, setSelectedSchool] = useState<string>("");
   const [pendingFile, setPendingFile] = useState<File | null>(null);
+  const [documentToken, setDocumentToken] = useState<string | null>(null);
 
-  const handleFileSelect = async (file: File, schoolName?: string) => {
+  const handleFileSelect = async (file: File, schoolName?: string, token?: string | null) => {
     setParsing(true);
     setError(null);
     setInfo(null);
@@ -34,21 +35,35 @@ export default function FileUpload() {
         // PDF extraction flow
         setProcessingStatus("Extracting schedule from PDF...");
 
-        const formData = new FormData();
-        formData.append("file", file);
-
-        // Add school parameter if provided
-        const url = schoolName
-          ? `/api/process-pdf?school=${encodeURIComponent(schoolName)}`
+        // Add school parameter if provided. With the token of the already
+        // parsed document only the token and school are sent, so the PDF
+        // is neither uploaded nor parsed again
+        const params = new URLSearchParams();
+        if (schoolName) params.set("school", schoolName);
+        const useToken = Boolean(schoolName && token);
+        if (useToken) params.set("documentToken", token as string);
+        const url = params.toString()
+          ? `/api/process-pdf?${params.toString()}`
           : "/api/process-pdf";
 
+        let body: FormData | undefined;
+        if (!useToken) {
+          body = new FormData();
+          body.append("file", file);
+        }
+
         const response = await fetch(url, {
           method: "POST",
-          body: formData
+          body
         });
 
         const result = await response.json();
 
+        // The service no longer has the document; upload the PDF instead
+        if (useToken && result.documentExpired) {
+          return handleFileSelect(file, schoolName);
+        }
+
         // Check for specific error messages first
         if (result.error) {
           setError(result.error);
@@ -59,6 +74,7 @@ export default function FileUpload() {
         if (result.requiresSchoolSelection && result.availableSchools) {
           setAvailableSchools(result.availableSchools);
           setPendingFile(file);
+          setDocumentToken(result.documentToken || null);
           setParsing(false);
           setProcessingStatus(null);
           return; // Wait for school selection
@@ -148,18 +164,20 @@ export default function FileUpload() {
     setAvailableSchools([]);
     setSelectedSchool("");
     setPendingFile(null);
+    setDocumentToken(null);
   };
 
   const handleSchoolSelection = async () => {
     if (!selectedSchool || !pendingFile) return;
 
     // Re-process PDF with selected school
-    await handleFileSelect(pendingFile, selectedSchool);
+    await handleFileSelect(pendingFile, selectedSchool, documentToken);
 
     // Clear school selection state
     setAvailableSchools([]);
     setSelectedSchool("");
     setPendingFile(null);
+    setDocumentToken(null);
   };
 
   return (
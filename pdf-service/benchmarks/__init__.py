@@ -0,0 +1,7 @@
+"""
+Synthetic PDF generator and benchmark harness for the extraction pipeline.
+
+Run from the pdf-service directory:
+    python -m benchmarks.run
+    python -m benchmarks.synthetic texas_isd district.pdf --pages 24 --schools 12
+"""
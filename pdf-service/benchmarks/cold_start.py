@@ -0,0 +1,135 @@
+"""
+Cold-start benchmark: a fresh `uvicorn pdf_service:app`, as on a deploy.
+
+Each run starts the service in a new process and measures how long until
+it accepts connections, until /ready answers 200, and how long the first
+burst of requests (one per worker, sent together) and the next burst take.
+Runs alternate between warm-up on and off (PDF_WARMUP=0). With warm-up the
+first burst is sent once the service reports ready, as a load balancer
+would; without it, as soon as the port accepts connections.
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --workers 4 --repeat 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.synthetic import GENERATORS
+
+SERVICE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT_SECONDS = 120
+
+# Formats the request bursts cycle through, one document per request
+BURST_FORMATS = ('texas_isd', 'iowa_hs', 'maxpreps', 'schedule_star', 'cif_bracket')
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def _status(url: str) -> int:
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def _wait_until(check, deadline: float) -> None:
+    while time.perf_counter() < deadline:
+        try:
+            if check():
+                return
+        except OSError:
+            pass
+        time.sleep(0.01)
+    raise TimeoutError("service did not start in time")
+
+
+def _post_pdf(base: str, content: bytes) -> float:
+    """Seconds for one /extract/raw request."""
+    request = urllib.request.Request(
+        f"{base}/extract/raw", data=content, headers={'Content-Type': 'application/pdf'}, method='POST'
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request, timeout=60) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def _burst(base: str, documents: List[bytes]) -> float:
+    """Seconds until every document in a concurrent burst has its response."""
+    with ThreadPoolExecutor(max_workers=len(documents)) as executor:
+        return max(executor.map(lambda content: _post_pdf(base, content), documents))
+
+
+def _documents(count: int, salt: str) -> List[bytes]:
+    # A distinct trailing comment per document keeps the result cache out of it
+    return [
+        GENERATORS[BURST_FORMATS[i % len(BURST_FORMATS)]]() + f"\n%{salt}-{i}\n".encode()
+        for i in range(count)
+    ]
+
+
+def measure_start(workers: int, warmup: bool, run: int) -> Dict[str, float]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, PDF_WORKERS=str(workers), PDF_WARMUP='1' if warmup else '0', PDF_LOG_LEVEL='WARNING')
+    first_docs = _documents(workers, f"first-{run}-{warmup}")
+    second_docs = _documents(workers, f"second-{run}-{warmup}")
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'pdf_service:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = started + STARTUP_TIMEOUT_SECONDS
+        _wait_until(lambda: _status(f"{base}/") == 200, deadline)
+        listening = time.perf_counter() - started
+        _wait_until(lambda: _status(f"{base}/ready") == 200, deadline)
+        ready = time.perf_counter() - started
+        first = _burst(base, first_docs)
+        second = _burst(base, second_docs)
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    return {'listening': listening, 'ready': ready, 'firstBurst': first, 'secondBurst': second,
+            'firstServed': ready + first}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time a cold start of the service with and without warm-up")
+    parser.add_argument('--workers', type=int, default=2, help="PDF_WORKERS for the service (default: 2)")
+    parser.add_argument('--repeat', type=int, default=3, help="starts per mode; medians are reported")
+    args = parser.parse_args()
+
+    rows = {}
+    for mode, warmup in (('warm-up', True), ('no warm-up', False)):
+        runs = [measure_start(args.workers, warmup, run) for run in range(max(1, args.repeat))]
+        rows[mode] = {key: statistics.median(r[key] for r in runs) for key in runs[0]}
+
+    keys = ('listening', 'ready', 'firstBurst', 'secondBurst', 'firstServed')
+    print(f"{'mode':<12}" + ''.join(f"{k:>13}" for k in keys))
+    for mode, row in rows.items():
+        print(f"{mode:<12}" + ''.join(f"{row[k] * 1000:>11.0f}ms" for k in keys))
+    print(
+        f"\nMedian of {args.repeat} starts with {args.workers} workers. ready is when /ready first answered 200"
+        "\n(without warm-up, as soon as the server listens). firstBurst and secondBurst are the slowest of"
+        f"\n{args.workers} concurrent requests; firstServed is ready + firstBurst, the first answers after launch."
+    )
+
+
+if __name__ == '__main__':
+    main()
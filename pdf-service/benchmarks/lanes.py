@@ -0,0 +1,124 @@
+"""
+Scheduling benchmark: small team schedules uploaded while league PDFs keep
+every worker busy.
+
+Each mode starts a fresh `uvicorn pdf_service:app`. Background clients
+upload multi-page Texas ISD and Iowa HS PDFs back to back while a
+foreground client uploads one-page MaxPreps schedules at a steady rate,
+and the foreground latencies are reported. "lanes" is the default
+scheduling; "fifo" sets PDF_INTERACTIVE_MAX_MS high enough that every PDF
+goes in the interactive lane, i.e. one queue in arrival order.
+
+    python -m benchmarks.lanes
+    python -m benchmarks.lanes --workers 4 --seconds 30
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from benchmarks.cold_start import SERVICE_DIR, STARTUP_TIMEOUT_SECONDS, _free_port, _post_pdf, _status, _wait_until
+from benchmarks.synthetic import GENERATORS
+
+MODES = {
+    'lanes': {},
+    'fifo': {'PDF_INTERACTIVE_MAX_MS': str(10 ** 9)},
+}
+
+# Background documents, one league PDF per upload
+LEAGUE_OPTIONS = (
+    ('texas_isd', {'pages': 24, 'games': 20}),
+    ('iowa_hs', {'pages': 12, 'schools': 12}),
+)
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _background(base: str, stop: threading.Event, client: int, leagues: List[bytes], served: List[float]) -> None:
+    sent = 0
+    while not stop.is_set():
+        # A distinct trailing comment per document keeps the result cache out of it
+        content = leagues[(client + sent) % len(leagues)] + f"\n%league-{client}-{sent}\n".encode()
+        sent += 1
+        try:
+            served.append(_post_pdf(base, content))
+        except (urllib.error.URLError, OSError):
+            # 429 once the lane's queue is full; back off like a client would
+            time.sleep(0.5)
+
+
+def measure(mode: str, workers: int, seconds: float, interval: float) -> Dict[str, float]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, PDF_WORKERS=str(workers), PDF_LOG_LEVEL='WARNING', **MODES[mode])
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'pdf_service:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    # Generated up front so building PDFs doesn't compete with the clients
+    leagues = [GENERATORS[name](**options) for name, options in LEAGUE_OPTIONS]
+    team = GENERATORS['maxpreps']()
+    stop = threading.Event()
+    small: List[float] = []
+    league: List[float] = []
+    try:
+        _wait_until(lambda: _status(f"{base}/ready") == 200, time.perf_counter() + STARTUP_TIMEOUT_SECONDS)
+        clients = workers * 2
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            for client in range(clients):
+                executor.submit(_background, base, stop, client, leagues, league)
+            # Let the league uploads fill the workers and queue first
+            time.sleep(2)
+            end = time.perf_counter() + seconds
+            sent = 0
+            while time.perf_counter() < end:
+                content = team + f"\n%team-{sent}\n".encode()
+                sent += 1
+                small.append(_post_pdf(base, content))
+                time.sleep(interval)
+            stop.set()
+    finally:
+        stop.set()
+        process.terminate()
+        process.wait(timeout=30)
+    return {
+        'p50': statistics.median(small),
+        'p99': _percentile(small, 99),
+        'max': max(small),
+        'small': len(small),
+        'league': len(league),
+        'leagueP50': statistics.median(league) if league else float('nan'),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time small uploads behind league PDFs, with and without lanes")
+    parser.add_argument('--workers', type=int, default=2, help="PDF_WORKERS for the service (default: 2)")
+    parser.add_argument('--seconds', type=float, default=20, help="how long the small uploads run per mode")
+    parser.add_argument('--interval', type=float, default=0.1, help="pause between small uploads (seconds)")
+    args = parser.parse_args()
+
+    rows = {mode: measure(mode, args.workers, args.seconds, args.interval) for mode in MODES}
+    print(f"{'mode':<8}{'p50':>10}{'p99':>10}{'max':>10}{'small':>8}{'league':>8}{'leagueP50':>12}")
+    for mode, row in rows.items():
+        print(
+            f"{mode:<8}{row['p50'] * 1000:>8.0f}ms{row['p99'] * 1000:>8.0f}ms{row['max'] * 1000:>8.0f}ms"
+            f"{row['small']:>8}{row['league']:>8}{row['leagueP50'] * 1000:>10.0f}ms"
+        )
+    print(
+        f"\n{args.workers} workers, {args.workers * 2} clients uploading league PDFs back to back. p50/p99/max"
+        "\nare one-page MaxPreps uploads sent one at a time; league is how many league PDFs were served."
+    )
+
+
+if __name__ == '__main__':
+    main()
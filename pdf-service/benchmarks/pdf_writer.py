@@ -0,0 +1,60 @@
+"""
+Minimal dependency-free PDF writer for synthetic schedule fixtures.
+
+Pages hold Helvetica text placed by (x, top) in pdfplumber's coordinate
+system and straight lines for table rulings, which is all the extractors
+look at.
+"""
+from typing import List
+
+
+def _escape(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+class Page:
+    """One page's content stream, built up with text and line operators."""
+
+    def __init__(self, width: float = 612, height: float = 792):
+        self.width = width
+        self.height = height
+        self.ops: List[str] = []
+
+    def text(self, x: float, top: float, text: str, size: float = 10) -> None:
+        """Draw text with its top edge at `top` points from the top of the page."""
+        y = self.height - top - size
+        self.ops.append(f"BT /F1 {size} Tf {x:.2f} {y:.2f} Td ({_escape(text)}) Tj ET")
+
+    def line(self, x0: float, top0: float, x1: float, top1: float, width: float = 0.5) -> None:
+        self.ops.append(f"{width} w {x0:.2f} {self.height - top0:.2f} m {x1:.2f} {self.height - top1:.2f} l S")
+
+
+def build_pdf(pages: List[Page]) -> bytes:
+    """Serialize pages into a complete PDF file."""
+    objs: List[bytes] = []
+    objs.append(b"<< /Type /Catalog /Pages 2 0 R >>")
+    objs.append(b"")  # pages placeholder
+    objs.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    kids = []
+    for page in pages:
+        stream = "\n".join(page.ops).encode('latin-1')
+        objs.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_num = len(objs)
+        objs.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 %d %d] /Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>"
+            % (page.width, page.height, content_num)
+        )
+        kids.append(len(objs))
+    objs[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids))
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, obj in enumerate(objs, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % num + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    for off in offsets:
+        out += b"%010d 00000 n \n" % off
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objs) + 1, xref)
+    return bytes(out)
@@ -0,0 +1,87 @@
+"""
+Republish benchmark: a league PDF uploaded, then re-uploaded with a few
+pages changed, as when a district posts next week's version.
+
+Each mode starts a fresh `uvicorn pdf_service:app`, uploads the original
+and then the updated PDF, and reports how long the update took and the
+share of its pages reused from the page cache. "page cache" is the
+default; "no page cache" sets PDF_PAGE_CACHE_MAX_BYTES=0.
+
+    python -m benchmarks.republish
+    python -m benchmarks.republish --format iowa_hs --pages 12 --changed 2
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Dict, List
+
+from benchmarks.cold_start import SERVICE_DIR, STARTUP_TIMEOUT_SECONDS, _free_port, _post_pdf, _status, _wait_until
+from benchmarks.pdf_writer import build_pdf
+from benchmarks.synthetic import PAGE_BUILDERS
+
+MODES = {
+    'page cache': {},
+    'no page cache': {'PDF_PAGE_CACHE_MAX_BYTES': '0'},
+}
+
+# Page-splittable formats and the options of their league-sized documents
+LEAGUE_OPTIONS = {
+    'texas_isd': {'games': 20},
+    'iowa_hs': {'schools': 12},
+}
+
+
+def _versions(format_name: str, pages: int, changed: int) -> List[bytes]:
+    """The original PDF and an update with its last `changed` pages replaced."""
+    options = dict(LEAGUE_OPTIONS[format_name], pages=pages)
+    original = PAGE_BUILDERS[format_name](seed=1, **options)
+    update = PAGE_BUILDERS[format_name](seed=2, **options)
+    kept = pages - changed
+    return [build_pdf(original), build_pdf(original[:kept] + update[kept:])]
+
+
+def measure(mode: str, versions: List[bytes], pages: int, workers: int) -> Dict[str, float]:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    env = dict(os.environ, PDF_WORKERS=str(workers), PDF_LOG_LEVEL='WARNING', **MODES[mode])
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'uvicorn', 'pdf_service:app', '--port', str(port), '--log-level', 'warning'],
+        cwd=SERVICE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_until(lambda: _status(f"{base}/ready") == 200, time.perf_counter() + STARTUP_TIMEOUT_SECONDS)
+        original, update = (_post_pdf(base, content) for content in versions)
+        with urllib.request.urlopen(f"{base}/cache/stats", timeout=5) as response:
+            stats = json.loads(response.read())['pages']
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+    # The original's pages were all misses, so every hit is the update's
+    return {'original': original, 'update': update, 'reused': stats['hits'] / pages}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time re-extracting a league PDF with a few pages changed")
+    parser.add_argument('--format', choices=sorted(LEAGUE_OPTIONS), default='texas_isd')
+    parser.add_argument('--pages', type=int, default=24, help="pages in the document (default: 24)")
+    parser.add_argument('--changed', type=int, default=2, help="pages changed in the update (default: 2)")
+    parser.add_argument('--workers', type=int, default=2, help="PDF_WORKERS for the service (default: 2)")
+    args = parser.parse_args()
+
+    versions = _versions(args.format, args.pages, min(args.changed, args.pages))
+    rows = {mode: measure(mode, versions, args.pages, args.workers) for mode in MODES}
+    print(f"{'mode':<15}{'original':>10}{'update':>10}{'reused':>9}")
+    for mode, row in rows.items():
+        print(f"{mode:<15}{row['original'] * 1000:>8.0f}ms{row['update'] * 1000:>8.0f}ms{row['reused']:>9.0%}")
+    print(
+        f"\n{args.pages}-page {args.format} PDF, then the same with its last {args.changed} pages changed."
+        "\nreused is the share of the update's pages served from the page cache."
+    )
+
+
+if __name__ == '__main__':
+    main()
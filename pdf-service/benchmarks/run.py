@@ -0,0 +1,217 @@
+"""
+Extraction benchmark over synthetic PDFs of every format and several sizes.
+
+Each case runs in a fresh process so its peak RSS is its own. Stage times
+(open, detect, extract, fallback) are the median over --repeat runs. Every
+result is checked against benchmarks/golden.json, so a speedup that changes
+the extracted games fails the run.
+
+    python -m benchmarks.run                        # all cases, check golden
+    python -m benchmarks.run --sizes small --formats texas_isd,iowa_hs
+    python -m benchmarks.run --save-baseline before.json
+    python -m benchmarks.run --compare before.json
+    python -m benchmarks.run --update-golden        # after an intended output change
+"""
+import argparse
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from benchmarks.synthetic import GENERATORS
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'golden.json')
+STAGES = ('open', 'detect', 'extract', 'fallback')
+
+
+@dataclass(frozen=True)
+class Case:
+    format: str
+    size: str
+    options: Dict = field(default_factory=dict)
+    school: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.format}/{self.size}"
+
+
+CASES: List[Case] = [
+    Case('maxpreps', 'small', {'pages': 1}),
+    Case('maxpreps', 'medium', {'pages': 5}),
+    Case('maxpreps', 'large', {'pages': 20}),
+    Case('schedule_star', 'small', {'pages': 1}),
+    Case('schedule_star', 'medium', {'pages': 4}),
+    Case('schedule_star', 'large', {'pages': 12}),
+    Case('cif_bracket', 'small', {'pages': 1}),
+    Case('cif_bracket', 'medium', {'pages': 4}),
+    Case('cif_bracket', 'large', {'pages': 16}),
+    Case('texas_isd', 'small', {'pages': 2, 'schools': 3}, 'School1 HS'),
+    Case('texas_isd', 'medium', {'pages': 8, 'schools': 8, 'text_pages': 2}, 'School1 HS'),
+    Case('texas_isd', 'large', {'pages': 24, 'schools': 20, 'text_pages': 4}, 'School1 HS'),
+    Case('iowa_hs', 'small', {'pages': 1, 'schools': 6}, 'Town1, School1'),
+    Case('iowa_hs', 'medium', {'pages': 3, 'schools': 10}, 'Town1, School1'),
+    Case('iowa_hs', 'large', {'pages': 8, 'schools': 14, 'games': 12}, 'Town1, School1'),
+]
+
+
+def _peak_rss_mb() -> float:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure_case(content: bytes, school: Optional[str], repeat: int) -> Dict:
+    """Runs in a fresh worker process: extract `repeat` times and report."""
+    from pdf_service import _drain, iter_extraction
+
+    # Keep the report readable
+    logging.getLogger('pdf_service').setLevel(logging.WARNING)
+    rss_before = _peak_rss_mb()
+    runs = []
+    result = None
+    for _ in range(repeat):
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+        result = _drain(iter_extraction(content, school, timings=timings))
+        timings['total'] = time.perf_counter() - start
+        runs.append(timings)
+
+    peak = _peak_rss_mb()
+    return {
+        'ms': {
+            stage: round(statistics.median(run.get(stage, 0.0) for run in runs) * 1000, 2)
+            for stage in STAGES + ('total',)
+        },
+        'peakRssMb': round(peak, 1),
+        'rssGrowthMb': round(peak - rss_before, 1),
+        'result': result,
+    }
+
+
+def result_fingerprint(result: Dict) -> Dict:
+    """
+    What golden.json stores for a result: enough to detect any change to
+    the response. Internal keys (leading underscore) are left out, so
+    changes to what the service passes between its parts don't count.
+    """
+    public = {key: value for key, value in result.items() if not key.startswith('_')}
+    canonical = json.dumps(public, sort_keys=True, separators=(',', ':'))
+    return {
+        'format': result.get('_format'),
+        'gameCount': result.get('gameCount'),
+        'sha256': hashlib.sha256(canonical.encode()).hexdigest(),
+    }
+
+
+def run_cases(cases: List[Case], repeat: int) -> Dict[str, Dict]:
+    report = {}
+    for case in cases:
+        content = GENERATORS[case.format](**case.options)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            measured = executor.submit(measure_case, content, case.school, repeat).result()
+        result = measured.pop('result')
+        measured.update(
+            pages=case.options.get('pages', 1) + case.options.get('text_pages', 0),
+            bytes=len(content),
+            output=result_fingerprint(result),
+        )
+        report[case.name] = measured
+    return report
+
+
+def _load_json(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_json(path: str, data: Dict) -> None:
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def check_golden(report: Dict[str, Dict], golden: Dict[str, Dict]) -> List[str]:
+    """Case names whose output differs from golden (or has no golden entry)."""
+    return [name for name, row in report.items() if golden.get(name) != row['output']]
+
+
+def print_report(report: Dict[str, Dict], mismatched: List[str], baseline: Optional[Dict]) -> None:
+    header = f"{'case':<22}{'pages':>6}{'games':>7}" + ''.join(f"{s:>10}" for s in STAGES + ('total',))
+    header += f"{'rss MB':>9}{'vs base':>9}  golden"
+    print(header)
+    print('-' * len(header))
+    for name, row in report.items():
+        ms = row['ms']
+        line = f"{name:<22}{row['pages']:>6}{str(row['output']['gameCount']):>7}"
+        line += ''.join(f"{ms[s]:>10.1f}" for s in STAGES + ('total',))
+        line += f"{row['peakRssMb']:>9.1f}"
+        base = (baseline or {}).get('cases', {}).get(name)
+        if base and ms['total']:
+            line += f"{base['ms']['total'] / ms['total']:>8.2f}x"
+        else:
+            line += f"{'':>9}"
+        line += "  DIFF" if name in mismatched else "  ok"
+        print(line)
+    print("\nTimes are median milliseconds; 'vs base' is baseline total / current total.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark PDF extraction on synthetic documents")
+    parser.add_argument('--formats', help="comma-separated formats (default: all)")
+    parser.add_argument('--sizes', help="comma-separated sizes: small, medium, large (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per case (default: 3)")
+    parser.add_argument('--save-baseline', metavar='PATH', help="write this run's results to PATH")
+    parser.add_argument('--compare', metavar='PATH', help="compare against a saved baseline")
+    parser.add_argument('--update-golden', action='store_true', help="accept current outputs as golden")
+    args = parser.parse_args()
+
+    formats = set(args.formats.split(',')) if args.formats else None
+    sizes = set(args.sizes.split(',')) if args.sizes else None
+    cases = [
+        c for c in CASES
+        if (formats is None or c.format in formats) and (sizes is None or c.size in sizes)
+    ]
+    if not cases:
+        parser.error("no cases match --formats/--sizes")
+
+    report = run_cases(cases, max(1, args.repeat))
+
+    golden = _load_json(GOLDEN_PATH) if os.path.exists(GOLDEN_PATH) else {}
+    if args.update_golden:
+        golden.update({name: row['output'] for name, row in report.items()})
+        _write_json(GOLDEN_PATH, golden)
+        mismatched = []
+    else:
+        mismatched = check_golden(report, golden)
+
+    baseline = _load_json(args.compare) if args.compare else None
+    print_report(report, mismatched, baseline)
+
+    if args.save_baseline:
+        _write_json(args.save_baseline, {
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'cpus': os.cpu_count(),
+            'repeat': args.repeat,
+            'cases': report,
+        })
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if mismatched:
+        print(f"\nOutput changed for: {', '.join(mismatched)}")
+        print("If the change is intended, rerun with --update-golden.")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,226 @@
+"""
+Synthetic schedule PDFs in every supported layout.
+
+Each generator is deterministic for a given seed and takes the size knobs
+that make sense for its format: `pages`, `games` (per page; weeks per group
+for Iowa grids; teams per page for CIF brackets) and `schools` for the
+multi-school formats. GENERATORS return PDF bytes; PAGE_BUILDERS return the
+pages, so formats can be combined into one document.
+
+    python -m benchmarks.synthetic texas_isd district.pdf --pages 24 --schools 12
+    python -m benchmarks.synthetic warmup warmup.pdf    # the service's warm-up PDF
+"""
+import argparse
+import random
+from typing import Callable, Dict, List
+
+from benchmarks.pdf_writer import Page, build_pdf
+
+OPPONENTS = ["Central", "Westlake", "North Ridge", "Lakeside", "Pine Valley", "Eastwood", "Riverside", "Hillcrest"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def maxpreps_pages(pages: int = 1, games: int = 20, seed: int = 1) -> List[Page]:
+    """Printable MaxPreps team schedule: game line, then its time on the next line."""
+    rnd = random.Random(seed)
+    out = []
+    for page_index in range(pages):
+        page = Page()
+        top = 40
+        if page_index == 0:
+            page.text(40, top, "Printable Lincoln High School Basketball Schedule", 14)
+            top += 24
+            page.text(40, top, "Address: 123 Main St, Springfield, IL 62701")
+            top += 24
+        for _ in range(games):
+            month, day = rnd.choice([11, 12, 1, 2]), rnd.randint(1, 28)
+            away = "@ " if rnd.random() < .5 else ""
+            outcome = rnd.choice(["(W) 55-40", "(L) 61-50", "Preview Game", ""])
+            page.text(40, top, f"{month}/{day} {away}{rnd.choice(OPPONENTS)} (Springfield, IL) * {outcome}".rstrip())
+            top += 14
+            page.text(40, top, f"{rnd.randint(5, 7)}:{rnd.choice(['00', '30'])}p")
+            top += 16
+        out.append(page)
+    return out
+
+
+def schedule_star_pages(pages: int = 1, games: int = 20, seed: int = 1) -> List[Page]:
+    """Schedule Star team page: a Varsity section followed by a Junior Varsity one."""
+    rnd = random.Random(seed)
+    out = []
+    for page_index in range(pages):
+        page = Page()
+        top = 40
+        if page_index == 0:
+            for line in ("Schedule Star 866-448-9438", "Team Schedule Lincoln High School",
+                         "Springfield, IL 62701", "Boys Varsity"):
+                page.text(40, top, line)
+                top += 16
+        for _ in range(games):
+            league = "*" if rnd.random() < .3 else ""
+            page.text(
+                40, top,
+                f"{rnd.choice(DAYS)} 12/{rnd.randint(10, 28):02d}/25 {league}{rnd.choice(OPPONENTS)} "
+                f"{rnd.choice(['Home', 'Away'])} {rnd.choice(['TBA', '7:00 PM', '5:30PM'])}"
+            )
+            top += 14
+        if page_index == pages - 1:
+            for line in ("Boys Junior Varsity", "Friday 12/12/25 Central Home 5:00 PM", "*=League Event"):
+                page.text(40, top, line)
+                top += 16
+        out.append(page)
+    return out
+
+
+def cif_bracket_pages(pages: int = 1, games: int = 16, seed: int = 1) -> List[Page]:
+    """CIF-SS bracket: Round 1 header and date, then `games` team lines per page."""
+    out = []
+    team = 0
+    for page_index in range(pages):
+        page = Page()
+        top = 40
+        if page_index == 0:
+            for line in ("CIF-SS BOYS BASKETBALL CHAMPIONSHIPS", "Round 1 Round 2 Quarter Final",
+                         "02/11/2026 07:00 PM 02/13/2026 07:00 PM"):
+                page.text(40, top, line)
+                top += 16
+            top += 4
+        for slot in range(games):
+            host = " *" if slot % 2 == 0 else ""
+            name = f"School {chr(65 + team % 26)}{chr(65 + team // 26 % 26)}"
+            page.text(40, top, f"{name}{host} (League {team % 5}) 10-5-0")
+            top += 14
+            team += 1
+        page.text(40, top + 10, "*DENOTES HOST TEAM")
+        out.append(page)
+    return out
+
+
+TEXAS_HEADERS = ["Day Of Week", "Start Date", "Start Time", "School Name", "Location", "Sport", "Opponent", "Venue"]
+TEXAS_COLUMN_EDGES = [30, 95, 160, 215, 300, 350, 400, 520, 590]
+
+
+def texas_isd_pages(pages: int = 2, games: int = 20, schools: int = 3, text_pages: int = 0, seed: int = 1) -> List[Page]:
+    """
+    District-wide table: a titled, ruled table of `games` rows per page,
+    optionally followed by text-only pages with no tables.
+    """
+    rnd = random.Random(seed)
+    edges = TEXAS_COLUMN_EDGES
+    out = []
+    for _ in range(pages):
+        page = Page()
+        rows = [["VARSITY BASKETBALL SCHEDULE"] + [""] * 7, TEXAS_HEADERS]
+        for _ in range(games):
+            rows.append([
+                rnd.choice(DAYS[:5]), f"12/{rnd.randint(1, 28):02d}/2025", rnd.choice(["7:00PM", "TBA", "5:30 PM"]),
+                f"School{rnd.randrange(schools)} HS", rnd.choice(["Home", "Away"]), "Basketball",
+                rnd.choice(OPPONENTS) + " High School " + rnd.choice(["Tigers", "Eagles", "WHS", ""]), "Gym",
+            ])
+        row_tops = [30 + i * 16 for i in range(len(rows) + 1)]
+        for top in row_tops:
+            page.line(edges[0], top, edges[-1], top)
+        # The title row is one merged cell
+        for x in edges:
+            page.line(x, row_tops[0] if x in (edges[0], edges[-1]) else row_tops[1], x, row_tops[-1])
+        page.text(edges[0] + 2, row_tops[0] + 3, rows[0][0], 8)
+        for i, row in enumerate(rows[1:], 1):
+            for j, cell in enumerate(row):
+                if cell:
+                    page.text(edges[j] + 2, row_tops[i] + 3, cell[:30], 6)
+        out.append(page)
+    for _ in range(text_pages):
+        page = Page()
+        page.text(40, 60, "District notes and policies")
+        for i in range(20):
+            page.text(40, 80 + i * 14, f"Note {i}: all games subject to change without notice.")
+        out.append(page)
+    return out
+
+
+def iowa_hs_pages(pages: int = 1, games: int = 9, schools: int = 6, seed: int = 1) -> List[Page]:
+    """
+    IHSAA grid: per page a 2025 and a 2026 group with one column per school
+    and one row per week (`games` weeks).
+    """
+    rnd = random.Random(seed)
+    names = [f"Town{i}, School{i}" for i in range(schools - 1)] + ["Des Moines, Roosevelt"]
+    out = []
+    for page_index in range(pages):
+        page = Page(width=max(792, 180 + schools * 100), height=max(612, 120 + games * 24))
+        page.text(40, 20, "IOWA HIGH SCHOOL ATHLETIC ASSOCIATION")
+        page.text(40, 34, "REGULAR SEASON SCHEDULES")
+        page.text(300, 20, f"GROUP {page_index + 1}")
+        top = 60
+        for year in (2025, 2026):
+            page.text(40, top, str(year))
+            top += 16
+            page.text(20, top, "School", 7)
+            page.text(70, top, "Date", 7)
+            for i, name in enumerate(names):
+                page.text(160 + i * 100, top, name, 6)
+            top += 14
+            for week in range(1, games + 1):
+                page.text(20, top, f"Week {week}", 6)
+                page.text(70, top, f"Aug. {20 + week}" if week < 11 else f"Sept. {week - 10}", 6)
+                for i in range(len(names)):
+                    away = "at " if rnd.random() < .5 else ""
+                    page.text(160 + i * 100, top, away + rnd.choice(names), 6)
+                top += 12
+            top += 14
+        out.append(page)
+    return out
+
+
+PAGE_BUILDERS: Dict[str, Callable[..., List[Page]]] = {
+    'maxpreps': maxpreps_pages,
+    'schedule_star': schedule_star_pages,
+    'cif_bracket': cif_bracket_pages,
+    'texas_isd': texas_isd_pages,
+    'iowa_hs': iowa_hs_pages,
+}
+
+
+def _as_pdf(pages: Callable[..., List[Page]]) -> Callable[..., bytes]:
+    return lambda **options: build_pdf(pages(**options))
+
+
+GENERATORS: Dict[str, Callable[..., bytes]] = {name: _as_pdf(pages) for name, pages in PAGE_BUILDERS.items()}
+
+# The service's startup warm-up document (warmup.pdf): one small page of
+# every format, so the warm-up reaches each extractor's parsing code
+WARMUP_OPTIONS = {
+    'maxpreps': {'games': 4},
+    'schedule_star': {'games': 4},
+    'cif_bracket': {'games': 4},
+    'texas_isd': {'pages': 1, 'games': 4},
+    'iowa_hs': {'games': 3, 'schools': 3},
+}
+
+
+def warmup_pdf() -> bytes:
+    return build_pdf([page for name, options in WARMUP_OPTIONS.items() for page in PAGE_BUILDERS[name](**options)])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write a synthetic schedule PDF")
+    parser.add_argument('format', choices=sorted(GENERATORS) + ['warmup'])
+    parser.add_argument('output')
+    parser.add_argument('--pages', type=int)
+    parser.add_argument('--games', type=int, help="games (rows, teams or weeks) per page")
+    parser.add_argument('--schools', type=int, help="multi-school formats only")
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    options = {k: v for k, v in vars(args).items() if k not in ('format', 'output') and v is not None}
+    try:
+        content = warmup_pdf(**options) if args.format == 'warmup' else GENERATORS[args.format](**options)
+    except TypeError as e:
+        parser.error(f"{args.format}: {e}")
+    with open(args.output, 'wb') as f:
+        f.write(content)
+    print(f"Wrote {len(content)} bytes to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
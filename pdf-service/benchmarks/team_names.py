@@ -0,0 +1,100 @@
+"""
+Micro-benchmark of the memoized team-name pipelines.
+
+Collects the raw opponent and school cells a Texas ISD and an Iowa HS
+synthetic document feed the pipelines, then times normalizing them all with
+the memo and without it, and reports the memo's hit rate. Output must be the
+same either way.
+
+    python -m benchmarks.team_names
+    python -m benchmarks.team_names --pages 28 --repeat 20
+"""
+import argparse
+import itertools
+import time
+from typing import Callable, List
+
+from benchmarks.synthetic import GENERATORS
+from pdf_document import PdfDocument
+from pdf_service import (
+    IOWA_WORD_OPTIONS,
+    TEXAS_ISD_SCHEMA,
+    _parse_iowa_opponent,
+    _parse_iowa_team_name,
+    iowa_opponent,
+    iowa_team_name,
+    texas_opponent_name,
+)
+from team_names import NamePipeline
+
+
+def texas_cells(pages: int) -> List[str]:
+    """Stripped opponent cells of every Texas schedule row."""
+    cells = []
+    with PdfDocument(GENERATORS['texas_isd'](pages=pages)) as doc:
+        for page_index in range(doc.page_count):
+            for table in doc.page_tables(page_index):
+                header_row = 1 if table[0][0] and 'SCHEDULE' in str(table[0][0]).upper() else 0
+                columns = TEXAS_ISD_SCHEMA.columns(table[header_row])
+                if columns is None:
+                    continue
+                cells.extend(
+                    opponent.strip()
+                    for *_, opponent in columns.rows(itertools.islice(table, header_row + 1, None))
+                    if opponent and opponent.strip()
+                )
+    return cells
+
+
+def iowa_cells(pages: int) -> List[str]:
+    """Words of the Iowa grid that look like team cells (contain a comma)."""
+    with PdfDocument(GENERATORS['iowa_hs'](pages=pages, schools=14, games=12)) as doc:
+        return [
+            w['text'].strip()
+            for page_index in range(doc.page_count)
+            for w in doc.page_words(page_index, backend='stream', **IOWA_WORD_OPTIONS)
+            if ',' in w['text']
+        ]
+
+
+def time_pipeline(normalize: Callable[[str], object], cells: List[str], repeat: int) -> float:
+    """Best seconds per pass over cells."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for cell in cells:
+            normalize(cell)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time the team-name pipelines with and without their memo")
+    parser.add_argument('--pages', type=int, default=10, help="pages per synthetic document (default: 10)")
+    parser.add_argument('--repeat', type=int, default=10, help="passes over the cells; the best is reported")
+    args = parser.parse_args()
+
+    texas = texas_cells(args.pages)
+    iowa = iowa_cells(args.pages)
+    cases = [
+        ('texas opponent', texas, texas_opponent_name, NamePipeline(*texas_opponent_name.steps, max_entries=0)),
+        ('iowa opponent', iowa, iowa_opponent, NamePipeline(_parse_iowa_opponent, max_entries=0)),
+        ('iowa school', iowa, iowa_team_name, NamePipeline(_parse_iowa_team_name, max_entries=0)),
+    ]
+
+    print(f"{'pipeline':<18}{'cells':>8}{'distinct':>10}{'uncached us':>14}{'memo us':>10}{'speedup':>9}{'hit rate':>10}  same")
+    for name, cells, memoized, uncached in cases:
+        memoized.clear()
+        same = [memoized(c) for c in cells] == [uncached(c) for c in cells]
+        memoized.clear()
+        plain = time_pipeline(uncached, cells, args.repeat)
+        memo = time_pipeline(memoized, cells, args.repeat)
+        per_cell = 1e6 / max(1, len(cells))
+        print(
+            f"{name:<18}{len(cells):>8}{len(set(cells)):>10}{plain * per_cell:>14.2f}{memo * per_cell:>10.2f}"
+            f"{plain / memo:>8.1f}x{memoized.stats()['hitRate']:>10.1%}  {'yes' if same else 'NO'}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Side-by-side timing and equivalence check of the page text backends.
+
+Extracts every page of each PDF with each backend and compares the text
+with pdfplumber's. Runs over the synthetic documents, plus any PDFs given on
+the command line. The exit status is 1 if any page differs, so it can be run
+over a folder of real uploads before switching a format's backend.
+
+    python -m benchmarks.text_backends
+    python -m benchmarks.text_backends samples/*.pdf
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pdfplumber
+
+from benchmarks.synthetic import GENERATORS
+from text_backends import TEXT_BACKENDS, NeedsLayout
+
+REFERENCE = 'pdfplumber'
+
+
+def extract_pages(content: bytes, backend: str) -> Tuple[float, Optional[List[str]]]:
+    """Seconds to extract every page, and the texts (None if the backend declined the PDF)."""
+    extract = TEXT_BACKENDS[backend]
+    # A fresh document per backend, so neither reuses the other's parsed fonts
+    with pdfplumber.open(io.BytesIO(content)) as pdf:
+        start = time.perf_counter()
+        try:
+            texts = [extract(page) for page in pdf.pages]
+        except NeedsLayout:
+            texts = None
+        return time.perf_counter() - start, texts
+
+
+def first_difference(expected: List[str], actual: List[str]) -> str:
+    for page, (a, b) in enumerate(zip(expected, actual), 1):
+        for line, (la, lb) in enumerate(zip(a.split('\n'), b.split('\n')), 1):
+            if la != lb:
+                return f"page {page} line {line}:\n      {REFERENCE}: {la!r}\n      got: {lb!r}"
+        if a != b:
+            return f"page {page}: line count {a.count(chr(10)) + 1} vs {b.count(chr(10)) + 1}"
+    return f"page count {len(expected)} vs {len(actual)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare page text backends on speed and output")
+    parser.add_argument('pdfs', nargs='*', help="extra PDFs to check")
+    parser.add_argument('--pages', type=int, default=5, help="pages per synthetic document (default: 5)")
+    args = parser.parse_args()
+
+    documents: Dict[str, bytes] = {
+        f"synthetic/{name}": generate(pages=args.pages) for name, generate in GENERATORS.items()
+    }
+    for path in args.pdfs:
+        with open(path, 'rb') as f:
+            documents[os.path.basename(path)] = f.read()
+
+    others = [b for b in TEXT_BACKENDS if b != REFERENCE]
+    print(f"{'document':<28}{REFERENCE + ' ms':>16}" + ''.join(f"{b + ' ms':>12}{'speedup':>9}  same" for b in others))
+    failures = []
+    for name, content in documents.items():
+        reference_seconds, expected = extract_pages(content, REFERENCE)
+        line = f"{name:<28}{reference_seconds * 1000:>16.1f}"
+        for backend in others:
+            seconds, texts = extract_pages(content, backend)
+            if texts is None:
+                line += f"{seconds * 1000:>12.1f}{'':>9}  falls back"
+                continue
+            same = texts == expected
+            line += f"{seconds * 1000:>12.1f}{reference_seconds / seconds:>8.2f}x  {'yes' if same else 'NO'}"
+            if not same:
+                failures.append(f"{name} ({backend}): {first_difference(expected, texts)}")
+        print(line)
+
+    if failures:
+        print("\nDifferences:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
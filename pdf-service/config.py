@@ -0,0 +1,84 @@
+"""
+Service settings read from the environment.
+"""
+import os
+import tempfile
+from typing import Optional
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_str(name: str, default: Optional[str] = None) -> Optional[str]:
+    return os.environ.get(name) or default
+
+
+# Extraction worker pool
+PDF_WORKERS = max(1, _env_int("PDF_WORKERS", os.cpu_count() or 1))
+PDF_QUEUE_SIZE = max(0, _env_int("PDF_QUEUE_SIZE", PDF_WORKERS * 4))
+
+# Scheduling lanes (see scheduling.py): extractions estimated to take longer
+# than PDF_INTERACTIVE_MAX_MS go to the bulk lane, which may use at most
+# PDF_BULK_WORKERS workers (0: half of them) and queue PDF_BULK_QUEUE_SIZE
+# more. PDF_INTERACTIVE_WEIGHT is the interactive lane's share of freed
+# workers, by estimated cost, relative to the bulk lane's 1.
+PDF_INTERACTIVE_MAX_MS = max(0, _env_int("PDF_INTERACTIVE_MAX_MS", 1000))
+PDF_INTERACTIVE_WEIGHT = max(1, _env_int("PDF_INTERACTIVE_WEIGHT", 4))
+PDF_BULK_WORKERS = max(0, _env_int("PDF_BULK_WORKERS", 0))
+PDF_BULK_QUEUE_SIZE = max(0, _env_int("PDF_BULK_QUEUE_SIZE", PDF_QUEUE_SIZE))
+
+# Extraction result cache
+PDF_CACHE_MAX_BYTES = _env_int("PDF_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+PDF_CACHE_DB = _env_str("PDF_CACHE_DB")
+PDF_CACHE_DB_MAX_ENTRIES = _env_int("PDF_CACHE_DB_MAX_ENTRIES", 5000)
+
+# Page-level results of page-splittable formats, by page content hash; 0 disables
+PDF_PAGE_CACHE_MAX_BYTES = max(0, _env_int("PDF_PAGE_CACHE_MAX_BYTES", 32 * 1024 * 1024))
+
+# Multi-school document sessions
+PDF_SESSION_TTL_SECONDS = _env_int("PDF_SESSION_TTL_SECONDS", 30 * 60)
+PDF_SESSION_MAX_BYTES = _env_int("PDF_SESSION_MAX_BYTES", 64 * 1024 * 1024)
+
+# Games of recent extractions kept by content hash for /extract/diff
+PDF_SNAPSHOT_MAX_BYTES = max(0, _env_int("PDF_SNAPSHOT_MAX_BYTES", 16 * 1024 * 1024))
+
+# Request deadlines: the longest an extraction may run (a request can ask
+# for less with X-Request-Timeout or ?timeout=), and how long past it the
+# service waits for a worker to reach its next checkpoint before answering
+PDF_REQUEST_TIMEOUT_SECONDS = max(1, _env_int("PDF_REQUEST_TIMEOUT_SECONDS", 60))
+PDF_DEADLINE_GRACE_SECONDS = max(0, _env_int("PDF_DEADLINE_GRACE_SECONDS", 1))
+
+# Startup warm-up: start and warm every worker before /ready reports ready
+# (0 disables it; /ready is then ready at once), giving up after the timeout
+PDF_WARMUP = _env_int("PDF_WARMUP", 1) != 0
+PDF_WARMUP_TIMEOUT_SECONDS = max(1, _env_int("PDF_WARMUP_TIMEOUT_SECONDS", 120))
+
+# Batch extraction
+PDF_BATCH_MAX_FILES = _env_int("PDF_BATCH_MAX_FILES", 50)
+# Most PDF bytes (uncompressed, zip entries included) one batch may hold
+PDF_BATCH_MAX_BYTES = _env_int("PDF_BATCH_MAX_BYTES", 100 * 1024 * 1024)
+PDF_BATCH_FILE_TIMEOUT_SECONDS = _env_int("PDF_BATCH_FILE_TIMEOUT_SECONDS", 60)
+
+# Page-range parallel extraction of long multi-school PDFs
+PDF_PARALLEL_MIN_PAGES = _env_int("PDF_PARALLEL_MIN_PAGES", 16)
+PDF_PARALLEL_MIN_PAGES_PER_TASK = max(1, _env_int("PDF_PARALLEL_MIN_PAGES_PER_TASK", 4))
+
+# JSON responses at least this large are gzipped for clients that accept it
+PDF_GZIP_MIN_BYTES = _env_int("PDF_GZIP_MIN_BYTES", 8 * 1024)
+
+# Grid layout templates kept per worker process; 0 disables them
+PDF_TEMPLATE_CACHE_SIZE = max(0, _env_int("PDF_TEMPLATE_CACHE_SIZE", 64))
+
+# Normalized team names memoized per worker process; 0 disables the memo
+PDF_NAME_CACHE_SIZE = max(0, _env_int("PDF_NAME_CACHE_SIZE", 4096))
+
+# Logging: level for the service's loggers, and "text" or "json" output
+PDF_LOG_LEVEL = _env_str("PDF_LOG_LEVEL", "INFO")
+PDF_LOG_FORMAT = _env_str("PDF_LOG_FORMAT", "text")
+
+# Per-request profiling: disabled unless a token is set
+PDF_PROFILE_TOKEN = _env_str("PDF_PROFILE_TOKEN")
+PDF_PROFILE_DIR = _env_str("PDF_PROFILE_DIR", os.path.join(tempfile.gettempdir(), "pdf-service-profiles"))
+PDF_PROFILE_MAX_FILES = max(1, _env_int("PDF_PROFILE_MAX_FILES", 20))
@@ -0,0 +1,112 @@
+"""
+Per-request extraction deadlines with cooperative cancellation.
+
+A worker process can't be interrupted in the middle of a parse, so an
+extraction checks in at safe points instead: between pages, and before each
+text, word and table pass over a page (checkpoint()). Every request gets a
+Deadline; the service sets its cancel flag when the client disconnects, and
+the worker sees the flag, or the time limit passing, at its next checkpoint
+and raises ExtractionCancelled with how far it got. The worker is then free
+for the next request instead of finishing a PDF nobody is waiting for.
+
+The flag is one byte of shared memory, so a checkpoint costs no IPC.
+"""
+import time
+from contextlib import contextmanager
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, Iterator, NamedTuple, Optional
+
+# Why an extraction was stopped
+DEADLINE = 'deadline'
+DISCONNECT = 'disconnect'
+
+
+class ExtractionCancelled(Exception):
+    """
+    Raised at a checkpoint once the request's deadline has passed or it was
+    cancelled. progress holds how far the extraction got, when known.
+    """
+
+    def __init__(self, reason: str, progress: Optional[Dict] = None):
+        super().__init__(reason, progress)
+        self.reason = reason
+        self.progress = progress or {}
+
+
+class DeadlineToken(NamedTuple):
+    """What a worker is given: the wall-clock expiry and the cancel flag's block name."""
+    expires_at: Optional[float]
+    flag: str
+
+
+class Deadline:
+    """A request's time limit (None for none) and the cancel flag it owns."""
+
+    def __init__(self, seconds: Optional[float]):
+        self.seconds = seconds
+        self._flag = SharedMemory(create=True, size=1)
+        self._flag.buf[0] = 0
+        self.token = DeadlineToken(time.time() + seconds if seconds else None, self._flag.name)
+
+    def __enter__(self) -> "Deadline":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self._flag.buf[0])
+
+    def cancel(self) -> None:
+        self._flag.buf[0] = 1
+
+    def remaining(self) -> Optional[float]:
+        if self.token.expires_at is None:
+            return None
+        return max(0.0, self.token.expires_at - time.time())
+
+    def close(self) -> None:
+        # Anything still running for this request is abandoned: tell it so
+        # before the flag goes away
+        self.cancel()
+        self._flag.close()
+        self._flag.unlink()
+
+
+# The token of the extraction running in this worker process, and its
+# attached flag
+_active: Optional[DeadlineToken] = None
+_active_flag: Optional[SharedMemory] = None
+
+
+@contextmanager
+def bound(token: Optional[DeadlineToken]) -> Iterator[None]:
+    """Make token the one checkpoint() checks while the block runs (worker side)."""
+    global _active, _active_flag
+    if token is None:
+        yield
+        return
+    try:
+        flag = SharedMemory(name=token.flag)
+    except FileNotFoundError:
+        # The request finished or gave up while this task was still queued
+        raise ExtractionCancelled(DISCONNECT)
+    previous = _active, _active_flag
+    _active, _active_flag = token, flag
+    try:
+        checkpoint()
+        yield
+    finally:
+        _active, _active_flag = previous
+        flag.close()
+
+
+def checkpoint() -> None:
+    """Raise ExtractionCancelled if the running extraction should stop."""
+    if _active is None:
+        return
+    if _active_flag.buf[0]:
+        raise ExtractionCancelled(DISCONNECT)
+    if _active.expires_at is not None and time.time() > _active.expires_at:
+        raise ExtractionCancelled(DEADLINE)
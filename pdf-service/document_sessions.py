@@ -0,0 +1,128 @@
+"""
+Retained multi-school extraction results.
+
+Texas ISD and Iowa grid PDFs hold many schools' schedules. The first
+/extract call keeps the full games_by_school map here under a document
+token, so picking a school (or "__all__") afterwards is a lookup instead of
+a second upload and parse. Sessions expire after a TTL and the store is
+bounded by total size, dropping the least recently used first. Games are
+held as compact GameRecords and only the schools a request reads are turned
+back into dicts; each school's game count, which every response lists, is
+kept alongside.
+"""
+import secrets
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Mapping, Optional
+
+from config import PDF_SESSION_MAX_BYTES, PDF_SESSION_TTL_SECONDS
+from game_records import GameRecord, encode_json, pack_games, unpack_games
+
+
+def count_school_games(games_by_school: Mapping[str, List]) -> Dict[str, int]:
+    """Games per school, in the map's order."""
+    return {school: len(games) for school, games in games_by_school.items()}
+
+
+class _UnpackedGames(Mapping):
+    """Read-only {school: game dicts} view of retained records."""
+
+    def __init__(self, records_by_school: Dict[str, List[GameRecord]]):
+        self._records = records_by_school
+
+    def __getitem__(self, school: str) -> List[Dict]:
+        return unpack_games(self._records[school])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+@dataclass
+class DocumentSession:
+    token: str
+    format: str
+    records_by_school: Dict[str, List[GameRecord]]
+    game_counts: Dict[str, int]
+    content_key: str
+    size: int
+    expires_at: float
+
+    @property
+    def games_by_school(self) -> Mapping[str, List[Dict]]:
+        return _UnpackedGames(self.records_by_school)
+
+
+class DocumentSessions:
+    """Token -> DocumentSession map with TTL and memory cap."""
+
+    def __init__(self, ttl_seconds: int = PDF_SESSION_TTL_SECONDS, max_bytes: int = PDF_SESSION_MAX_BYTES):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._sessions: "OrderedDict[str, DocumentSession]" = OrderedDict()
+        self._by_content: Dict[str, str] = {}
+        self._size = 0
+
+    def create(self, content_key: str, format: str, games_by_school: Dict[str, List[Dict]]) -> Optional[str]:
+        """
+        Retain games_by_school and return its token. Uploading the same
+        document again refreshes and returns the existing token. Returns
+        None if the map alone is larger than the whole store.
+        """
+        self._expire()
+        existing = self._by_content.get(content_key)
+        if existing is not None:
+            session = self._sessions[existing]
+            session.expires_at = time.monotonic() + self.ttl_seconds
+            self._sessions.move_to_end(existing)
+            return existing
+
+        records_by_school = {school: pack_games(games) for school, games in games_by_school.items()}
+        size = len(encode_json(records_by_school))
+        if size > self.max_bytes:
+            return None
+        token = secrets.token_urlsafe(16)
+        self._sessions[token] = DocumentSession(
+            token=token,
+            format=format,
+            records_by_school=records_by_school,
+            game_counts=count_school_games(records_by_school),
+            content_key=content_key,
+            size=size,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._by_content[content_key] = token
+        self._size += size
+        while self._size > self.max_bytes:
+            self._remove(next(iter(self._sessions)))
+        return token
+
+    def get(self, token: str) -> Optional[DocumentSession]:
+        self._expire()
+        session = self._sessions.get(token)
+        if session is not None:
+            self._sessions.move_to_end(token)
+        return session
+
+    def stats(self) -> Dict:
+        self._expire()
+        return {
+            'sessions': len(self._sessions),
+            'bytes': self._size,
+            'maxBytes': self.max_bytes,
+            'ttlSeconds': self.ttl_seconds,
+        }
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        expired = [t for t, s in self._sessions.items() if s.expires_at <= now]
+        for token in expired:
+            self._remove(token)
+
+    def _remove(self, token: str) -> None:
+        session = self._sessions.pop(token)
+        self._by_content.pop(session.content_key, None)
+        self._size -= session.size
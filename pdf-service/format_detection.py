@@ -0,0 +1,161 @@
+"""
+Registry of PDF formats and their detectors.
+
+Each extractor registers itself with the indicator patterns that identify
+its layout and how many must be present. Detection returns a ranked list of
+candidates, so the caller can run the best one and fall through to the next
+without detecting again.
+
+Each indicator is precompiled along with a literal anchor: the longest word
+it must match verbatim. The first page's text is case-folded once and an
+indicator's regex only runs when its anchor occurs, so the indicators of
+other formats cost a substring check rather than a regex scan, and
+detection stays flat as formats are added. (A single alternation of every
+indicator is slower than this in Python's backtracking re engine.)
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Pattern, Sequence, Tuple, Union
+
+Indicator = Union[str, Tuple[str, int]]
+
+# Regex syntax that ends the literal prefix of a pattern
+_REGEX_META = set('()[]{}|?*+.^$')
+
+
+@dataclass(frozen=True)
+class CompiledIndicator:
+    pattern: Pattern
+    anchor: Optional[str]
+
+    def search(self, text: str, folded: str) -> bool:
+        if self.anchor is not None and self.anchor not in folded:
+            return False
+        return self.pattern.search(text) is not None
+
+
+@dataclass
+class RegisteredFormat:
+    name: str
+    run: Callable[..., Any]
+    indicators: List[CompiledIndicator] = field(default_factory=list)
+    threshold: int = 1
+    priority: int = 100
+    # For formats whose pages are independent: (doc, page_indices) -> page
+    # events, and (events, school) -> result, so page ranges can be
+    # extracted in separate processes and merged
+    pages: Optional[Callable[..., Any]] = None
+    merge_pages: Optional[Callable[..., Any]] = None
+    # Backend for the runner's page_text() calls (see text_backends)
+    text_backend: str = 'pdfplumber'
+
+    def matched(self, text: str, folded: str) -> int:
+        return sum(1 for indicator in self.indicators if indicator.search(text, folded))
+
+
+@dataclass(frozen=True)
+class FormatCandidate:
+    """A format whose detector passed, with the share of its indicators found."""
+    name: str
+    confidence: float
+    matched: int
+
+
+class FormatRegistry:
+    """Format name -> extractor runner and detector."""
+
+    def __init__(self):
+        self._formats: Dict[str, RegisteredFormat] = {}
+
+    def register(
+        self,
+        name: str,
+        indicators: Sequence[Indicator] = (),
+        threshold: int = 1,
+        priority: int = 100,
+        pages: Optional[Callable[..., Any]] = None,
+        merge_pages: Optional[Callable[..., Any]] = None,
+        text_backend: str = 'pdfplumber',
+    ) -> Callable:
+        """
+        Decorator registering an extractor runner under name.
+
+        indicators are regexes, optionally as (pattern, flags); the format
+        is a candidate when at least `threshold` of them occur. Candidates
+        with equal confidence are ordered by priority, lowest first. A
+        format with no indicators is never detected, only run by name.
+        Formats passing pages and merge_pages can be split by page range.
+        Formats that only regex over line text can ask for the faster
+        'stream' text_backend.
+        """
+        compiled = [_compile_indicator(*((i,) if isinstance(i, str) else i)) for i in indicators]
+
+        def decorator(run: Callable) -> Callable:
+            self._formats[name] = RegisteredFormat(
+                name, run, compiled, threshold, priority, pages, merge_pages, text_backend
+            )
+            return run
+        return decorator
+
+    def get(self, name: str) -> RegisteredFormat:
+        return self._formats[name]
+
+    def names(self) -> List[str]:
+        """Registered format names, in registration order."""
+        return list(self._formats)
+
+    def rank(self, text: str) -> List[FormatCandidate]:
+        """Formats whose detectors pass on text, most confident first."""
+        folded = text.casefold()
+        candidates = []
+        for fmt in self._formats.values():
+            if not fmt.indicators:
+                continue
+            matched = fmt.matched(text, folded)
+            if matched >= fmt.threshold:
+                candidates.append(FormatCandidate(fmt.name, matched / len(fmt.indicators), matched))
+        candidates.sort(key=lambda c: (-c.confidence, self._formats[c.name].priority))
+        return candidates
+
+    def detects(self, name: str, text: str) -> bool:
+        """Whether the named format's own detector passes on text."""
+        fmt = self._formats[name]
+        return bool(fmt.indicators) and fmt.matched(text, text.casefold()) >= fmt.threshold
+
+
+def _compile_indicator(pattern: str, flags: int = 0) -> CompiledIndicator:
+    anchor = None if flags & re.VERBOSE else _literal_anchor(pattern)
+    return CompiledIndicator(re.compile(pattern, flags), anchor)
+
+
+def _literal_anchor(pattern: str) -> Optional[str]:
+    """
+    Longest run of letters or digits (3+) that every match of pattern
+    contains verbatim, taken from the literal prefix before the first regex
+    construct. None when there is no such run or the pattern has alternation.
+    """
+    if '|' in pattern:
+        return None
+    runs = ['']
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if c == '\\':
+            escaped = pattern[i + 1:i + 2]
+            if not escaped or escaped.isalnum():
+                break  # a class like \s or \d
+            runs.append('')
+            i += 2
+            continue
+        if c in _REGEX_META:
+            if c in '?*{':
+                # The quantifier makes the previous character optional
+                runs[-1] = runs[-1][:-1]
+            break
+        if c.isalnum():
+            runs[-1] += c
+        else:
+            runs.append('')
+        i += 1
+    longest = max(runs, key=len)
+    return longest.casefold() if len(longest) >= 3 else None
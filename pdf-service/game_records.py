@@ -0,0 +1,96 @@
+"""
+Compact game records and response encoding.
+
+Every extractor produces games as dicts with the same eleven keys. That is
+the response format, but it is a costly way to hold thousands of games:
+each dict carries its own key table. Document sessions retain the games of
+every school in a multi-school PDF for their whole TTL, so they store
+GameRecord tuples instead, about a quarter of the memory, and turn them back
+into dicts when a school is picked.
+
+Responses are encoded with orjson, skipping FastAPI's jsonable_encoder
+pass. With ?layout=columnar the games are sent as one array per field, and
+home and away teams as indexes into a deduplicated `teams` table, so a
+client resolves each team once instead of once per appearance.
+"""
+import gzip
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import orjson
+
+# Field order of GameRecord, and of the keys in a game dict
+GAME_FIELDS = (
+    'date', 'time', 'homeTeam', 'awayTeam', 'homeCity', 'homeState',
+    'awayCity', 'awayState', 'homeScore', 'awayScore', 'isCompleted',
+)
+
+# Game fields sent as their own column in the columnar layout; the team
+# fields go into the teams table
+COLUMNAR_FIELDS = ('date', 'time', 'homeScore', 'awayScore', 'isCompleted')
+
+LAYOUTS = ('games', 'columnar')
+
+GZIP_LEVEL = 6
+
+
+class GameRecord(NamedTuple):
+    date: Optional[str]
+    time: Optional[str]
+    homeTeam: Optional[str]
+    awayTeam: Optional[str]
+    homeCity: Optional[str]
+    homeState: Optional[str]
+    awayCity: Optional[str]
+    awayState: Optional[str]
+    homeScore: Optional[int]
+    awayScore: Optional[int]
+    isCompleted: bool
+
+
+def pack_games(games: Iterable[Dict]) -> List[GameRecord]:
+    return [GameRecord(*[game.get(f) for f in GAME_FIELDS]) for game in games]
+
+
+def unpack_games(records: Iterable[GameRecord]) -> List[Dict]:
+    return [dict(zip(GAME_FIELDS, record)) for record in records]
+
+
+def encode_json(obj) -> bytes:
+    return orjson.dumps(obj, default=_encode_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _encode_default(obj):
+    # orjson only encodes plain tuples natively; records go out as arrays
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def columnar(result: Dict) -> Dict:
+    """
+    result with its games as field arrays plus a deduplicated teams table.
+    `home` and `away` index into teams; each team is {name, city, state}.
+    """
+    games = result.get('games')
+    if games is None:
+        return result
+    team_index: Dict[Tuple, int] = {}
+    teams = []
+    columns: Dict[str, list] = {field: [] for field in COLUMNAR_FIELDS}
+    columns['home'] = []
+    columns['away'] = []
+    for game in games:
+        for field in COLUMNAR_FIELDS:
+            columns[field].append(game.get(field))
+        for side in ('home', 'away'):
+            team = (game.get(f'{side}Team'), game.get(f'{side}City'), game.get(f'{side}State'))
+            index = team_index.get(team)
+            if index is None:
+                index = team_index[team] = len(teams)
+                teams.append({'name': team[0], 'city': team[1], 'state': team[2]})
+            columns[side].append(index)
+    return {**result, 'layout': 'columnar', 'teams': teams, 'games': columns}
+
+
+def gzip_body(body: bytes) -> bytes:
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
@@ -0,0 +1,73 @@
+"""
+Layout templates learned from one document and reused for the next.
+
+Publishers re-issue the same grid every week with new data in it. An
+extractor that has worked out where a page's header rows and columns are
+stores that as a template under the page's structural fingerprint: page
+size, the fonts used and where the header tokens sit. A later page with the
+same fingerprint starts from the template instead of rediscovering the
+layout. The extractor still validates the template against the page, and
+drops it and rediscovers when they disagree.
+
+Templates live in each worker process and are bounded LRU. Their hit, miss
+and invalidation counters travel back with each extraction task and are
+reported by the service as pdf_worker_cache_lookups_total.
+"""
+from collections import OrderedDict
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+from config import PDF_TEMPLATE_CACHE_SIZE
+
+# Positions are compared at this precision (points)
+FINGERPRINT_PRECISION = 1
+
+
+def page_fingerprint(
+    width: float,
+    height: float,
+    fonts: Iterable[str],
+    anchors: Iterable[Tuple[float, float]],
+) -> Tuple:
+    """
+    Structural fingerprint of a page: its size, the fonts of its header
+    tokens and the (x, y) positions of those tokens.
+    """
+    return (
+        round(float(width), FINGERPRINT_PRECISION),
+        round(float(height), FINGERPRINT_PRECISION),
+        tuple(sorted(set(fonts))),
+        tuple((round(float(x), FINGERPRINT_PRECISION), round(float(y), FINGERPRINT_PRECISION)) for x, y in anchors),
+    )
+
+
+class LayoutTemplates:
+    """Bounded LRU of templates by (format, fingerprint)."""
+
+    def __init__(self, max_entries: int = PDF_TEMPLATE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._templates: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        template = self._templates.get(key)
+        if template is None:
+            self.misses += 1
+            return None
+        self._templates.move_to_end(key)
+        self.hits += 1
+        return template
+
+    def put(self, key: Hashable, template: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        self._templates[key] = template
+        self._templates.move_to_end(key)
+        while len(self._templates) > self.max_entries:
+            self._templates.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a template that failed validation."""
+        if self._templates.pop(key, None) is not None:
+            self.invalidated += 1
@@ -0,0 +1,155 @@
+"""
+Prometheus metrics and Server-Timing for the extraction service.
+
+Stage timings are measured inside the worker process that runs the
+extraction and travel back with its result; the service observes them here
+and also lists them in a Server-Timing header, so a slow request can be
+broken down from the browser's network panel without opening /metrics.
+"""
+import contextvars
+import time
+from typing import Dict, Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+
+# Stages of one extraction, in the order they run
+STAGES = ('open', 'detect', 'extract', 'fallback')
+
+STAGE_SECONDS = Histogram(
+    'pdf_extraction_stage_seconds',
+    'Time spent in each extraction stage; extract is labelled with the extractor that ran',
+    ['stage', 'format'],
+    buckets=(.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30),
+)
+REQUEST_SECONDS = Histogram(
+    'pdf_request_seconds',
+    'Time from receiving a request until its response starts',
+    ['route'],
+    buckets=(.01, .05, .1, .25, .5, 1, 2.5, 5, 10, 30, 60),
+)
+EXTRACTIONS = Counter(
+    'pdf_extractions_total',
+    'Extraction requests by detected format and outcome',
+    ['format', 'outcome'],
+)
+GAMES = Histogram(
+    'pdf_games_per_extraction',
+    'Games returned per successful extraction',
+    buckets=(1, 5, 10, 25, 50, 100, 200, 400),
+)
+PAGES = Histogram(
+    'pdf_pages_per_document',
+    'Pages in each parsed PDF (cache hits are not counted)',
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+ABANDONED = Counter(
+    'pdf_extractions_abandoned_total',
+    'Extractions stopped before finishing, by reason (deadline or disconnect)',
+    ['reason'],
+)
+ABANDONED_PAGES = Counter(
+    'pdf_abandoned_pages_total',
+    'Pages parsed by extractions that were then stopped, by reason',
+    ['reason'],
+)
+PAGE_CACHE_PAGES = Counter(
+    'pdf_page_cache_pages_total',
+    'Pages of page-splittable PDFs, by format and whether their cached result was reused (hit) or parsed (miss)',
+    ['format', 'result'],
+)
+PAGE_CACHE_HIT_RATIO = Histogram(
+    'pdf_page_cache_hit_ratio',
+    'Share of each parsed document\'s pages reused from the page cache',
+    ['format'],
+    buckets=(0, .1, .25, .5, .75, .9, .99, 1),
+)
+WORKER_CACHE_LOOKUPS = Counter(
+    'pdf_worker_cache_lookups_total',
+    'Lookups in the caches each worker process keeps, by cache and result (hit, miss, invalidated)',
+    ['cache', 'result'],
+)
+STARTUP_SECONDS = Gauge(
+    'pdf_startup_seconds',
+    'Seconds from importing the service until it was ready, warm-up included',
+)
+QUEUE_DEPTH = Gauge('pdf_pool_queued', 'Extractions waiting for a worker process')
+IN_FLIGHT = Gauge('pdf_pool_running', 'Extractions running in worker processes')
+LANE_QUEUED = Gauge('pdf_lane_queued', 'Extractions waiting for a worker process, by scheduling lane', ['lane'])
+LANE_RUNNING = Gauge('pdf_lane_running', 'Extractions running in worker processes, by scheduling lane', ['lane'])
+POOL_WAIT_SECONDS = Histogram(
+    'pdf_pool_wait_seconds',
+    'Time an admitted extraction waited for a worker process, by scheduling lane',
+    ['lane'],
+    buckets=(.001, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30),
+)
+
+# Stage seconds of the current request, read by the Server-Timing middleware
+_request_timings: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    'request_timings', default=None
+)
+
+
+def track_pool(pool) -> None:
+    """Report the pool's queue depth and running count when scraped, and its lanes' wait times."""
+    QUEUE_DEPTH.set_function(lambda: pool.queued)
+    IN_FLIGHT.set_function(lambda: pool.running)
+    for name, lane in pool.lanes.items():
+        LANE_QUEUED.labels(name).set_function(lambda lane=lane: lane.queued)
+        LANE_RUNNING.labels(name).set_function(lambda lane=lane: lane.running)
+    pool.wait_observer = lambda lane, seconds: POOL_WAIT_SECONDS.labels(lane).observe(seconds)
+
+
+def observe_stages(format_name: Optional[str], timings: Dict[str, float]) -> None:
+    """Record an extraction's stage seconds and add them to the current request's timings."""
+    for stage, seconds in timings.items():
+        STAGE_SECONDS.labels(stage, format_name or 'unknown').observe(seconds)
+    request_timings = _request_timings.get()
+    if request_timings is not None:
+        for stage, seconds in timings.items():
+            request_timings[stage] = request_timings.get(stage, 0.0) + seconds
+
+
+def observe_outcome(format_name: Optional[str], outcome: str, game_count: Optional[int] = None) -> None:
+    EXTRACTIONS.labels(format_name or 'unknown', outcome).inc()
+    if outcome == 'success' and game_count is not None:
+        GAMES.observe(game_count)
+
+
+def observe_abandoned(reason: str, pages_parsed: Optional[int]) -> None:
+    """Record an extraction stopped at a checkpoint and the pages it had parsed."""
+    ABANDONED.labels(reason).inc()
+    if pages_parsed:
+        ABANDONED_PAGES.labels(reason).inc(pages_parsed)
+
+
+def observe_page_cache(format_name: str, hits: int, misses: int) -> None:
+    """Record how many of a document's pages were reused from the page cache."""
+    PAGE_CACHE_PAGES.labels(format_name, 'hit').inc(hits)
+    PAGE_CACHE_PAGES.labels(format_name, 'miss').inc(misses)
+    if hits + misses:
+        PAGE_CACHE_HIT_RATIO.labels(format_name).observe(hits / (hits + misses))
+
+
+def observe_worker_caches(counts: Dict[str, Dict[str, int]]) -> None:
+    """Record the worker cache lookups ({cache: {result: count}}) one extraction task made."""
+    for cache, results in counts.items():
+        for result, count in results.items():
+            if count:
+                WORKER_CACHE_LOOKUPS.labels(cache, result).inc(count)
+
+
+def start_request_timings() -> Dict[str, float]:
+    timings: Dict[str, float] = {}
+    _request_timings.set(timings)
+    return timings
+
+
+def server_timing_header(timings: Dict[str, float], started: float) -> str:
+    """Server-Timing value: each stage that ran, then the total, in milliseconds."""
+    entries = [f"{stage};dur={timings[stage] * 1000:.1f}" for stage in STAGES if stage in timings]
+    entries.append(f"total;dur={(time.perf_counter() - started) * 1000:.1f}")
+    return ", ".join(entries)
+
+
+def render() -> bytes:
+    return generate_latest()
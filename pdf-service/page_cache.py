@@ -0,0 +1,108 @@
+"""
+Page-level cache of extraction results for republished PDFs.
+
+League schedules are re-issued every week with a page or two changed. For
+formats whose pages are independent (see FormatRegistry pages), a worker
+first hashes each page's content (PdfDocument.page_hash). When none of the
+hashes is cached, the document is extracted whole as usual and its page
+events are recorded here. Otherwise the service looks the hashes up: only
+pages missing from the cache are laid out and extracted, the others reuse
+the cached page events, and everything is merged in page order.
+
+Workers are given the cached hashes as a set of 64-bit prefixes (known()),
+enough to tell whether a document has any page worth looking up.
+
+Entries are keyed by format and page hash, so a page that moves within a
+document, or appears in another one, is still a hit. This cache lives in
+the service process and is bounded LRU by serialized size.
+"""
+import json
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+from config import PDF_PAGE_CACHE_MAX_BYTES
+from result_cache import CACHE_VERSION
+
+
+def hash_prefix(page_hash: str) -> int:
+    """The first 64 bits of a page hash, as the int known() holds."""
+    return int(page_hash[:16], 16)
+
+
+class PageCache:
+    """LRU of page events by (format, page hash), bounded by total bytes."""
+
+    def __init__(self, max_bytes: int = PDF_PAGE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+        self.documents = 0
+        self.evictions = 0
+        # known() as of the last change to the entries; None: stale
+        self._known: Optional[FrozenSet[int]] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @staticmethod
+    def key(format_name: str, page_hash: str) -> str:
+        return f"v{CACHE_VERSION}:{format_name}:{page_hash}"
+
+    def lookup(self, format_name: str, page_hashes: Sequence[Optional[str]]) -> Dict[int, List[Dict]]:
+        """
+        Cached events of a document's pages, by page index, for each page
+        whose hash is cached. Each call returns its own copies.
+        """
+        self.documents += 1
+        found = {}
+        for index, page_hash in enumerate(page_hashes):
+            key = self.key(format_name, page_hash) if page_hash else None
+            data = self._entries.get(key) if key else None
+            if data is None:
+                self.misses += 1
+                continue
+            self._entries.move_to_end(key)
+            self.hits += 1
+            found[index] = json.loads(data)
+        return found
+
+    def known(self) -> FrozenSet[int]:
+        """hash_prefix() of every cached page hash, of any format."""
+        if self._known is None:
+            self._known = frozenset(hash_prefix(key.rsplit(':', 1)[1]) for key in self._entries)
+        return self._known
+
+    def store(self, format_name: str, page_hash: Optional[str], events: List[Dict]) -> None:
+        """Cache the events one page produced (possibly none)."""
+        if not page_hash or not self.enabled:
+            return
+        data = json.dumps(events).encode()
+        if len(data) > self.max_bytes:
+            return
+        key = self.key(format_name, page_hash)
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = data
+        self._size += len(data)
+        self._known = None
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def stats(self) -> Dict:
+        looked_up = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self._size,
+            'maxBytes': self.max_bytes,
+            'documents': self.documents,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRatio': round(self.hits / looked_up, 4) if looked_up else None,
+            'evictions': self.evictions,
+        }
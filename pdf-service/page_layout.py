@@ -0,0 +1,58 @@
+"""
+Array-backed word layout for grid PDFs.
+
+pdfplumber returns a page's words as a list of dicts. Grid extractors keep
+asking which words share a row and which column a word falls in; answering
+that by rescanning the list costs O(rows x words x columns) per page.
+PageLayout loads the coordinates once into arrays sorted by `top`, so a row
+is a binary search and column assignment is one vectorized searchsorted.
+"""
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+class PageLayout:
+    """A page's words in (top, x0) order with their coordinates as arrays."""
+
+    def __init__(self, words: Sequence[Dict]):
+        top = np.fromiter((w['top'] for w in words), dtype=float, count=len(words))
+        x0 = np.fromiter((w['x0'] for w in words), dtype=float, count=len(words))
+        # lexsort is stable and sorts by the last key first
+        order = np.lexsort((x0, top))
+        self.words: List[Dict] = [words[i] for i in order]
+        self.texts: List[str] = [w['text'].strip() for w in self.words]
+        self.top = top[order]
+        self.x0 = x0[order]
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def row(self, y: float, tolerance: float = 2.0) -> np.ndarray:
+        """Indices of the words whose top is within tolerance of y, left to right."""
+        lo, hi = self.band(y - tolerance, y + tolerance)
+        return lo + np.argsort(self.x0[lo:hi], kind='stable')
+
+    def band(self, top_above: float, top_below: float) -> Tuple[int, int]:
+        """Index range [lo, hi) of the words with top_above < top < top_below."""
+        lo = int(np.searchsorted(self.top, top_above, side='right'))
+        hi = int(np.searchsorted(self.top, top_below, side='left'))
+        return lo, max(lo, hi)
+
+
+def assign_columns(x0: np.ndarray, col_ranges: List[Tuple[float, float, str]]) -> np.ndarray:
+    """
+    Index into col_ranges of the (left, right) range holding each x0, or -1.
+    Ranges must be in left-to-right order, as built by _build_column_ranges().
+    """
+    if not col_ranges or len(x0) == 0:
+        return np.full(len(x0), -1, dtype=int)
+    # Only the first range's left edge can be out of order (it comes from
+    # the Date column, not a midpoint). A running max keeps lefts sorted and
+    # gives the same first match as a linear walk for any x0 at or right of
+    # that edge, which is all the data area callers look at
+    lefts = np.maximum.accumulate(np.array([r[0] for r in col_ranges], dtype=float))
+    rights = np.array([r[1] for r in col_ranges], dtype=float)
+    idx = np.searchsorted(lefts, x0, side='right') - 1
+    inside = (idx >= 0) & (x0 < rights[np.clip(idx, 0, None)])
+    return np.where(inside, idx, -1)
@@ -0,0 +1,252 @@
+"""
+Per-request PDF document model.
+
+The PDF is opened once and each page's text, words and tables are computed
+lazily and memoized, so format detection, the chosen extractor and the
+table fallback all share the same parse. Each pass over a page is a
+deadline checkpoint (see deadlines).
+
+Table extraction only finds ruled tables (pdfplumber's default "lines"
+strategy), so pages are pre-checked before the table finder runs. A page
+whose content stream draws no paths and no XObjects has no ruling lines, and
+is skipped before pdfminer lays it out. That layout is most of the cost.
+A page that draws paths but lacks either horizontal or vertical edges is
+skipped after layout. Otherwise the page is cropped to the box around its
+ruling lines, so the surrounding text never enters the table finder.
+
+page_hash() identifies what a page draws without laying it out, so a page
+that is unchanged in a republished PDF can reuse its earlier result.
+"""
+import hashlib
+import io
+import mmap
+import re
+from typing import Dict, Hashable, List, Optional, Set, Tuple, Union
+
+import pdfplumber
+from pdfminer.pdftypes import PDFObjRef, PDFStream, resolve1
+from pdfminer.psparser import LIT, PSLiteral
+
+from deadlines import checkpoint
+from text_backends import TEXT_BACKENDS, WORD_BACKENDS, NeedsLayout
+
+# PDF bytes, or the path of a PDF file (a spooled upload), which is memory
+# mapped instead of read so its pages parse straight from the page cache
+PdfSource = Union[bytes, str]
+
+# Added around the ruling lines when cropping to the table region, so
+# characters touching the outer border are not clipped
+TABLE_REGION_PADDING = 2.0
+
+# Content stream operators that start a path (moveto, rectangle) or draw an
+# XObject, which may hold paths of its own. Operators are whole tokens, so
+# they are matched between PDF delimiters; a hit inside a string only costs
+# a full check.
+_PATH_OPERATOR = re.compile(rb'(?:^|[\s\])>])(?:m|re|Do)(?=[\s\[(<\/%]|$)')
+
+# XObject subtype whose content stream draws like a page's (images don't)
+_FORM = LIT('Form')
+
+# Deepest nesting followed when hashing a font or form XObject (a Type0
+# font's font file is four levels down); deeper is a reference cycle or a
+# malformed file, and the page is parsed instead of hashed
+HASH_MAX_DEPTH = 16
+
+# Stream entries that only describe how its bytes are stored; the decoded
+# data is hashed instead
+_STORAGE_KEYS = frozenset(('Length', 'Filter', 'DecodeParms', 'DL'))
+
+
+class PdfDocument:
+    """Lazily parsed view of one uploaded PDF."""
+
+    def __init__(self, content: PdfSource, text_backend: str = 'pdfplumber'):
+        self._map: Optional[mmap.mmap] = None
+        if isinstance(content, str):
+            with open(content, 'rb') as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._pdf = pdfplumber.open(self._map)
+        else:
+            self._pdf = pdfplumber.open(io.BytesIO(content))
+        # Backend page_text() uses when none is given; see text_backends
+        self.text_backend = text_backend
+        self._text: Dict[Tuple[str, int], str] = {}
+        self._words: Dict[Tuple, List[Dict]] = {}
+        self._tables: Dict[int, List[List[List[Optional[str]]]]] = {}
+        # Pages any pass has run over, to report how far an extraction got
+        self.pages_parsed: Set[int] = set()
+        # Digests of indirect fonts and form XObjects, which pages share
+        self._object_digests: Dict[int, bytes] = {}
+        # When set, page-splittable formats that run over the whole document
+        # leave their page events here, by format and page index, for the
+        # page cache
+        self.page_events: Optional[Dict[str, Dict[int, List[Dict]]]] = None
+        # Layout templates (see layout_templates) this document's stream
+        # words were checked against pdfplumber's for
+        self.templates_checked: Set[Hashable] = set()
+
+    def __enter__(self) -> "PdfDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._pdf.close()
+        if self._map is not None:
+            self._map.close()
+
+    @property
+    def page_count(self) -> int:
+        return len(self._pdf.pages)
+
+    def page(self, index: int):
+        """The underlying pdfplumber page, for layout properties like width."""
+        return self._pdf.pages[index]
+
+    def page_text(self, index: int, backend: Optional[str] = None) -> str:
+        """
+        Text of a page from the given backend, or self.text_backend. Text
+        pdfplumber already extracted is reused for any backend.
+        """
+        backend = backend or self.text_backend
+        key = (backend, index)
+        if key not in self._text:
+            if ('pdfplumber', index) in self._text:
+                return self._text[('pdfplumber', index)]
+            self._start_pass(index)
+            try:
+                self._text[key] = TEXT_BACKENDS[backend](self._pdf.pages[index])
+            except NeedsLayout:
+                self._text[key] = self.page_text(index, 'pdfplumber')
+        return self._text[key]
+
+    def page_words(self, index: int, backend: str = 'pdfplumber', **kwargs) -> List[Dict]:
+        """
+        Words for a page from the given backend, memoized per set of
+        extract_words() options. Callers must not mutate the returned list.
+        """
+        key = (backend, index, tuple(sorted(kwargs.items())))
+        if key not in self._words:
+            self._start_pass(index)
+            try:
+                self._words[key] = WORD_BACKENDS[backend](self._pdf.pages[index], **kwargs)
+            except NeedsLayout:
+                self._words[key] = self.page_words(index, 'pdfplumber', **kwargs)
+        return self._words[key]
+
+    def page_tables(self, index: int) -> List[List[List[Optional[str]]]]:
+        if index not in self._tables:
+            self._start_pass(index)
+            page = self._pdf.pages[index]
+            region = table_region(page) if draws_paths(page) else None
+            self._tables[index] = page.crop(region).extract_tables() if region else []
+        return self._tables[index]
+
+    def page_hash(self, index: int) -> Optional[str]:
+        """
+        SHA-256 of what a page draws: its size, its content streams, the
+        fonts they use and the form XObjects they place. Fonts and forms
+        are hashed with everything they reference (encoding and
+        /Differences, ToUnicode map, descendant fonts, embedded font
+        program, a form's own resources). None when any of it can't be
+        read or resolved, so the page is parsed.
+        """
+        page = self._pdf.pages[index]
+        digest = hashlib.sha256(repr(page.bbox).encode())
+        try:
+            for stream in page.page_obj.contents:
+                digest.update(resolve1(stream).get_data())
+            resources = resolve1(page.page_obj.resources) or {}
+            for name, font in sorted((resolve1(resources.get('Font')) or {}).items()):
+                digest.update(name.encode())
+                digest.update(self._object_digest(font))
+            for name, xobject in sorted((resolve1(resources.get('XObject')) or {}).items()):
+                if resolve1(xobject).get('Subtype') is _FORM:
+                    digest.update(name.encode())
+                    digest.update(self._object_digest(xobject))
+        except Exception:
+            return None
+        return digest.hexdigest()
+
+    def _object_digest(self, obj) -> bytes:
+        """object_digest(obj), memoized for indirect objects."""
+        if not isinstance(obj, PDFObjRef):
+            return object_digest(obj)
+        if obj.objid not in self._object_digests:
+            self._object_digests[obj.objid] = object_digest(obj)
+        return self._object_digests[obj.objid]
+
+    def _start_pass(self, index: int) -> None:
+        checkpoint()
+        self.pages_parsed.add(index)
+
+
+def object_digest(obj) -> bytes:
+    """
+    SHA-256 of a PDF object and everything it references: dictionaries by
+    sorted key, names by name, streams by their decoded data. Raises
+    ValueError on a reference that doesn't resolve or on nesting deeper
+    than HASH_MAX_DEPTH.
+    """
+    digest = hashlib.sha256()
+    _update_digest(digest, obj, 0)
+    return digest.digest()
+
+
+def _update_digest(digest, obj, depth: int) -> None:
+    if depth > HASH_MAX_DEPTH:
+        raise ValueError("PDF object nested too deeply to hash")
+    if isinstance(obj, PDFObjRef):
+        resolved = resolve1(obj)
+        if resolved is None:
+            raise ValueError(f"Unresolved PDF object {obj.objid}")
+        obj = resolved
+    if isinstance(obj, PDFStream):
+        attrs = {key: value for key, value in obj.attrs.items() if key not in _STORAGE_KEYS}
+        _update_digest(digest, attrs, depth + 1)
+        data = obj.get_data()
+        digest.update(b'stream %d ' % len(data))
+        digest.update(data)
+    elif isinstance(obj, dict):
+        digest.update(b'<<')
+        for key in sorted(obj):
+            digest.update(f"/{key} ".encode())
+            _update_digest(digest, obj[key], depth + 1)
+        digest.update(b'>>')
+    elif isinstance(obj, list):
+        digest.update(b'[')
+        for item in obj:
+            _update_digest(digest, item, depth + 1)
+        digest.update(b']')
+    elif isinstance(obj, PSLiteral):
+        digest.update(f"/{obj.name!r} ".encode())
+    else:
+        digest.update(f"{obj!r} ".encode())
+
+
+def draws_paths(page) -> bool:
+    """Whether a page's content stream may draw lines, without laying the page out."""
+    try:
+        streams = page.page_obj.contents
+        return any(_PATH_OPERATOR.search(resolve1(stream).get_data()) for stream in streams)
+    except Exception:
+        # Unusual stream structure or filter; let the full check decide
+        return True
+
+
+def table_region(page) -> Optional[Tuple[float, float, float, float]]:
+    """
+    Bounding box (x0, top, x1, bottom) of a page's ruling lines, or None
+    when it lacks either horizontal or vertical ones and so has no table.
+    """
+    edges = page.edges
+    if not any(e['orientation'] == 'v' for e in edges) or not any(e['orientation'] == 'h' for e in edges):
+        return None
+    page_x0, page_top, page_x1, page_bottom = page.bbox
+    return (
+        max(page_x0, min(e['x0'] for e in edges) - TABLE_REGION_PADDING),
+        max(page_top, min(e['top'] for e in edges) - TABLE_REGION_PADDING),
+        min(page_x1, max(e['x1'] for e in edges) + TABLE_REGION_PADDING),
+        min(page_bottom, max(e['bottom'] for e in edges) + TABLE_REGION_PADDING),
+    )
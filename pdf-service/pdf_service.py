@@ -1,13 +1,117 @@
-import pdfplumber
+import asyncio
+import hashlib
+import io
+import itertools
+import json
+import logging
+import os
 import re
-from typing import List, Dict, Optional, Tuple
-from fastapi import FastAPI, File, UploadFile, HTTPException
+import tempfile
+import time
+import zipfile
+from typing import AbstractSet, AsyncIterator, Awaitable, Generator, Iterable, Iterator, List, Dict, Mapping, Optional, Tuple, Union
+from fastapi import FastAPI, File, Form, Request, UploadFile, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, PlainTextResponse, Response, StreamingResponse
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import datetime
 import uvicorn
-import io
 
-app = FastAPI(title="PDF Schedule Extraction Service")
+from config import (
+    PDF_BATCH_FILE_TIMEOUT_SECONDS,
+    PDF_BATCH_MAX_BYTES,
+    PDF_BATCH_MAX_FILES,
+    PDF_DEADLINE_GRACE_SECONDS,
+    PDF_GZIP_MIN_BYTES,
+    PDF_PARALLEL_MIN_PAGES,
+    PDF_PARALLEL_MIN_PAGES_PER_TASK,
+    PDF_REQUEST_TIMEOUT_SECONDS,
+    PDF_WARMUP,
+    PDF_WARMUP_TIMEOUT_SECONDS,
+)
+from deadlines import DEADLINE, DISCONNECT, Deadline, DeadlineToken, ExtractionCancelled, bound, checkpoint
+from document_sessions import DocumentSessions, count_school_games
+from format_detection import FormatRegistry
+from game_records import LAYOUTS, columnar, encode_json, gzip_body
+from layout_templates import FINGERPRINT_PRECISION, LayoutTemplates, page_fingerprint
+from metrics import (
+    CONTENT_TYPE_LATEST,
+    PAGES,
+    REQUEST_SECONDS,
+    STARTUP_SECONDS,
+    observe_abandoned,
+    observe_outcome,
+    observe_page_cache,
+    observe_stages,
+    observe_worker_caches,
+    render as render_metrics,
+    server_timing_header,
+    start_request_timings,
+    track_pool,
+)
+from page_layout import PageLayout, assign_columns
+from pdf_document import PdfDocument, PdfSource
+from profiling import ProfileStore, run_profiled
+from page_cache import PageCache, hash_prefix
+from result_cache import ResultCache
+from schedule_diff import ScheduleSnapshots, diff_result
+from scheduling import BULK, CostModel
+from table_schema import TableSchema
+from team_names import NamePipeline, collapse_whitespace
+from service_logging import configure_logging
+from warmup import Readiness, read_warmup_pdf
+from worker_pool import ExtractionPool, PoolSaturated, SharedBytes
+
+# Worker processes import this module too, so they get the same logging
+configure_logging()
+log = logging.getLogger('pdf_service')
+star_log = log.getChild('schedule_star')
+cif_log = log.getChild('cif_bracket')
+texas_log = log.getChild('texas_isd')
+iowa_log = log.getChild('iowa_hs')
+
+readiness = Readiness()
+extraction_pool = ExtractionPool()
+cost_model = CostModel()
+result_cache = ResultCache()
+page_cache = PageCache()
+document_sessions = DocumentSessions()
+snapshots = ScheduleSnapshots()
+profiles = ProfileStore()
+track_pool(extraction_pool)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if PDF_WARMUP:
+        extraction_pool.initializer = warm_up_worker
+    extraction_pool.start()
+    # Warm up in the background so the server is already listening and
+    # /ready can answer while it runs
+    startup = asyncio.create_task(_warm_up())
+    yield
+    startup.cancel()
+    extraction_pool.shutdown()
+
+
+async def _warm_up() -> None:
+    """Start and warm every worker process, then mark the service ready."""
+    if not PDF_WARMUP:
+        readiness.mark_ready()
+        return
+    try:
+        workers = await extraction_pool.warm_up(PDF_WARMUP_TIMEOUT_SECONDS)
+    except Exception as e:
+        log.error("Warm-up failed: %r", e)
+        readiness.mark_failed(repr(e))
+        return
+    readiness.mark_ready(workers=workers)
+    STARTUP_SECONDS.set(readiness.seconds)
+    log.info("Ready: %d workers warmed up in %.2fs", workers, readiness.seconds)
+
+
+app = FastAPI(title="PDF Schedule Extraction Service", lifespan=lifespan)
 
 # CORS middleware for Next.js API route
 app.add_middleware(
@@ -18,8 +122,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def server_timing(request: Request, call_next):
+    """Add a Server-Timing header with the extraction stages this request ran."""
+    started = time.perf_counter()
+    timings = start_request_timings()
+    response = await call_next(request)
+    response.headers['Server-Timing'] = server_timing_header(timings, started)
+    # The route template, not the raw path, so document tokens don't become labels
+    route = request.scope.get('route')
+    REQUEST_SECONDS.labels(getattr(route, 'path', 'unmatched')).observe(time.perf_counter() - started)
+    # Let cross-origin pages read it too, as CORS is open
+    response.headers['Timing-Allow-Origin'] = '*'
+    return response
+
 MAX_PDF_SIZE_BYTES = 10 * 1024 * 1024  # 10MB
+PDF_MAGIC = b'%PDF-'
+PDF_MAGIC_WINDOW = 1024
 MAX_GAMES = 400
+# How often a request waiting on its extraction checks for a disconnect
+DISCONNECT_POLL_SECONDS = 0.5
+
+# Extractors register themselves below with the indicators that detect them
+FORMATS = FormatRegistry()
+# Indicators are regexes over line text, which the stream backend produces
+# identically to pdfplumber at a third of the cost
+DETECTION_TEXT_BACKEND = 'stream'
+
+# Internal result keys: the detected format, and the full games_by_school map
+# of multi-school PDFs carried back from the worker. Stripped before the
+# response is returned. SPLIT_KEY marks a document handed back for the
+# service to extract page by page (in parallel ranges, or from the page cache).
+FORMAT_KEY = '_format'
+SESSION_GAMES_KEY = '_gamesBySchool'
+SPLIT_KEY = '_splitPages'
+# Page hashes and page events of a page-splittable document extracted whole,
+# for the service to store in its page cache
+PAGE_EVENTS_KEY = '_pageEvents'
+# Page count and stage seconds of a fresh parse, recorded as metrics by the
+# service and removed before the result is cached
+PAGE_COUNT_KEY = '_pageCount'
+STAGE_TIMINGS_KEY = '_stageSeconds'
+# Lookups the task made in its worker's own caches, for the service's metrics
+CACHE_COUNTS_KEY = '_cacheCounts'
 
 
 def detect_schedule_star_format(text: str) -> bool:
@@ -30,13 +176,7 @@ def detect_schedule_star_format(text: str) -> bool:
     - "*=League Event" footer
     - Team level headers (Boys Varsity, etc.)
     """
-    indicators = [
-        re.search(r'Schedule\s+Star', text, re.IGNORECASE),
-        re.search(r'866-448-9438', text),
-        re.search(r'\*=League Event', text),
-        re.search(r'Boys|Girls\s+(Varsity|Junior Varsity|Freshman)', text)
-    ]
-    return sum(bool(x) for x in indicators) >= 2
+    return FORMATS.detects('schedule_star', text)
 
 
 def detect_cif_bracket_format(text: str) -> bool:
@@ -47,13 +187,7 @@ def detect_cif_bracket_format(text: str) -> bool:
     - Round indicators (Round 1, Round 2, etc.)
     - "*DENOTES HOST TEAM" text
     """
-    indicators = [
-        re.search(r'CIF-SS', text, re.IGNORECASE),
-        re.search(r'CHAMPIONSHIPS', text, re.IGNORECASE),
-        re.search(r'Round 1', text, re.IGNORECASE),
-        re.search(r'\*DENOTES HOST TEAM', text, re.IGNORECASE),
-    ]
-    return sum(bool(x) for x in indicators) >= 3
+    return FORMATS.detects('cif_bracket', text)
 
 
 def detect_texas_isd_format(text: str) -> bool:
@@ -63,154 +197,274 @@ def detect_texas_isd_format(text: str) -> bool:
     - "BASKETBALL SCHEDULE" or "VARSITY" in title
     - Multiple school names in content
     """
-    indicators = [
-        re.search(r'Day Of Week', text, re.IGNORECASE),
-        re.search(r'School Name', text, re.IGNORECASE),
-        re.search(r'VARSITY.*BASKETBALL.*SCHEDULE', text, re.IGNORECASE),
-        re.search(r'Start Date.*Start Time', text, re.IGNORECASE),
-        re.search(r'Location.*Sport.*Opponent', text, re.IGNORECASE),
-    ]
-    return sum(bool(x) for x in indicators) >= 3
+    return FORMATS.detects('texas_isd', text)
+
+
+def _drain(events: Iterator[Dict]) -> Dict:
+    """Run a page-wise extractor to the end and return its result dict."""
+    while True:
+        try:
+            next(events)
+        except StopIteration as stop:
+            return stop.value
+
+
+def _search_pages(doc: PdfDocument, pattern: re.Pattern) -> Optional[re.Match]:
+    """
+    Search the document text for pattern, reading one more page at a time.
+    Headers are normally on the first page, so the rest of the document is
+    only read when the pattern isn't found there. Each step searches the
+    previous page and the new one, so a match may straddle a page break
+    without the text read so far being rescanned.
+    """
+    previous = ""
+    for i in range(doc.page_count):
+        page = doc.page_text(i) + "\n"
+        match = pattern.search(previous + page)
+        if match:
+            return match
+        previous = page
+    return None
+
+
+def _tag_format(format_name: str, events: Generator[Dict, None, Dict]) -> Generator[Dict, None, Dict]:
+    """Forward a page-wise extractor's events, labelling its metadata with the format."""
+    while True:
+        try:
+            event = next(events)
+        except StopIteration as stop:
+            return stop.value
+        if event['type'] == 'metadata':
+            event = dict(event, format=format_name)
+        yield event
+
+
+def _stop_after_max_games(events: Generator[Dict, None, Dict]) -> Generator[Dict, None, Dict]:
+    """
+    Forward an extractor's events, closing it once its games exceed
+    MAX_GAMES. The result would be rejected anyway, so the rest of the
+    document is not parsed.
+    """
+    game_count = 0
+    while True:
+        try:
+            event = next(events)
+        except StopIteration as stop:
+            return stop.value
+        yield event
+        # Between pages: stop here if the request's deadline has passed
+        checkpoint()
+        if event['type'] == 'games':
+            game_count += len(event['games'])
+            if game_count > MAX_GAMES:
+                events.close()
+                log.info("Stopped after %d games (limit %d)", game_count, MAX_GAMES)
+                return {'success': False, 'games': [], 'gameCount': game_count, 'truncated': True}
+
+
+def _iter_school_pages(events: Iterator[Dict], school_filter: Optional[str]) -> Generator[Dict, None, Dict[str, List[Dict]]]:
+    """
+    Turn a multi-school extractor's per-page gamesBySchool fragments into
+    games events for the selected school ("__all__": every school, each game
+    once; no school: empty progress events). Returns the merged map.
+    """
+    games_by_school = {}
+    seen = set()
+    for event in events:
+        fragment = event['gamesBySchool']
+        for school_name, games in fragment.items():
+            games_by_school.setdefault(school_name, []).extend(games)
+
+        if school_filter == '__all__':
+            page_games = []
+            for games in fragment.values():
+                for g in games:
+                    key = (g['date'], g['homeTeam'], g['awayTeam'])
+                    if key not in seen:
+                        seen.add(key)
+                        page_games.append(g)
+        elif school_filter:
+            page_games = fragment.get(school_filter, [])
+        else:
+            page_games = []
+        yield {'type': 'games', 'page': event['page'], 'games': page_games}
+    return games_by_school
+
+
+def _record_pages(doc: PdfDocument, format_name: str, events: Iterator[Dict]) -> Iterator[Dict]:
+    """
+    Forward a page-splittable format's page events, keeping them in
+    doc.page_events (when set) once every page is done. Pages without
+    events are absent.
+    """
+    pages: Dict[int, List[Dict]] = {}
+    for event in events:
+        pages.setdefault(event['page'] - 1, []).append(event)
+        yield event
+    if doc.page_events is not None:
+        doc.page_events[format_name] = pages
+
+
+def _multi_school_metadata(format_name: str, state: str, school_filter: Optional[str]) -> Dict:
+    if school_filter == '__all__':
+        main_team = 'All Schools'
+    else:
+        main_team = school_filter
+    return {'type': 'metadata', 'format': format_name, 'mainTeam': main_team, 'mainCity': None, 'mainState': state}
+
+
+# Header: "Printable? [Team Name] High School? [Sport] Schedule"
+MAXPREPS_HEADER_PATTERN = re.compile(
+    r'(?:Printable\s+)?(.+?)\s+(?:Basketball|Football|Baseball|Softball|Soccer|Volleyball|Hockey|Lacrosse)\s+Schedule',
+    re.MULTILINE | re.IGNORECASE
+)
+MAXPREPS_PRINTABLE_PREFIX = re.compile(r'^Printable\s+')
+MAXPREPS_ADDRESS_SCHOOL_PATTERN = re.compile(
+    r'Address[:\s]+[^,]*?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:High School|HS)'
+)
+MAXPREPS_ADDRESS_PATTERN = re.compile(r'Address[:\s]+[^,]+,\s*([^,]+),\s*([A-Z]{2})\s+\d{5}')
+
+# Game line pattern - captures all components on one line
+MAXPREPS_GAME_PATTERN = re.compile(
+    r'^(\d{1,2}/\d{1,2})\s+'           # Date
+    r'(@?\s*)([^(]+?)\s*'              # @ indicator + Team name
+    r'\(([^,]+),\s*([A-Z]{2})\)\s*'    # (City, State)
+    r'(\*{0,3})\s*'                    # Optional *, **, or ***
+    r'(?:\(([WL])\)\s*(\d+)\s*-\s*(\d+)|(Preview Game))?'  # Score or Preview
+)
+MAXPREPS_TIME_PATTERN = re.compile(r'^(\d{1,2}:\d{2}[ap])')
 
 
-def extract_maxpreps_schedule(pdf_file: io.BytesIO) -> Dict:
+def extract_maxpreps_schedule(doc: PdfDocument) -> Dict:
     """
     Extract game schedule from MaxPreps-style PDF.
     Returns dict with main_team info and list of games.
     """
+    return _drain(iter_maxpreps_schedule(doc))
 
-    with pdfplumber.open(pdf_file) as pdf:
-        # Get all text
-        all_text = ""
-        for page in pdf.pages:
-            all_text += page.extract_text() + "\n"
 
+def iter_maxpreps_schedule(doc: PdfDocument) -> Generator[Dict, None, Dict]:
+    """
+    Page-wise MaxPreps extraction: yields a metadata event, then a games
+    event per page, and returns the same dict as extract_maxpreps_schedule().
+    """
     # Log first 500 chars to help debug
-    print(f"[PDF Extract] First 500 chars: {all_text[:500]}")
+    if log.isEnabledFor(logging.DEBUG):
+        log.debug("First 500 chars: %s", doc.page_text(0)[:500])
 
     # Extract main team from header (supports Basketball, Football, etc.)
     # Pattern: "Printable? [Team Name] High School? [Sport] Schedule"
-    main_team_match = re.search(
-        r'(?:Printable\s+)?(.+?)\s+(?:Basketball|Football|Baseball|Softball|Soccer|Volleyball|Hockey|Lacrosse)\s+Schedule',
-        all_text,
-        re.MULTILINE | re.IGNORECASE
-    )
+    main_team_match = _search_pages(doc, MAXPREPS_HEADER_PATTERN)
 
     if main_team_match:
         main_team = main_team_match.group(1).strip()
-        main_team = re.sub(r'^Printable\s+', '', main_team)
-        print(f"[PDF Extract] Found main team via schedule header: {main_team}")
+        main_team = MAXPREPS_PRINTABLE_PREFIX.sub('', main_team)
+        log.debug("Found main team via schedule header: %s", main_team)
     else:
-        print("[PDF Extract] No match on schedule header, trying address...")
+        log.debug("No match on schedule header, trying address")
         # Fallback: look for "High School" pattern in address
-        hs_match = re.search(
-            r'Address[:\s]+[^,]*?([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:High School|HS)',
-            all_text
-        )
+        hs_match = _search_pages(doc, MAXPREPS_ADDRESS_SCHOOL_PATTERN)
         if hs_match:
             main_team = hs_match.group(1) + " High School"
-            print(f"[PDF Extract] Found main team via address: {main_team}")
+            log.debug("Found main team via address: %s", main_team)
         else:
-            print("[PDF Extract] Could not find main team - setting to Unknown")
+            log.debug("Could not find main team - setting to Unknown")
             main_team = "Unknown"
 
     # Extract city/state for main team from address line
-    addr_match = re.search(r'Address[:\s]+[^,]+,\s*([^,]+),\s*([A-Z]{2})\s+\d{5}', all_text)
+    addr_match = _search_pages(doc, MAXPREPS_ADDRESS_PATTERN)
     main_city = addr_match.group(1).strip() if addr_match else None
     main_state = addr_match.group(2) if addr_match else None
 
+    yield {'type': 'metadata', 'mainTeam': main_team, 'mainCity': main_city, 'mainState': main_state}
+
     # Parse game lines
     games = []
-    lines = all_text.split('\n')
-
-    # Game line pattern
-    game_pattern = re.compile(
-        r'^(\d{1,2}/\d{1,2})\s+'           # Date
-        r'(@?\s*)([^(]+?)\s*'              # @ indicator + Team name
-        r'\(([^,]+),\s*([A-Z]{2})\)\s*'    # (City, State)
-        r'(\*{0,3})\s*'                    # Optional *, **, or ***
-        r'(?:\(([WL])\)\s*(\d+)\s*-\s*(\d+)|(Preview Game))?'  # Score or Preview
-    )
-
-    time_pattern = re.compile(r'^(\d{1,2}:\d{2}[ap])')
-
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-
-        match = game_pattern.match(line)
-        if match:
-            date = match.group(1)
-            is_away = bool(match.group(2).strip())
-            opponent_raw = match.group(3).strip()
-            opp_city = match.group(4).strip()
-            opp_state = match.group(5)
-            game_type = match.group(6)  # *, **, ***
-            result = match.group(7)      # W or L
-            score1 = match.group(8)
-            score2 = match.group(9)
-            is_preview = match.group(10) == "Preview Game"
-
-            # Look ahead for time on next line
-            game_time = None
-            if i + 1 < len(lines):
-                next_line = lines[i + 1].strip()
-                time_match = time_pattern.match(next_line)
+    for page_index in range(doc.page_count):
+        lines = doc.page_text(page_index).split('\n')
+        # A game on the last line of a page has its time on the next page
+        if page_index + 1 < doc.page_count:
+            following_line = doc.page_text(page_index + 1).split('\n', 1)[0]
+        else:
+            following_line = ''
+        page_games = []
+
+        for i in range(len(lines)):
+            line = lines[i].strip()
+
+            match = MAXPREPS_GAME_PATTERN.match(line)
+            if match:
+                date = match.group(1)
+                is_away = bool(match.group(2).strip())
+                opponent_raw = match.group(3).strip()
+                opp_city = match.group(4).strip()
+                opp_state = match.group(5)
+                game_type = match.group(6)  # *, **, ***
+                result = match.group(7)      # W or L
+                score1 = match.group(8)
+                score2 = match.group(9)
+                is_preview = match.group(10) == "Preview Game"
+
+                # Look ahead for time on next line
+                game_time = None
+                next_line = (lines[i + 1] if i + 1 < len(lines) else following_line).strip()
+                time_match = MAXPREPS_TIME_PATTERN.match(next_line)
                 if time_match:
                     game_time = time_match.group(1)
                     # Convert to standard format
                     game_time = game_time.replace('p', ' PM').replace('a', ' AM')
 
-            # Determine scores (Winner - Loser format in MaxPreps)
-            if result == 'W':
-                main_team_score = int(score1) if score1 else None
-                opponent_score = int(score2) if score2 else None
-            elif result == 'L':
-                main_team_score = int(score2) if score2 else None
-                opponent_score = int(score1) if score1 else None
-            else:
-                main_team_score = None
-                opponent_score = None
-
-            # Determine home/away teams and assign scores correctly
-            if is_away:
-                # Main team is AWAY
-                home_team = opponent_raw
-                away_team = main_team
-                home_city = opp_city
-                home_state = opp_state
-                away_city = main_city
-                away_state = main_state
-                home_score = opponent_score
-                away_score = main_team_score
-            else:
-                # Main team is HOME
-                home_team = main_team
-                away_team = opponent_raw
-                home_city = main_city
-                home_state = main_state
-                away_city = opp_city
-                away_state = opp_state
-                home_score = main_team_score
-                away_score = opponent_score
-
-            game = {
-                'date': f"{date}/2025" if int(date.split('/')[0]) >= 8 else f"{date}/2026",
-                'time': game_time,
-                'homeTeam': home_team,
-                'awayTeam': away_team,
-                'homeCity': home_city,
-                'homeState': home_state,
-                'awayCity': away_city,
-                'awayState': away_state,
-                'homeScore': home_score,
-                'awayScore': away_score,
-                'isCompleted': result is not None,
-            }
-
-            games.append(game)
-
-        i += 1
+                # Determine scores (Winner - Loser format in MaxPreps)
+                if result == 'W':
+                    main_team_score = int(score1) if score1 else None
+                    opponent_score = int(score2) if score2 else None
+                elif result == 'L':
+                    main_team_score = int(score2) if score2 else None
+                    opponent_score = int(score1) if score1 else None
+                else:
+                    main_team_score = None
+                    opponent_score = None
+
+                # Determine home/away teams and assign scores correctly
+                if is_away:
+                    # Main team is AWAY
+                    home_team = opponent_raw
+                    away_team = main_team
+                    home_city = opp_city
+                    home_state = opp_state
+                    away_city = main_city
+                    away_state = main_state
+                    home_score = opponent_score
+                    away_score = main_team_score
+                else:
+                    # Main team is HOME
+                    home_team = main_team
+                    away_team = opponent_raw
+                    home_city = main_city
+                    home_state = main_state
+                    away_city = opp_city
+                    away_state = opp_state
+                    home_score = main_team_score
+                    away_score = opponent_score
+
+                game = {
+                    'date': f"{date}/2025" if int(date.split('/')[0]) >= 8 else f"{date}/2026",
+                    'time': game_time,
+                    'homeTeam': home_team,
+                    'awayTeam': away_team,
+                    'homeCity': home_city,
+                    'homeState': home_state,
+                    'awayCity': away_city,
+                    'awayState': away_state,
+                    'homeScore': home_score,
+                    'awayScore': away_score,
+                    'isCompleted': result is not None,
+                }
+
+                page_games.append(game)
+
+        games.extend(page_games)
+        yield {'type': 'games', 'page': page_index + 1, 'games': page_games}
 
     return {
         'success': True,
@@ -222,82 +476,33 @@ def extract_maxpreps_schedule(pdf_file: io.BytesIO) -> Dict:
     }
 
 
-def extract_schedule_star_format(pdf_file: io.BytesIO) -> Dict:
-    """
-    Extract schedule from Schedule Star format PDFs.
-    Extracts first team section found (usually Varsity).
-    """
-    # 1. Extract text from PDF
-    with pdfplumber.open(pdf_file) as pdf:
-        all_text = "\n".join(page.extract_text() for page in pdf.pages)
-
-    # 2. Extract school info from header
-    # Pattern matches: "Team Schedule [School Name] High School"
-    school_match = re.search(
-        r'Team Schedule\s+(.+?High School)',
-        all_text, re.MULTILINE
-    )
-    if school_match:
-        main_team = school_match.group(1).strip()
-    else:
-        # Fallback: try to find any "... High School" pattern
-        fallback_match = re.search(
-            r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+High School)',
-            all_text, re.MULTILINE
-        )
-        main_team = fallback_match.group(1) if fallback_match else "Unknown"
-
-    # 3. Extract address for city/state
-    addr_match = re.search(
-        r'([A-Za-z\s]+),\s*([A-Z]{2})\s+\d{5}',
-        all_text
-    )
-    main_city = addr_match.group(1).strip() if addr_match else None
-    main_state = addr_match.group(2) if addr_match else None
-
-    # 4. Find Varsity section and limit extraction to only Varsity games
-    varsity_section_match = re.search(
-        r'(Boys|Girls)\s+Varsity',
-        all_text, re.IGNORECASE
-    )
+# Default when no detector matches
+@FORMATS.register('maxpreps', text_backend='stream')
+def run_maxpreps_format(doc: PdfDocument, school: Optional[str]) -> Generator[Dict, None, Dict]:
+    log.debug("Trying MaxPreps format")
+    return (yield from _tag_format('maxpreps', iter_maxpreps_schedule(doc)))
 
-    if not varsity_section_match:
-        print("[Schedule Star] No Varsity section found")
-        # If no Varsity section found, extract all games (fallback)
-        varsity_text = all_text
-    else:
-        varsity_start = varsity_section_match.start()
 
-        # Find the next team section (Junior Varsity or Freshman) to know where to stop
-        next_section_match = re.search(
-            r'(Boys|Girls)\s+(Junior Varsity|Freshman)',
-            all_text[varsity_start:],
-            re.IGNORECASE
-        )
+SCHEDULE_STAR_GAME_PATTERN = re.compile(
+    r'^(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+'  # Day
+    r'(\d{2}/\d{2}/\d{2})\s+'           # Date MM/DD/YY
+    r'(\*?)(.+?)\s+'                     # League marker + Opponent
+    r'(Home|Away)\s+'                    # Home/Away
+    r'(TBA|\d{1,2}:\d{2}\s*[AP]M)',     # Time
+    re.MULTILINE
+)
+SCHEDULE_STAR_AM_PM = re.compile(r'\s*([AP]M)')
+SCHEDULE_STAR_SCHOOL_PATTERN = re.compile(r'Team Schedule\s+(.+?High School)', re.MULTILINE)
+SCHEDULE_STAR_HIGH_SCHOOL_PATTERN = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*\s+High School)', re.MULTILINE)
+SCHEDULE_STAR_ADDRESS_PATTERN = re.compile(r'([A-Za-z\s]+),\s*([A-Z]{2})\s+\d{5}')
+SCHEDULE_STAR_VARSITY_PATTERN = re.compile(r'(Boys|Girls)\s+Varsity', re.IGNORECASE)
+SCHEDULE_STAR_NEXT_SECTION_PATTERN = re.compile(r'(Boys|Girls)\s+(Junior Varsity|Freshman)', re.IGNORECASE)
 
-        if next_section_match:
-            # Extract only up to the next section
-            varsity_end = varsity_start + next_section_match.start()
-            varsity_text = all_text[varsity_start:varsity_end]
-            print(f"[Schedule Star] Extracting Varsity section only (chars {varsity_start}-{varsity_end})")
-        else:
-            # No other section found, extract from Varsity to end
-            varsity_text = all_text[varsity_start:]
-            print(f"[Schedule Star] Extracting Varsity section to end of document")
-
-    # 5. Parse game lines from Varsity section only
-    # Game line pattern - captures all components on one line
-    game_line_pattern = re.compile(
-        r'^(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday)\s+'  # Day
-        r'(\d{2}/\d{2}/\d{2})\s+'           # Date MM/DD/YY
-        r'(\*?)(.+?)\s+'                     # League marker + Opponent
-        r'(Home|Away)\s+'                    # Home/Away
-        r'(TBA|\d{1,2}:\d{2}\s*[AP]M)',     # Time
-        re.MULTILINE
-    )
 
+def _parse_schedule_star_games(text: str, main_team: str, main_city: Optional[str], main_state: Optional[str]) -> List[Dict]:
+    """Parse Schedule Star game lines in text into games."""
     games = []
-    for match in game_line_pattern.finditer(varsity_text):
+    for match in SCHEDULE_STAR_GAME_PATTERN.finditer(text):
         day_of_week = match.group(1)
         date_str = match.group(2)      # MM/DD/YY
         is_league = bool(match.group(3))
@@ -318,7 +523,7 @@ def extract_schedule_star_format(pdf_file: io.BytesIO) -> Dict:
             time_normalized = None
         else:
             # Clean up time formatting - ensure single space before AM/PM
-            time_normalized = re.sub(r'\s*([AP]M)', r' \1', time_str)
+            time_normalized = SCHEDULE_STAR_AM_PM.sub(r' \1', time_str)
 
         # Determine home/away teams
         if location == 'Home':
@@ -350,9 +555,78 @@ def extract_schedule_star_format(pdf_file: io.BytesIO) -> Dict:
             'isCompleted': False,
         })
 
-    print(f"[Schedule Star] Extracted {len(games)} games from {main_team}")
+    return games
+
+
+def extract_schedule_star_format(doc: PdfDocument) -> Dict:
+    """
+    Extract schedule from Schedule Star format PDFs.
+    Extracts first team section found (usually Varsity).
+    """
+    return _drain(iter_schedule_star_format(doc))
+
+
+def iter_schedule_star_format(doc: PdfDocument) -> Generator[Dict, None, Dict]:
+    """
+    Page-wise Schedule Star extraction: yields a metadata event, then a
+    games event per page of the Varsity section, and returns the same dict
+    as extract_schedule_star_format().
+    """
+    # 1. Extract school info from header
+    # Pattern matches: "Team Schedule [School Name] High School"
+    school_match = _search_pages(doc, SCHEDULE_STAR_SCHOOL_PATTERN)
+    if school_match:
+        main_team = school_match.group(1).strip()
+    else:
+        # Fallback: try to find any "... High School" pattern
+        fallback_match = _search_pages(doc, SCHEDULE_STAR_HIGH_SCHOOL_PATTERN)
+        main_team = fallback_match.group(1) if fallback_match else "Unknown"
+
+    # 2. Extract address for city/state
+    addr_match = _search_pages(doc, SCHEDULE_STAR_ADDRESS_PATTERN)
+    main_city = addr_match.group(1).strip() if addr_match else None
+    main_state = addr_match.group(2) if addr_match else None
+
+    yield {'type': 'metadata', 'mainTeam': main_team, 'mainCity': main_city, 'mainState': main_state}
+
+    # 3. Find Varsity section and limit extraction to only Varsity games.
+    # Pages before the Varsity header are only used if there is no header.
+    games = []
+    in_varsity = False
+    for page_index in range(doc.page_count):
+        text = doc.page_text(page_index)
+        if not in_varsity:
+            varsity_section_match = SCHEDULE_STAR_VARSITY_PATTERN.search(text)
+            if not varsity_section_match:
+                continue
+            in_varsity = True
+            text = text[varsity_section_match.start():]
+
+        # Find the next team section (Junior Varsity or Freshman) to know where to stop
+        next_section_match = SCHEDULE_STAR_NEXT_SECTION_PATTERN.search(text)
+        if next_section_match:
+            text = text[:next_section_match.start()]
+
+        # 4. Parse game lines from Varsity section only
+        page_games = _parse_schedule_star_games(text, main_team, main_city, main_state)
+        games.extend(page_games)
+        yield {'type': 'games', 'page': page_index + 1, 'games': page_games}
+
+        if next_section_match:
+            star_log.debug("Extracted Varsity section only (ends on page %d)", page_index + 1)
+            break
+
+    if not in_varsity:
+        star_log.debug("No Varsity section found")
+        # If no Varsity section found, extract all games (fallback)
+        for page_index in range(doc.page_count):
+            page_games = _parse_schedule_star_games(doc.page_text(page_index), main_team, main_city, main_state)
+            games.extend(page_games)
+            yield {'type': 'games', 'page': page_index + 1, 'games': page_games}
+
+    star_log.debug("Extracted %d games from %s", len(games), main_team)
     if games:
-        print(f"[Schedule Star] First game: {games[0]}")
+        star_log.debug("First game: %s", games[0])
 
     return {
         'success': True,
@@ -364,27 +638,50 @@ def extract_schedule_star_format(pdf_file: io.BytesIO) -> Dict:
     }
 
 
-def extract_cif_bracket_format(pdf_file: io.BytesIO) -> Dict:
+@FORMATS.register(
+    'schedule_star',
+    indicators=[
+        (r'Schedule\s+Star', re.IGNORECASE),
+        r'866-448-9438',                                    # Phone
+        r'\*=League Event',                                 # Footer
+        r'Boys|Girls\s+(Varsity|Junior Varsity|Freshman)',  # Team level headers
+    ],
+    threshold=2,
+    priority=2,
+    text_backend='stream',
+)
+def run_schedule_star_format(doc: PdfDocument, school: Optional[str]) -> Generator[Dict, None, Dict]:
+    log.debug("Detected Schedule Star format")
+    return (yield from _tag_format('schedule_star', iter_schedule_star_format(doc)))
+
+
+# Pattern: "Team Name * (League info) W-L-T" or "Team Name (League info) W-L-T"
+# The asterisk indicates host team (appears after team name, before parenthesis)
+CIF_TEAM_PATTERN = re.compile(
+    r'^([A-Za-z][A-Za-z\s/.]+?)\s*(\*)?\s*\([^)]+\)\s+\d+-\d+-\d+\s*$',
+    re.MULTILINE
+)
+
+# Round headers on one line, their dates and times on the next
+CIF_ROUND1_PATTERN = re.compile(
+    r'Round 1.*?\n(\d{2}/\d{2}/\d{4})\s+(\d{2}:\d{2}\s+[AP]M)',
+    re.IGNORECASE | re.DOTALL
+)
+
+
+def extract_cif_bracket_format(doc: PdfDocument) -> Dict:
     """
     Extract schedule from CIF-SS playoff bracket format PDFs.
     Extracts Round 1 matchups from tournament brackets.
     """
-    # 1. Extract text from PDF
-    with pdfplumber.open(pdf_file) as pdf:
-        all_text = "\n".join(page.extract_text() for page in pdf.pages)
-
-    # 2. Extract Round 1 date and time
+    # 1. Extract Round 1 date and time
     # In the bracket format, round headers are on one line: "Round 1 Round 2 Quarter Final..."
     # And dates/times are on the next line: "02/11/2026 07:00 PM 02/13/2026 07:00 PM..."
     # Extract the first date/time which corresponds to Round 1
-    round1_match = re.search(
-        r'Round 1.*?\n(\d{2}/\d{2}/\d{4})\s+(\d{2}:\d{2}\s+[AP]M)',
-        all_text,
-        re.IGNORECASE | re.DOTALL
-    )
+    round1_match = _search_pages(doc, CIF_ROUND1_PATTERN)
 
     if not round1_match:
-        print("[CIF Bracket] Could not find Round 1 date/time")
+        cif_log.debug("Could not find Round 1 date/time")
         return {
             'success': False,
             'games': [],
@@ -394,26 +691,26 @@ def extract_cif_bracket_format(pdf_file: io.BytesIO) -> Dict:
     round1_date = round1_match.group(1)  # MM/DD/YYYY
     round1_time = round1_match.group(2)  # HH:MM AM/PM
 
-    print(f"[CIF Bracket] Round 1: {round1_date} at {round1_time}")
-
-    # 3. Extract all team lines
-    # Pattern: "Team Name * (League info) W-L-T" or "Team Name (League info) W-L-T"
-    # The asterisk indicates host team (appears after team name, before parenthesis)
-    team_pattern = re.compile(
-        r'^([A-Za-z][A-Za-z\s/.]+?)\s*(\*)?\s*\([^)]+\)\s+\d+-\d+-\d+\s*$',
-        re.MULTILINE
-    )
+    cif_log.debug("Round 1: %s at %s", round1_date, round1_time)
 
+    # 2. Extract team lines page by page. A document may hold several
+    # divisions' brackets, so every page is read, unless past MAX_GAMES
+    # pairs the result would be rejected anyway
     teams = []
-    for match in team_pattern.finditer(all_text):
-        team_name = match.group(1).strip()
-        is_host = bool(match.group(2))  # True if asterisk present
-        teams.append({
-            'name': team_name,
-            'isHost': is_host
-        })
-
-    print(f"[CIF Bracket] Found {len(teams)} teams")
+    truncated = False
+    for page_index in range(doc.page_count):
+        for match in CIF_TEAM_PATTERN.finditer(doc.page_text(page_index)):
+            team_name = match.group(1).strip()
+            is_host = bool(match.group(2))  # True if asterisk present
+            teams.append({
+                'name': team_name,
+                'isHost': is_host
+            })
+        if len(teams) // 2 > MAX_GAMES:
+            truncated = True
+            break
+
+    cif_log.debug("Found %d teams", len(teams))
 
     if len(teams) == 0:
         return {
@@ -422,7 +719,7 @@ def extract_cif_bracket_format(pdf_file: io.BytesIO) -> Dict:
             'gameCount': 0
         }
 
-    # 4. Pair teams into games (consecutive pairs)
+    # 3. Pair teams into games (consecutive pairs)
     games = []
     for i in range(0, len(teams) - 1, 2):
         team1 = teams[i]
@@ -454,11 +751,11 @@ def extract_cif_bracket_format(pdf_file: io.BytesIO) -> Dict:
             'isCompleted': False,
         })
 
-    print(f"[CIF Bracket] Extracted {len(games)} Round 1 games")
+    cif_log.debug("Extracted %d Round 1 games", len(games))
     if games:
-        print(f"[CIF Bracket] First game: {games[0]}")
+        cif_log.debug("First game: %s", games[0])
 
-    return {
+    result = {
         'success': True,
         'mainTeam': None,
         'mainCity': None,
@@ -466,135 +763,208 @@ def extract_cif_bracket_format(pdf_file: io.BytesIO) -> Dict:
         'games': games,
         'gameCount': len(games)
     }
+    if truncated:
+        result['truncated'] = True
+    return result
+
+
+@FORMATS.register(
+    'cif_bracket',
+    indicators=[
+        (r'CIF-SS', re.IGNORECASE),
+        (r'CHAMPIONSHIPS', re.IGNORECASE),
+        (r'Round 1', re.IGNORECASE),
+        (r'\*DENOTES HOST TEAM', re.IGNORECASE),
+    ],
+    threshold=3,
+    priority=0,
+    text_backend='stream',
+)
+def run_cif_bracket_format(doc: PdfDocument, school: Optional[str]) -> Generator[Dict, None, Dict]:
+    log.debug("Detected CIF bracket format")
+    # Brackets are paired across the whole document, so all games arrive at once
+    result = extract_cif_bracket_format(doc)
+    yield {'type': 'metadata', 'format': 'cif_bracket', 'mainTeam': None, 'mainCity': None, 'mainState': None}
+    yield {'type': 'games', 'page': doc.page_count, 'games': result['games']}
+    return result
+
+
+# Texas ISD schedule tables. A table needs all eight headers, though only
+# the taken columns are read
+TEXAS_ISD_SCHEMA = TableSchema(
+    fields={
+        'day': ('day',),
+        'date': ('date',),
+        'time': ('time',),
+        'school': ('school name',),
+        'location': ('location',),
+        'sport': ('sport',),
+        'opponent': ('opponent',),
+        'venue': ('venue',),
+    },
+    required=[('day',), ('date',), ('time',), ('school',), ('location',), ('sport',), ('opponent',), ('venue',)],
+    take=('date', 'time', 'school', 'location', 'opponent'),
+    width_fields=('day', 'date', 'time', 'school', 'location', 'opponent'),
+)
+
+TEXAS_TIME_PATTERN = re.compile(r'\s*([AP]M)')
+
+# Common mascot/team names that appear after the school name
+TEXAS_MASCOT_PATTERN = re.compile(
+    r'\s+(Tigers?|Eagles?|Warriors?|Knights?|Patriots?|Buffaloes?|Rangers?|Basketball|Varsity|Cougars?|Lions?|Panthers?)'
+)
+TEXAS_ABBREVIATION_PATTERN = re.compile(r'\s+[A-Z]{2,4}$')
+
+
+def _strip_mascot(name: str) -> str:
+    return TEXAS_MASCOT_PATTERN.split(name, 1)[0].strip()
+
 
+def _strip_abbreviation(name: str) -> str:
+    """e.g. "Westlake High School WHS" -> "Westlake High School" """
+    return TEXAS_ABBREVIATION_PATTERN.sub('', name)
 
-def extract_texas_isd_format(pdf_file: io.BytesIO, school_filter: Optional[str] = None) -> Dict:
+
+def _drop_repeated_school(name: str) -> str:
+    """e.g. "United HS United" -> "United HS" """
+    words = name.split()
+    if len(words) >= 3 and words[-1] == words[0]:
+        return ' '.join(words[:-1])
+    return name
+
+
+texas_opponent_name = NamePipeline(collapse_whitespace, _strip_mascot, _strip_abbreviation, _drop_repeated_school)
+
+
+def extract_texas_isd_format(doc: PdfDocument, school_filter: Optional[str] = None) -> Dict:
     """
     Extract schedule from Texas ISD multi-school format PDFs.
     Uses table extraction for better accuracy with wrapped text.
 
     Args:
-        pdf_file: PDF file buffer
+        doc: Parsed PDF document
         school_filter: Optional school name to filter (e.g., "Brennan HS"). If None, extracts first school found.
 
     Returns:
         Dict with schedule data for the specified school
     """
-    games_by_school = {}
-
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
-
-            for table in tables:
-                if not table or len(table) < 3:
-                    continue
-
-                # Find header row (usually row 0 or 1)
-                header_row_idx = 0
-                if table[0][0] and 'SCHEDULE' in str(table[0][0]).upper():
-                    header_row_idx = 1  # Title row, headers are in row 1
-
-                headers = [str(h).strip().lower() if h else "" for h in table[header_row_idx]]
-
-                try:
-                    day_idx = next(i for i, h in enumerate(headers) if 'day of week' in h or 'day' in h)
-                    date_idx = next(i for i, h in enumerate(headers) if 'start date' in h or 'date' in h)
-                    time_idx = next(i for i, h in enumerate(headers) if 'start time' in h or 'time' in h)
-                    school_idx = next(i for i, h in enumerate(headers) if 'school name' in h)
-                    location_idx = next(i for i, h in enumerate(headers) if 'location' in h)
-                    sport_idx = next(i for i, h in enumerate(headers) if 'sport' in h)
-                    opponent_idx = next(i for i, h in enumerate(headers) if 'opponent' in h)
-                    venue_idx = next(i for i, h in enumerate(headers) if 'venue' in h)
-                except StopIteration:
-                    # This table doesn't have the expected columns
-                    continue
-
-                # Parse data rows (start after header row)
-                for row in table[header_row_idx + 1:]:
-                    if not row or len(row) <= max(day_idx, date_idx, time_idx, school_idx, location_idx, opponent_idx):
-                        continue
+    return texas_isd_response(collect_texas_isd_games(doc), school_filter)
 
-                    date_str = str(row[date_idx]).strip() if row[date_idx] else None
-                    time_str = str(row[time_idx]).strip() if row[time_idx] else None
-                    school_name = str(row[school_idx]).strip() if row[school_idx] else None
-                    location = str(row[location_idx]).strip() if row[location_idx] else None
-                    opponent_raw = str(row[opponent_idx]).strip() if row[opponent_idx] else None
 
-                    # Clean up opponent name (remove newlines, extra whitespace, mascot names on separate lines)
-                    if opponent_raw:
-                        # Replace newlines with spaces, collapse multiple spaces
-                        opponent = re.sub(r'\s+', ' ', opponent_raw.replace('\n', ' ')).strip()
+def collect_texas_isd_games(doc: PdfDocument) -> Dict[str, List[Dict]]:
+    """Parse every schedule table in a Texas ISD PDF into {school name: games}."""
+    return _merge_page_fragments(iter_texas_isd_pages(doc))
 
-                        # Remove common mascot/team names that appear after school name
-                        opponent = re.split(r'\s+(Tigers?|Eagles?|Warriors?|Knights?|Patriots?|Buffaloes?|Rangers?|Basketball|Varsity|Cougars?|Lions?|Panthers?)', opponent)[0].strip()
 
-                        # Remove abbreviations at the end (e.g., "Westlake High School WHS" -> "Westlake High School")
-                        opponent = re.sub(r'\s+[A-Z]{2,4}$', '', opponent)
+def iter_texas_isd_pages(doc: PdfDocument, page_indices: Optional[Iterable[int]] = None) -> Iterator[Dict]:
+    """
+    Page-wise Texas ISD extraction: yields a games event per page with that
+    page's games grouped by school. Pages are independent, so page_indices
+    can restrict it to part of the document.
+    """
+    for page_index in (range(doc.page_count) if page_indices is None else page_indices):
+        page_games_by_school = {}
+        tables = doc.page_tables(page_index)
 
-                        # Remove duplicate school names (e.g., "United HS United" -> "United HS")
-                        words = opponent.split()
-                        if len(words) >= 3 and words[-1] == words[0]:
-                            opponent = ' '.join(words[:-1])
-                    else:
-                        opponent = None
+        for table in tables:
+            if not table or len(table) < 3:
+                continue
 
-                    # Skip invalid rows
-                    if not date_str or not school_name or not opponent or not location:
-                        continue
+            # Find header row (usually row 0 or 1)
+            header_row_idx = 0
+            if table[0][0] and 'SCHEDULE' in str(table[0][0]).upper():
+                header_row_idx = 1  # Title row, headers are in row 1
 
-                    # Skip header rows that got repeated
-                    if 'Day Of Week' in date_str or 'Start Date' in date_str:
-                        continue
+            columns = TEXAS_ISD_SCHEMA.columns(table[header_row_idx])
+            if columns is None:
+                # This table doesn't have the expected columns
+                continue
 
-                    # Skip tournament games with TBD opponents
-                    if opponent in ['TBD', 'None'] or 'Tournament' in opponent or 'Classic' in opponent or 'Invitational' in opponent:
-                        continue
+            # Parse data rows (start after header row)
+            for date_str, time_str, school_name, location, opponent_raw in columns.rows(
+                itertools.islice(table, header_row_idx + 1, None)
+            ):
+                # Skip invalid rows. Empty cells are None, so most are caught
+                # before any stripping; whitespace-only cells after it
+                if not (date_str and school_name and location and opponent_raw):
+                    continue
+                date_str = date_str.strip()
+                school_name = school_name.strip()
+                location = location.strip()
+                opponent = opponent_raw.strip()
+                if not (date_str and school_name and location and opponent):
+                    continue
 
-                    # Normalize time
-                    if time_str in ['TBA', 'None', '']:
-                        time_normalized = None
-                    else:
-                        time_normalized = re.sub(r'\s*([AP]M)', r' \1', time_str)
-
-                    # Determine home/away teams
-                    if location == 'Home':
-                        home_team = school_name
-                        away_team = opponent
-                        home_city = None
-                        home_state = 'TX'
-                        away_city = None
-                        away_state = None
-                    else:  # Away
-                        home_team = opponent
-                        away_team = school_name
-                        home_city = None
-                        home_state = None
-                        away_city = None
-                        away_state = 'TX'
+                # Clean up opponent name (remove newlines, extra whitespace, mascot names on separate lines)
+                opponent = texas_opponent_name(opponent)
 
-                    game = {
-                        'date': date_str,
-                        'time': time_normalized,
-                        'homeTeam': home_team,
-                        'awayTeam': away_team,
-                        'homeCity': home_city,
-                        'homeState': home_state,
-                        'awayCity': away_city,
-                        'awayState': away_state,
-                        'homeScore': None,
-                        'awayScore': None,
-                        'isCompleted': False,
-                    }
+                # Skip header rows that got repeated
+                if 'Day Of Week' in date_str or 'Start Date' in date_str:
+                    continue
 
-                    # Group by school
-                    if school_name not in games_by_school:
-                        games_by_school[school_name] = []
-                    games_by_school[school_name].append(game)
+                # Skip tournament games with TBD opponents
+                if opponent in ['TBD', 'None'] or 'Tournament' in opponent or 'Classic' in opponent or 'Invitational' in opponent:
+                    continue
 
+                # Normalize time
+                time_str = time_str.strip() if time_str else None
+                if not time_str or time_str in ('TBA', 'None'):
+                    time_normalized = None
+                else:
+                    time_normalized = TEXAS_TIME_PATTERN.sub(r' \1', time_str)
+
+                # Determine home/away teams
+                if location == 'Home':
+                    home_team = school_name
+                    away_team = opponent
+                    home_city = None
+                    home_state = 'TX'
+                    away_city = None
+                    away_state = None
+                else:  # Away
+                    home_team = opponent
+                    away_team = school_name
+                    home_city = None
+                    home_state = None
+                    away_city = None
+                    away_state = 'TX'
+
+                game = {
+                    'date': date_str,
+                    'time': time_normalized,
+                    'homeTeam': home_team,
+                    'awayTeam': away_team,
+                    'homeCity': home_city,
+                    'homeState': home_state,
+                    'awayCity': away_city,
+                    'awayState': away_state,
+                    'homeScore': None,
+                    'awayScore': None,
+                    'isCompleted': False,
+                }
+
+                # Group by school
+                if school_name not in page_games_by_school:
+                    page_games_by_school[school_name] = []
+                page_games_by_school[school_name].append(game)
+
+        yield {'type': 'games', 'page': page_index + 1, 'gamesBySchool': page_games_by_school}
+
+
+def texas_isd_response(
+    games_by_school: Mapping[str, List[Dict]],
+    school_filter: Optional[str] = None,
+    game_counts: Optional[Dict[str, int]] = None,
+) -> Dict:
+    """
+    Build the response for a parsed Texas ISD PDF: the school selection
+    prompt, one school's games, or every school's games for "__all__".
+    game_counts, games per school, saves counting them from
+    games_by_school (a document session's, which unpacks what it's read).
+    """
     # Determine which school to return
     if not games_by_school:
-        print("[Texas ISD] No games found")
+        texas_log.debug("No games found")
         return {
             'success': False,
             'mainTeam': None,
@@ -605,12 +975,11 @@ def extract_texas_isd_format(pdf_file: io.BytesIO, school_filter: Optional[str]
         }
 
     # Calculate game counts for each school
-    school_game_counts = {school: len(games) for school, games in games_by_school.items()}
+    school_game_counts = game_counts if game_counts is not None else count_school_games(games_by_school)
 
     # If no school_filter specified, return school selection prompt
     if not school_filter:
-        print(f"[Texas ISD] Multi-school PDF detected. Awaiting school selection.")
-        print(f"[Texas ISD] Available schools: {list(games_by_school.keys())}")
+        texas_log.debug("Multi-school PDF, awaiting school selection. Available schools: %s", list(games_by_school))
         return {
             'success': True,
             'requiresSchoolSelection': True,
@@ -625,12 +994,28 @@ def extract_texas_isd_format(pdf_file: io.BytesIO, school_filter: Optional[str]
             'gameCount': 0
         }
 
+    if school_filter == '__all__':
+        all_games = _merge_school_games(games_by_school)
+        texas_log.debug("Extracted %d unique games (all schools)", len(all_games))
+        return {
+            'success': True,
+            'mainTeam': 'All Schools',
+            'mainCity': None,
+            'mainState': 'TX',
+            'games': all_games,
+            'gameCount': len(all_games),
+            'availableSchools': [
+                {'name': school, 'gameCount': count}
+                for school, count in school_game_counts.items()
+            ]
+        }
+
     # If school_filter specified, use it
     school_name = school_filter
     games = games_by_school.get(school_filter, [])
 
     if not games:
-        print(f"[Texas ISD] School '{school_filter}' not found. Available: {list(games_by_school.keys())}")
+        texas_log.info("School %r not found. Available: %s", school_filter, list(games_by_school))
         return {
             'success': False,
             'error': f"School '{school_filter}' not found in PDF",
@@ -645,10 +1030,9 @@ def extract_texas_isd_format(pdf_file: io.BytesIO, school_filter: Optional[str]
             'gameCount': 0
         }
 
-    print(f"[Texas ISD] Extracted {len(games)} games from {school_name}")
-    print(f"[Texas ISD] Available schools: {list(games_by_school.keys())}")
+    texas_log.debug("Extracted %d games from %s", len(games), school_name)
     if games:
-        print(f"[Texas ISD] First game: {games[0]}")
+        texas_log.debug("First game: %s", games[0])
 
     return {
         'success': True,
@@ -664,16 +1048,85 @@ def extract_texas_isd_format(pdf_file: io.BytesIO, school_filter: Optional[str]
     }
 
 
+def _texas_isd_result(games_by_school: Dict[str, List[Dict]], school: Optional[str]) -> Dict:
+    result = texas_isd_response(games_by_school, school)
+    result[SESSION_GAMES_KEY] = games_by_school
+    return result
+
+
+def _merge_texas_isd_pages(events: Iterable[Dict], school: Optional[str]) -> Dict:
+    """Result from page events extracted in separate page ranges."""
+    return _texas_isd_result(_merge_page_fragments(events), school)
+
+
+@FORMATS.register(
+    'texas_isd',
+    indicators=[
+        (r'Day Of Week', re.IGNORECASE),
+        (r'School Name', re.IGNORECASE),
+        (r'VARSITY.*BASKETBALL.*SCHEDULE', re.IGNORECASE),
+        (r'Start Date.*Start Time', re.IGNORECASE),
+        (r'Location.*Sport.*Opponent', re.IGNORECASE),
+    ],
+    threshold=3,
+    priority=3,
+    pages=iter_texas_isd_pages,
+    merge_pages=_merge_texas_isd_pages,
+)
+def run_texas_isd_format(doc: PdfDocument, school: Optional[str]) -> Generator[Dict, None, Dict]:
+    log.debug("Detected Texas ISD format (school filter: %s)", school)
+    yield _multi_school_metadata('texas_isd', 'TX', school)
+    games_by_school = yield from _iter_school_pages(
+        _record_pages(doc, 'texas_isd', iter_texas_isd_pages(doc)), school
+    )
+    return _texas_isd_result(games_by_school, school)
+
+
+def _merge_page_fragments(events: Iterator[Dict]) -> Dict[str, List[Dict]]:
+    """Merge per-page gamesBySchool fragments, in page order, into one map."""
+    games_by_school = {}
+    for event in events:
+        for school_name, games in event['gamesBySchool'].items():
+            games_by_school.setdefault(school_name, []).extend(games)
+    return games_by_school
+
+
+def _merge_school_games(games_by_school: Dict[str, List[Dict]]) -> List[Dict]:
+    """
+    Combine every school's games, dropping the second copy of games listed
+    under both teams, sorted by date.
+    """
+    seen = set()
+    all_games = []
+    for school_games in games_by_school.values():
+        for g in school_games:
+            key = (g['date'], g['homeTeam'], g['awayTeam'])
+            if key not in seen:
+                seen.add(key)
+                all_games.append(g)
+
+    def _date_sort_key(g):
+        parts = g['date'].split('/')
+        try:
+            return (int(parts[2]), int(parts[0]), int(parts[1]))
+        except (IndexError, ValueError):
+            # Unparseable dates (free-text table cells) sort last
+            return (9999, 0, 0)
+
+    all_games.sort(key=_date_sort_key)
+    return all_games
+
+
 def detect_iowa_hs_format(text: str) -> bool:
-    indicators = [
-        re.search(r'IOWA HIGH SCHOOL ATHLETIC ASSOCIATION', text, re.IGNORECASE),
-        re.search(r'REGULAR SEASON SCHEDULES', text, re.IGNORECASE),
-        re.search(r'GROUP \d', text),
-        re.search(r'Week \d', text),
-    ]
-    return sum(bool(x) for x in indicators) >= 3
+    return FORMATS.detects('iowa_hs', text)
 
 
+IOWA_WEEK_PATTERN = re.compile(r'Week\s+(\d+)')
+IOWA_WORD_OPTIONS = {'keep_blank_chars': True, 'x_tolerance': 3, 'y_tolerance': 3}
+
+# Grid layouts seen by this worker process, see _iowa_page_layout()
+iowa_templates = LayoutTemplates()
+
 IOWA_CITY_FIRST = {
     'Des Moines', 'Iowa City', 'Sioux City', 'Council Bluffs',
     'Cedar Rapids', 'Davenport', 'Dubuque', 'Waterloo',
@@ -694,18 +1147,34 @@ def _parse_iowa_team_name(raw: str) -> tuple:
     return (before, after)
 
 
+IOWA_AWAY_PREFIX = re.compile(r'^at\s+', re.IGNORECASE)
+
+
+def _parse_iowa_opponent(cell: str) -> tuple:
+    """Parse a grid cell like 'at Ames, Ames High' into (is_away, team_name, city)."""
+    is_away = cell.lower().startswith('at ')
+    return (is_away,) + _parse_iowa_team_name(IOWA_AWAY_PREFIX.sub('', cell).strip())
+
+
+iowa_team_name = NamePipeline(_parse_iowa_team_name)
+iowa_opponent = NamePipeline(_parse_iowa_opponent)
+
+
+IOWA_DATE_PATTERN = re.compile(r'([A-Za-z]+)\.?\s+(\d{1,2})')
+IOWA_MONTHS = {
+    'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
+    'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
+}
+
+
 def _parse_iowa_date(date_text: str, year: int) -> Optional[str]:
     """Convert 'Aug. 29' or 'Sept. 5' to 'MM/DD/YYYY'."""
-    month_map = {
-        'jan': 1, 'feb': 2, 'mar': 3, 'apr': 4, 'may': 5, 'jun': 6,
-        'jul': 7, 'aug': 8, 'sep': 9, 'sept': 9, 'oct': 10, 'nov': 11, 'dec': 12,
-    }
-    m = re.match(r'([A-Za-z]+)\.?\s+(\d{1,2})', date_text.strip())
+    m = IOWA_DATE_PATTERN.match(date_text.strip())
     if not m:
         return None
     month_str = m.group(1).lower().rstrip('.')
     day = int(m.group(2))
-    month = month_map.get(month_str)
+    month = IOWA_MONTHS.get(month_str)
     if not month:
         return None
     return f"{month}/{day}/{year}"
@@ -727,186 +1196,332 @@ def _build_column_ranges(col_positions: List[Tuple[float, str]], page_width: flo
     return ranges
 
 
-def _assign_word_to_column(word_x0: float, col_ranges: List[Tuple[float, float, str]]) -> Optional[str]:
-    """Find which column range a word falls into."""
-    for left, right, name in col_ranges:
-        if left <= word_x0 < right:
-            return name
-    return None
-
-
-def extract_iowa_hs_format(pdf_file: io.BytesIO, school_filter: Optional[str] = None) -> Dict:
+def extract_iowa_hs_format(doc: PdfDocument, school_filter: Optional[str] = None) -> Dict:
     """
     Extract schedule from Iowa HS Athletic Association grid PDFs.
     Column-based: each school is a column, rows are weeks.
     Supports multiple groups per year, 2025 + 2026 sections.
     """
-    games_by_school = {}
+    return iowa_hs_response(collect_iowa_hs_games(doc), school_filter)
 
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            page_width = page.width
-            words = page.extract_words(keep_blank_chars=True, x_tolerance=3, y_tolerance=3)
-            if not words:
-                continue
-
-            # Sort words by y then x
-            words.sort(key=lambda w: (w['top'], w['x0']))
 
-            # Find year markers
-            year_markers = []
-            for w in words:
-                if w['text'].strip() in ('2025', '2026'):
-                    year_markers.append((w['top'], int(w['text'].strip())))
-            if not year_markers:
-                year_markers = [(0, 2025)]
+def _iowa_hs_result(games_by_school: Dict[str, List[Dict]], school: Optional[str]) -> Dict:
+    result = iowa_hs_response(games_by_school, school)
+    result[SESSION_GAMES_KEY] = games_by_school
+    return result
 
-            # Find "School" header rows and their y-positions
-            school_headers = [w for w in words if w['text'].strip().lower() == 'school' and w['x0'] < 100]
 
-            for sh in school_headers:
-                header_y = sh['top']
+def _merge_iowa_hs_pages(events: Iterable[Dict], school: Optional[str]) -> Dict:
+    """Result from page events extracted in separate page ranges."""
+    return _iowa_hs_result(_merge_page_fragments(events), school)
 
-                # Determine which year this group belongs to
-                year = 2025
-                for ym_top, ym_year in sorted(year_markers, reverse=True):
-                    if header_y > ym_top:
-                        year = ym_year
-                        break
 
-                # Only extract 2026 games
-                if year != 2026:
-                    continue
+def collect_iowa_hs_games(doc: PdfDocument) -> Dict[str, List[Dict]]:
+    """Parse every 2026 group grid in an Iowa HS PDF into {school column: games}."""
+    return _merge_page_fragments(iter_iowa_hs_pages(doc))
 
-                # Get all words on the header row (school names + "School" + "Date")
-                row_words = sorted(
-                    [w for w in words if abs(w['top'] - header_y) < 2],
-                    key=lambda w: w['x0']
-                )
 
-                # Extract school column positions (skip "School" and "Date" labels)
-                # Also track Date column position for relative thresholds
-                col_positions = []
-                date_x0 = None
-                for w in row_words:
-                    txt = w['text'].strip()
-                    if txt.lower() == 'school':
-                        continue
-                    if txt.lower() == 'date':
-                        date_x0 = w['x0']
-                        continue
-                    col_positions.append((w['x0'], txt))
+@dataclass(frozen=True)
+class IowaGroup:
+    """Header row of one 2026 group grid: where its Date and school columns sit."""
+    header_y: float
+    year: int
+    date_x0: Optional[float]
+    col_positions: Tuple[Tuple[float, str], ...]
 
-                if not col_positions:
-                    continue
 
-                # Compute dynamic thresholds based on actual positions
-                first_col_x0 = col_positions[0][0]
-                if date_x0:
-                    date_col_left = date_x0 - 15
-                    date_col_right = date_x0 + 50  # Just past where date text ends
-                else:
-                    date_col_right = first_col_x0 - 10
-                    date_col_left = date_col_right - 80
-                data_start_x0 = date_col_right
-
-                col_ranges = _build_column_ranges(col_positions, page_width, date_col_right)
-
-                # Find Week rows for this group (directly below header, within ~250px)
-                # Week labels should be to the left of the first school column
-                week_x0_limit = first_col_x0
-                week_rows = []
-                for w in words:
-                    wm = re.match(r'Week\s+(\d+)', w['text'].strip())
-                    if wm and w['x0'] < week_x0_limit and w['top'] > header_y and w['top'] < header_y + 250:
-                        week_rows.append((w['top'], int(wm.group(1))))
-
-                week_rows.sort(key=lambda x: x[0])
-
-                for week_y, week_num in week_rows:
-                    # Get all words on this week's row
-                    row_words = sorted(
-                        [w for w in words if abs(w['top'] - week_y) < 2],
-                        key=lambda w: w['x0']
-                    )
-
-                    # Extract date from the Date column (between School label and first school column)
-                    date_text = None
-                    for w in row_words:
-                        if date_col_left < w['x0'] < first_col_x0 and not w['text'].strip().startswith('Week'):
-                            date_text = w['text'].strip()
-                            break
-
-                    game_date = _parse_iowa_date(date_text, year) if date_text else None
-                    if not game_date:
-                        continue
+def _iowa_headers(layout: PageLayout) -> Tuple[List[Tuple[float, int]], List[int], List]:
+    """
+    A page's year markers (top, year) and "School" header labels (word
+    indices), and the fingerprint anchors they give.
+    """
+    texts = layout.texts
+
+    # Find year markers
+    year_markers = []
+    for i, txt in enumerate(texts):
+        if txt in ('2025', '2026'):
+            year_markers.append((layout.top[i], int(txt)))
+    anchors = [(0.0, top) for top, _ in year_markers]
+    if not year_markers:
+        year_markers = [(0, 2025)]
+
+    # Find "School" header rows
+    school_headers = [i for i, txt in enumerate(texts) if txt.lower() == 'school' and layout.x0[i] < 100]
+    anchors.extend((layout.x0[i], layout.top[i]) for i in school_headers)
+    return year_markers, school_headers, anchors
+
+
+def _discover_iowa_groups(layout: PageLayout) -> List[IowaGroup]:
+    """The 2026 group grids on a page, found from its year markers and "School" header labels."""
+    texts = layout.texts
+    year_markers, school_headers, _ = _iowa_headers(layout)
+
+    groups = []
+    for sh in school_headers:
+        header_y = layout.top[sh]
+
+        # Determine which year this group belongs to
+        year = 2025
+        for ym_top, ym_year in sorted(year_markers, reverse=True):
+            if header_y > ym_top:
+                year = ym_year
+                break
+
+        # Only extract 2026 games
+        if year != 2026:
+            continue
 
-                    # Group words by column, then create one game per column
-                    column_words = {}
-                    for w in row_words:
-                        if w['x0'] < data_start_x0:
-                            continue
-                        school_name = _assign_word_to_column(w['x0'], col_ranges)
-                        if not school_name:
-                            continue
-                        txt = w['text'].strip()
-                        if txt:
-                            column_words.setdefault(school_name, []).append(txt)
-
-                    for school_name, word_list in column_words.items():
-                        opponent_text = ' '.join(word_list)
-                        if not opponent_text:
-                            continue
-
-                        is_away = opponent_text.lower().startswith('at ')
-                        opponent_raw = re.sub(r'^at\s+', '', opponent_text, flags=re.IGNORECASE).strip()
-
-                        school_clean, school_city = _parse_iowa_team_name(school_name)
-                        opp_clean, opp_city = _parse_iowa_team_name(opponent_raw)
-
-                        if is_away:
-                            home_team = opp_clean
-                            away_team = school_clean
-                            home_city = opp_city
-                            away_city = school_city
-                        else:
-                            home_team = school_clean
-                            away_team = opp_clean
-                            home_city = school_city
-                            away_city = opp_city
-
-                        game = {
-                            'date': game_date,
-                            'time': '7:00 PM',
-                            'homeTeam': home_team,
-                            'awayTeam': away_team,
-                            'homeCity': home_city,
-                            'homeState': 'IA',
-                            'awayCity': away_city,
-                            'awayState': 'IA',
-                            'homeScore': None,
-                            'awayScore': None,
-                            'isCompleted': False,
-                        }
-
-                        if school_name not in games_by_school:
-                            games_by_school[school_name] = []
-                        games_by_school[school_name].append(game)
+        # Extract school column positions from the header row (skip
+        # "School" and "Date" labels). Also track Date column position
+        # for relative thresholds
+        col_positions = []
+        date_x0 = None
+        for i in layout.row(header_y):
+            txt = texts[i]
+            if txt.lower() == 'school':
+                continue
+            if txt.lower() == 'date':
+                date_x0 = layout.x0[i]
+                continue
+            col_positions.append((layout.x0[i], txt))
 
-    if not games_by_school:
-        return {
-            'success': False,
-            'mainTeam': None,
-            'mainCity': None,
-            'mainState': 'IA',
-            'games': [],
-            'gameCount': 0,
-        }
+        if col_positions:
+            groups.append(IowaGroup(header_y, year, date_x0, tuple(col_positions)))
+    return groups
 
-    school_game_counts = {s: len(g) for s, g in games_by_school.items()}
+
+def _apply_iowa_template(layout: PageLayout, template: Tuple) -> Optional[List[IowaGroup]]:
+    """
+    The groups of a page laid out like template (see _iowa_template()),
+    without discovering them: each header row is read where the template
+    has it, and its Date label and school columns taken at the template's
+    x positions. None when a header row holds anything else.
+    """
+    precision = FINGERPRINT_PRECISION
+    texts = layout.texts
+    groups = []
+    for header_y, year, date_x0, col_x0s in template:
+        row = layout.row(header_y)
+        at = {round(float(layout.x0[i]), precision): i for i in row}
+        school = [i for i in row if texts[i].lower() == 'school']
+        date = at.get(date_x0) if date_x0 is not None else None
+        columns = [at.get(x0) for x0 in col_x0s]
+        if (
+            len(school) != 1
+            or len(at) != len(row)
+            or len(row) != 1 + (date_x0 is not None) + len(col_x0s)
+            or None in columns
+            or (date_x0 is not None and (date is None or texts[date].lower() != 'date'))
+        ):
+            return None
+        groups.append(IowaGroup(
+            layout.top[school[0]],
+            year,
+            None if date is None else layout.x0[date],
+            tuple((layout.x0[i], texts[i]) for i in columns),
+        ))
+    return groups
+
+
+def _iowa_template(groups: List[IowaGroup]) -> Tuple:
+    """Geometry of a page's groups, as stored in and checked against its template."""
+    precision = FINGERPRINT_PRECISION
+    return tuple(
+        (
+            round(float(g.header_y), precision),
+            g.year,
+            None if g.date_x0 is None else round(float(g.date_x0), precision),
+            tuple(round(float(x0), precision) for x0, _ in g.col_positions),
+        )
+        for g in groups
+    )
+
+
+def _same_words(a: List[Dict], b: List[Dict]) -> bool:
+    return len(a) == len(b) and all(
+        wa['text'] == wb['text'] and abs(wa['x0'] - wb['x0']) < 1e-6 and abs(wa['top'] - wb['top']) < 1e-6
+        for wa, wb in zip(a, b)
+    )
+
+
+def _iowa_page_layout(doc: PdfDocument, page_index: int) -> Tuple[Optional[PageLayout], List[IowaGroup]]:
+    """
+    A page's word layout and groups. When the page's fingerprint has a
+    template and its header rows match it, the groups are read off the
+    template and the words come from the stream backend, which skips
+    pdfplumber's page layout. The first such page of each document also
+    has its words checked against pdfplumber's, and the template is dropped
+    if they differ. Otherwise the page is laid out by pdfplumber and its
+    groups discovered, and the layout becomes a template if the stream
+    words were identical.
+    """
+    page = doc.page(page_index)
+    fast_words = doc.page_words(page_index, backend='stream', **IOWA_WORD_OPTIONS)
+    if not fast_words:
+        return None, []
+    layout = PageLayout(fast_words)
+    _, _, anchors = _iowa_headers(layout)
+    fonts = [layout.words[i].get('fontname', '') for i in range(len(layout)) if layout.texts[i].lower() in ('school', 'date')]
+    key = ('iowa_hs', page_fingerprint(page.width, page.height, fonts, anchors))
+    template = iowa_templates.get(key)
+    if template is not None:
+        groups = _apply_iowa_template(layout, template)
+        if groups is not None and key in doc.templates_checked:
+            return layout, groups
+        if groups is not None and _same_words(fast_words, doc.page_words(page_index, **IOWA_WORD_OPTIONS)):
+            doc.templates_checked.add(key)
+            return layout, groups
+        iowa_log.debug("Page %d: layout template no longer matches, rediscovering", page_index + 1)
+        iowa_templates.invalidate(key)
+
+    words = doc.page_words(page_index, **IOWA_WORD_OPTIONS)
+    if _same_words(fast_words, words):
+        groups = _discover_iowa_groups(layout)
+        iowa_templates.put(key, _iowa_template(groups))
+        doc.templates_checked.add(key)
+        return layout, groups
+    layout = PageLayout(words)
+    return layout, _discover_iowa_groups(layout)
+
+
+def iter_iowa_hs_pages(doc: PdfDocument, page_indices: Optional[Iterable[int]] = None) -> Iterator[Dict]:
+    """
+    Page-wise Iowa HS extraction: yields a games event per page with that
+    page's games grouped by school column. Pages are independent, so
+    page_indices can restrict it to part of the document.
+    """
+    for page_index in (range(doc.page_count) if page_indices is None else page_indices):
+        page_games_by_school = {}
+        page_width = doc.page(page_index).width
+        layout, groups = _iowa_page_layout(doc, page_index)
+        if layout is None:
+            continue
+        texts = layout.texts
+
+        # Week labels, shared by every group on the page
+        week_labels = []
+        for i, txt in enumerate(texts):
+            wm = IOWA_WEEK_PATTERN.match(txt)
+            if wm:
+                week_labels.append((i, int(wm.group(1))))
+
+        for group in groups:
+            header_y, year, date_x0 = group.header_y, group.year, group.date_x0
+            col_positions = list(group.col_positions)
+
+            # Compute dynamic thresholds based on actual positions
+            first_col_x0 = col_positions[0][0]
+            if date_x0:
+                date_col_left = date_x0 - 15
+                date_col_right = date_x0 + 50  # Just past where date text ends
+            else:
+                date_col_right = first_col_x0 - 10
+                date_col_left = date_col_right - 80
+            data_start_x0 = date_col_right
+
+            col_ranges = _build_column_ranges(col_positions, page_width, date_col_right)
+
+            # Find Week rows for this group (directly below header, within ~250px)
+            # Week labels should be to the left of the first school column
+            week_x0_limit = first_col_x0
+            week_rows = [
+                (layout.top[i], week_num) for i, week_num in week_labels
+                if layout.x0[i] < week_x0_limit and header_y < layout.top[i] < header_y + 250
+            ]
+
+            for week_y, week_num in week_rows:
+                # Get all words on this week's row
+                row_indices = layout.row(week_y)
+
+                # Extract date from the Date column (between School label and first school column)
+                date_text = None
+                for i in row_indices:
+                    if date_col_left < layout.x0[i] < first_col_x0 and not texts[i].startswith('Week'):
+                        date_text = texts[i]
+                        break
+
+                game_date = _parse_iowa_date(date_text, year) if date_text else None
+                if not game_date:
+                    continue
+
+                # Group words by column, then create one game per column
+                row_x0 = layout.x0[row_indices]
+                data_words = row_x0 >= data_start_x0
+                row_indices = row_indices[data_words]
+                columns = assign_columns(row_x0[data_words], col_ranges)
+                column_words = {}
+                for i, col in zip(row_indices, columns):
+                    if col < 0:
+                        continue
+                    txt = texts[i]
+                    if txt:
+                        column_words.setdefault(col_ranges[col][2], []).append(txt)
+
+                for school_name, word_list in column_words.items():
+                    opponent_text = ' '.join(word_list)
+                    if not opponent_text:
+                        continue
+
+                    is_away, opp_clean, opp_city = iowa_opponent(opponent_text)
+                    school_clean, school_city = iowa_team_name(school_name)
+
+                    if is_away:
+                        home_team = opp_clean
+                        away_team = school_clean
+                        home_city = opp_city
+                        away_city = school_city
+                    else:
+                        home_team = school_clean
+                        away_team = opp_clean
+                        home_city = school_city
+                        away_city = opp_city
+
+                    game = {
+                        'date': game_date,
+                        'time': '7:00 PM',
+                        'homeTeam': home_team,
+                        'awayTeam': away_team,
+                        'homeCity': home_city,
+                        'homeState': 'IA',
+                        'awayCity': away_city,
+                        'awayState': 'IA',
+                        'homeScore': None,
+                        'awayScore': None,
+                        'isCompleted': False,
+                    }
+
+                    if school_name not in page_games_by_school:
+                        page_games_by_school[school_name] = []
+                    page_games_by_school[school_name].append(game)
+
+        yield {'type': 'games', 'page': page_index + 1, 'gamesBySchool': page_games_by_school}
+
+
+def iowa_hs_response(
+    games_by_school: Mapping[str, List[Dict]],
+    school_filter: Optional[str] = None,
+    game_counts: Optional[Dict[str, int]] = None,
+) -> Dict:
+    """
+    Build the response for a parsed Iowa HS PDF: the school selection
+    prompt, one school's games, or every school's games for "__all__".
+    game_counts is as for texas_isd_response().
+    """
+    if not games_by_school:
+        return {
+            'success': False,
+            'mainTeam': None,
+            'mainCity': None,
+            'mainState': 'IA',
+            'games': [],
+            'gameCount': 0,
+        }
+
+    school_game_counts = game_counts if game_counts is not None else count_school_games(games_by_school)
 
     if not school_filter:
-        print(f"[Iowa HS] Multi-school PDF. {len(games_by_school)} schools found.")
+        iowa_log.debug("Multi-school PDF. %d schools found", len(games_by_school))
         return {
             'success': True,
             'requiresSchoolSelection': True,
@@ -923,19 +1538,8 @@ def extract_iowa_hs_format(pdf_file: io.BytesIO, school_filter: Optional[str] =
 
     # All schools: combine and deduplicate
     if school_filter == '__all__':
-        seen = set()
-        all_games = []
-        for school_games in games_by_school.values():
-            for g in school_games:
-                key = (g['date'], g['homeTeam'], g['awayTeam'])
-                if key not in seen:
-                    seen.add(key)
-                    all_games.append(g)
-        def _date_sort_key(g):
-            parts = g['date'].split('/')
-            return (int(parts[2]), int(parts[0]), int(parts[1]))
-        all_games.sort(key=_date_sort_key)
-        print(f"[Iowa HS] Extracted {len(all_games)} unique games (all schools)")
+        all_games = _merge_school_games(games_by_school)
+        iowa_log.debug("Extracted %d unique games (all schools)", len(all_games))
         return {
             'success': True,
             'mainTeam': 'All Schools',
@@ -965,7 +1569,7 @@ def extract_iowa_hs_format(pdf_file: io.BytesIO, school_filter: Optional[str] =
             'gameCount': 0,
         }
 
-    print(f"[Iowa HS] Extracted {len(games)} games for {school_filter}")
+    iowa_log.debug("Extracted %d games for %s", len(games), school_filter)
     return {
         'success': True,
         'mainTeam': school_filter,
@@ -980,56 +1584,91 @@ def extract_iowa_hs_format(pdf_file: io.BytesIO, school_filter: Optional[str] =
     }
 
 
-def extract_table_schedule(pdf_file: io.BytesIO) -> Dict:
+@FORMATS.register(
+    'iowa_hs',
+    indicators=[
+        (r'IOWA HIGH SCHOOL ATHLETIC ASSOCIATION', re.IGNORECASE),
+        (r'REGULAR SEASON SCHEDULES', re.IGNORECASE),
+        r'GROUP \d',
+        r'Week \d',
+    ],
+    threshold=3,
+    priority=1,
+    pages=iter_iowa_hs_pages,
+    merge_pages=_merge_iowa_hs_pages,
+)
+def run_iowa_hs_format(doc: PdfDocument, school: Optional[str]) -> Generator[Dict, None, Dict]:
+    log.debug("Detected Iowa HS format (school filter: %s)", school)
+    yield _multi_school_metadata('iowa_hs', 'IA', school)
+    games_by_school = yield from _iter_school_pages(
+        _record_pages(doc, 'iowa_hs', iter_iowa_hs_pages(doc)), school
+    )
+    return _iowa_hs_result(games_by_school, school)
+
+
+# Any ruled table with a date column and a home or away column
+GENERIC_TABLE_SCHEMA = TableSchema(
+    fields={
+        'date': ('date',),
+        'time': ('time',),
+        'home': ('home',),
+        'away': ('away', 'visitor'),
+    },
+    required=[('date',), ('home', 'away')],
+    take=('date', 'time', 'home', 'away'),
+    width_fields=('date', 'home', 'away'),
+)
+
+# Every schema, for the worker cache metrics
+TABLE_SCHEMAS = (TEXAS_ISD_SCHEMA, GENERIC_TABLE_SCHEMA)
+
+
+def extract_table_schedule(doc: PdfDocument) -> Dict:
     """
     Fallback: Extract schedule from table-based PDFs.
     """
-    games = []
+    return _drain(iter_table_schedule(doc))
 
-    with pdfplumber.open(pdf_file) as pdf:
-        for page in pdf.pages:
-            tables = page.extract_tables()
 
-            for table in tables:
-                if not table or len(table) < 2:
-                    continue
+def iter_table_schedule(doc: PdfDocument) -> Generator[Dict, None, Dict]:
+    """
+    Page-wise table fallback: yields a games event per page and returns the
+    same dict as extract_table_schedule().
+    """
+    games = []
 
-                # Assume first row is headers
-                headers = [str(h).lower() if h else "" for h in table[0]]
+    for page_index in range(doc.page_count):
+        tables = doc.page_tables(page_index)
+        page_games = []
 
-                # Find relevant columns
-                date_idx = next((i for i, h in enumerate(headers) if 'date' in h), None)
-                time_idx = next((i for i, h in enumerate(headers) if 'time' in h), None)
-                home_idx = next((i for i, h in enumerate(headers) if 'home' in h), None)
-                away_idx = next((i for i, h in enumerate(headers) if 'away' in h or 'visitor' in h), None)
+        for table in tables:
+            if not table or len(table) < 2:
+                continue
 
-                if date_idx is None or (home_idx is None and away_idx is None):
-                    continue
+            # Assume first row is headers
+            columns = GENERIC_TABLE_SCHEMA.columns(table[0])
+            if columns is None:
+                continue
 
-                # Parse rows
-                for row in table[1:]:
-                    if not row or len(row) <= max(filter(None, [date_idx, home_idx, away_idx])):
-                        continue
+            # Parse rows
+            for date, time, home, away in columns.rows(itertools.islice(table, 1, None)):
+                if date and (home or away):
+                    page_games.append({
+                        'date': date,
+                        'time': time or None,
+                        'homeTeam': home or None,
+                        'awayTeam': away or None,
+                        'homeCity': None,
+                        'homeState': None,
+                        'awayCity': None,
+                        'awayState': None,
+                        'homeScore': None,
+                        'awayScore': None,
+                        'isCompleted': False,
+                    })
 
-                    date = row[date_idx] if date_idx is not None else None
-                    time = row[time_idx] if time_idx is not None else None
-                    home = row[home_idx] if home_idx is not None else None
-                    away = row[away_idx] if away_idx is not None else None
-
-                    if date and (home or away):
-                        games.append({
-                            'date': str(date),
-                            'time': str(time) if time else None,
-                            'homeTeam': str(home) if home else None,
-                            'awayTeam': str(away) if away else None,
-                            'homeCity': None,
-                            'homeState': None,
-                            'awayCity': None,
-                            'awayState': None,
-                            'homeScore': None,
-                            'awayScore': None,
-                            'isCompleted': False,
-                        })
+        games.extend(page_games)
+        yield {'type': 'games', 'page': page_index + 1, 'games': page_games}
 
     return {
         'success': len(games) > 0,
@@ -1039,83 +1678,1215 @@ def extract_table_schedule(pdf_file: io.BytesIO) -> Dict:
     }
 
 
-@app.post("/extract")
-async def extract_schedule(file: UploadFile = File(...), school: Optional[str] = None):
+# Fallback when the detected format yields no games
+@FORMATS.register('table')
+def run_table_format(doc: PdfDocument, school: Optional[str]) -> Generator[Dict, None, Dict]:
+    yield {'type': 'metadata', 'format': 'table', 'mainTeam': None, 'mainCity': None, 'mainState': None}
+    return (yield from iter_table_schedule(doc))
+
+
+# Multi-school responders, keyed by the format name stored with a document session
+MULTI_SCHOOL_RESPONSES = {
+    'texas_isd': texas_isd_response,
+    'iowa_hs': iowa_hs_response,
+}
+
+
+def iter_extraction(
+    content: PdfSource,
+    school: Optional[str] = None,
+    split_min_pages: Optional[int] = None,
+    timings: Optional[Dict[str, float]] = None,
+    known_pages: Optional[AbstractSet[int]] = None,
+) -> Generator[Dict, None, Dict]:
     """
-    Extract game schedule from uploaded PDF file.
+    Detect the PDF format and run the matching extractor page by page.
+
+    Yields a metadata event (format and main team) followed by a games event
+    for each parsed page, and returns the complete result dict. Formats are
+    tried in detection rank order until one finds games; a later metadata
+    event replaces the first one when a fallback format runs.
+
+    With split_min_pages, a document of at least that many pages whose best
+    candidate can be split by page range is not parsed here; the result is
+    just {SPLIT_KEY: {'format', 'pageCount'}} for the caller to fan out.
+
+    known_pages (the page cache's PageCache.known()) has the pages of such
+    a document hashed. When any hash is known the document is split
+    whatever its size, with 'pageHashes' (each page's content hash, None
+    when unreadable) for the caller to look up. Otherwise it is extracted
+    whole, and the result carries PAGE_EVENTS_KEY {'format', 'hashes',
+    'events'} for the caller to store.
+
+    If timings is given, seconds spent in each stage (open, detect, extract,
+    fallback) are added to it.
+    """
+    stages = _StageTimer(timings)
+    with PdfDocument(content) as doc:
+        page_count = doc.page_count
+        stages.lap('open')
+        try:
+            # First page text is memoized, so extractors reuse it
+            candidates = FORMATS.rank(doc.page_text(0, DETECTION_TEXT_BACKEND))
+            stages.lap('detect')
+            log.debug("Format candidates: %s", [(c.name, round(c.confidence, 2)) for c in candidates])
+
+            best = FORMATS.get(candidates[0].name) if candidates else None
+            page_hashes = None
+            if best is not None and best.pages:
+                if known_pages is not None:
+                    page_hashes = [doc.page_hash(i) for i in range(page_count)]
+                    doc.page_events = {}
+                cached = page_hashes is not None and any(
+                    page_hash and hash_prefix(page_hash) in known_pages for page_hash in page_hashes
+                )
+                if cached or (split_min_pages and page_count >= split_min_pages):
+                    split = {'format': best.name, 'pageCount': page_count}
+                    if page_hashes is not None:
+                        split['pageHashes'] = page_hashes
+                    return {SPLIT_KEY: split}
+
+            # Try detected formats best first; MaxPreps when nothing matched
+            for format_name in [c.name for c in candidates] or ['maxpreps']:
+                fmt = FORMATS.get(format_name)
+                doc.text_backend = fmt.text_backend
+                result = yield from _stop_after_max_games(fmt.run(doc, school))
+                if result['gameCount'] > 0 or result.get('requiresSchoolSelection'):
+                    break
+            else:
+                stages.lap('extract')
+                # No games found: try table extraction fallback (only the table
+                # step runs; text and tables already parsed are reused)
+                format_name = 'table'
+                result = yield from _stop_after_max_games(FORMATS.get(format_name).run(doc, school))
+                stages.lap('fallback')
+            stages.lap('extract')
+        except ExtractionCancelled as e:
+            e.progress = {'pagesParsed': len(doc.pages_parsed), 'pageCount': page_count}
+            raise
+        if doc.page_events and format_name in doc.page_events:
+            result[PAGE_EVENTS_KEY] = {
+                'format': format_name, 'hashes': page_hashes, 'events': doc.page_events[format_name],
+            }
 
-    Args:
-        file: PDF file upload
-        school: Optional school name filter for multi-school PDFs (e.g., Texas ISD format)
+    result[FORMAT_KEY] = format_name
+    result[PAGE_COUNT_KEY] = page_count
+    return result
+
+
+class _StageTimer:
+    """Adds the time since the previous lap to a stage in timings, if given."""
+
+    def __init__(self, timings: Optional[Dict[str, float]]):
+        self.timings = timings
+        self._last = time.perf_counter()
+
+    def lap(self, stage: str) -> None:
+        now = time.perf_counter()
+        if self.timings is not None:
+            self.timings[stage] = self.timings.get(stage, 0.0) + now - self._last
+        self._last = now
+
+
+def iter_extraction_events(
+    content: PdfSource,
+    school: Optional[str] = None,
+    deadline: Optional[DeadlineToken] = None,
+) -> Iterator[Dict]:
+    """iter_extraction() with its result sent as a final {'type': 'result'} event."""
+    timings: Dict[str, float] = {}
+    counts = _worker_cache_counts()
+    with bound(deadline):
+        result = yield from iter_extraction(content, school, timings=timings)
+    result[STAGE_TIMINGS_KEY] = timings
+    result[CACHE_COUNTS_KEY] = _cache_counts_since(counts)
+    yield {'type': 'result', 'result': result}
+
+
+def run_extraction(
+    content: PdfSource,
+    school: Optional[str] = None,
+    split_min_pages: Optional[int] = None,
+    deadline: Optional[DeadlineToken] = None,
+    known_pages: Optional[AbstractSet[int]] = None,
+) -> Dict:
+    """
+    Detect the PDF format and run the matching extractor.
+    Runs inside a worker process, so it takes raw bytes (or the path of a
+    spooled upload) and returns a plain dict. With a deadline it stops at
+    the next checkpoint once that passes, raising ExtractionCancelled.
+    split_min_pages and known_pages are as for iter_extraction().
     """
+    timings: Dict[str, float] = {}
+    counts = _worker_cache_counts()
+    with bound(deadline):
+        result = _drain(iter_extraction(content, school, split_min_pages, timings, known_pages))
+    result[STAGE_TIMINGS_KEY] = timings
+    result[CACHE_COUNTS_KEY] = _cache_counts_since(counts)
+    return result
+
+
+def _worker_cache_counts() -> Dict[str, Dict[str, int]]:
+    """Lookup counters of the caches this worker process keeps, by cache and result."""
+    return {
+        'layout_templates': {
+            'hit': iowa_templates.hits,
+            'miss': iowa_templates.misses,
+            'invalidated': iowa_templates.invalidated,
+        },
+        'table_schemas': {
+            'hit': sum(schema.cache_info().hits for schema in TABLE_SCHEMAS),
+            'miss': sum(schema.cache_info().misses for schema in TABLE_SCHEMAS),
+        },
+    }
+
+
+def _cache_counts_since(before: Dict[str, Dict[str, int]]) -> Dict[str, Dict[str, int]]:
+    return {
+        cache: {result: count - before[cache][result] for result, count in results.items()}
+        for cache, results in _worker_cache_counts().items()
+    }
+
+
+def warm_up_worker() -> None:
+    """
+    Worker process initializer: run the warm-up PDF through detection and
+    every registered extractor (whole-document and page-range paths), so
+    the worker's first real request hits no first-use costs. Failures are
+    logged, never raised, since a raising initializer breaks the pool.
+    """
+    started = time.perf_counter()
+    try:
+        content = read_warmup_pdf()
+        run_extraction(content)
+        with PdfDocument(content) as doc:
+            for name in FORMATS.names():
+                fmt = FORMATS.get(name)
+                doc.text_backend = fmt.text_backend
+                _drain(fmt.run(doc, None))
+                if fmt.pages:
+                    fmt.merge_pages(list(fmt.pages(doc, range(doc.page_count))), None)
+    except Exception:
+        log.warning("Worker warm-up failed", exc_info=True)
+        return
+    log.debug("Worker %d warmed up in %.3fs", os.getpid(), time.perf_counter() - started)
+
+
+def run_pages(
+    format_name: str,
+    source: Union[str, Tuple[str, int]],
+    page_indices: List[int],
+    deadline: Optional[DeadlineToken] = None,
+) -> Dict:
+    """
+    Worker task: {'events': page events, CACHE_COUNTS_KEY: ...} of a
+    page-splittable format for the given pages of a PDF given by path, or
+    held in shared memory as (block name, size).
+    """
+    counts = _worker_cache_counts()
+    with bound(deadline):
+        content = source if isinstance(source, str) else SharedBytes.read(*source)
+        with PdfDocument(content) as doc:
+            try:
+                events = list(FORMATS.get(format_name).pages(doc, page_indices))
+                return {'events': events, CACHE_COUNTS_KEY: _cache_counts_since(counts)}
+            except ExtractionCancelled as e:
+                e.progress = {'pagesParsed': len(doc.pages_parsed), 'pageCount': len(page_indices)}
+                raise
+
+
+async def _schedule(content: PdfSource, digest: Optional[str], lane: Optional[str] = None) -> Tuple[str, float]:
+    """The lane and estimated cost (seconds) for extracting a PDF; lane forces the lane."""
+    estimate = await cost_model.estimate(digest, content)
+    lane = lane or cost_model.lane(estimate)
+    log.debug(
+        "Scheduling %s PDF of ~%d pages in the %s lane (~%.2fs)",
+        estimate.format or 'unknown', estimate.pages, lane, estimate.seconds,
+    )
+    return lane, estimate.seconds
+
+
+async def _run_extraction(
+    content: PdfSource,
+    school: Optional[str],
+    deadline: Optional[DeadlineToken] = None,
+    digest: Optional[str] = None,
+    lane: Optional[str] = None,
+) -> Dict:
+    """
+    Extract a PDF in the worker pool, in the lane its estimated cost (or
+    lane) puts it in. Formats whose pages are independent are extracted
+    page by page when some of their pages are in the page cache (reusing
+    the cached events) or they are long enough to split into page ranges
+    extracted in parallel. Otherwise they are extracted whole and their
+    pages stored in the page cache for the next upload.
+    """
+    lane, cost = await _schedule(content, digest, lane)
+    split_min_pages = PDF_PARALLEL_MIN_PAGES if extraction_pool.workers > 1 else None
+    known_pages = page_cache.known() if page_cache.enabled else None
+    result = await extraction_pool.run(
+        run_extraction, content, school, split_min_pages, deadline, known_pages, lane=lane, cost=cost
+    )
+    split = result.get(SPLIT_KEY)
+    if split is None:
+        _store_page_events(result.pop(PAGE_EVENTS_KEY, None))
+        return _observe_parse(result, digest)
+
+    format_name = split['format']
+    page_count = split['pageCount']
+    observe_stages(format_name, result[STAGE_TIMINGS_KEY])
+    observe_worker_caches(result[CACHE_COUNTS_KEY])
+    PAGES.observe(page_count)
+    page_hashes = split.get('pageHashes')
+    cached = page_cache.lookup(format_name, page_hashes) if page_hashes else {}
+    missing = [i for i in range(page_count) if i not in cached]
+    if page_hashes:
+        observe_page_cache(format_name, len(cached), len(missing))
+        log.info(
+            "Page cache: %d of %d %s pages reused", len(cached), page_count, format_name,
+            extra={'format': format_name, 'pages': page_count, 'pagesReused': len(cached),
+                   'hitRatio': round(len(cached) / page_count, 3) if page_count else None},
+        )
+
+    if len(missing) >= PDF_PARALLEL_MIN_PAGES and extraction_pool.workers > 1:
+        tasks = max(1, min(
+            extraction_pool.limit(lane),
+            extraction_pool.available(lane),
+            len(missing) // PDF_PARALLEL_MIN_PAGES_PER_TASK,
+        ))
+    else:
+        tasks = 1
+    bounds = [len(missing) * i // tasks for i in range(tasks + 1)]
+    groups = [missing[a:b] for a, b in zip(bounds, bounds[1:]) if b > a]
+    if tasks > 1:
+        log.info("Extracting %d %s pages in %d ranges", len(missing), format_name, tasks)
+
+    # Workers map a spooled upload themselves; other PDFs go into shared
+    # memory once rather than pickled per task
+    started = time.perf_counter()
+    costs = [cost_model.seconds(format_name, len(group)) for group in groups]
+    if not groups:
+        chunks = []
+    elif isinstance(content, str):
+        chunks = await asyncio.gather(*(
+            extraction_pool.run(run_pages, format_name, content, group, deadline, lane=lane, cost=cost)
+            for group, cost in zip(groups, costs)
+        ), return_exceptions=True)
+    else:
+        with SharedBytes(content) as shared:
+            chunks = await asyncio.gather(*(
+                extraction_pool.run(
+                    run_pages, format_name, (shared.name, shared.size), group, deadline, lane=lane, cost=cost,
+                )
+                for group, cost in zip(groups, costs)
+            ), return_exceptions=True)
+    _raise_range_failure(chunks, groups, page_count)
+
+    parsed: Dict[int, List[Dict]] = {i: [] for i in missing}
+    for chunk in chunks:
+        observe_worker_caches(chunk[CACHE_COUNTS_KEY])
+    for event in itertools.chain.from_iterable(chunk['events'] for chunk in chunks):
+        parsed[event['page'] - 1].append(event)
+    for index, events in parsed.items():
+        if page_hashes:
+            page_cache.store(format_name, page_hashes[index], events)
+    # Cached events keep the page number they were parsed at; renumber them
+    events = [
+        event if index in parsed else dict(event, page=index + 1)
+        for index in range(page_count)
+        for event in (parsed[index] if index in parsed else cached[index])
+    ]
+    result = FORMATS.get(format_name).merge_pages(events, school)
+    elapsed = time.perf_counter() - started
+    observe_stages(format_name, {'extract': elapsed})
+    if missing:
+        # Each range held a worker for about the whole wall time
+        cost_model.observe(digest, format_name, len(missing), elapsed * tasks)
+    if result['gameCount'] == 0 and not result.get('requiresSchoolSelection'):
+        # Let the whole-document path try the other candidates and fallbacks
+        return _observe_parse(
+            await extraction_pool.run(run_extraction, content, school, None, deadline, lane=lane, cost=cost)
+        )
+    result[FORMAT_KEY] = format_name
+    return result
+
+
+def _store_page_events(recorded: Optional[Dict]) -> None:
+    """Store the page events of a document extracted whole (PAGE_EVENTS_KEY) in the page cache."""
+    if not recorded:
+        return
+    format_name = recorded['format']
+    page_hashes = recorded['hashes']
+    # None of its pages were known to the worker; count them as looked up
+    cached = page_cache.lookup(format_name, page_hashes)
+    observe_page_cache(format_name, len(cached), len(page_hashes) - len(cached))
+    for index, page_hash in enumerate(page_hashes):
+        page_cache.store(format_name, page_hash, recorded['events'].get(index, []))
+
+
+def _raise_range_failure(chunks: List, groups: List[List[int]], page_count: int) -> None:
+    """
+    Re-raise the first failure among page range results. A cancellation
+    reports the pages parsed across all ranges, finished ones included.
+    """
+    errors = [c for c in chunks if isinstance(c, BaseException)]
+    if not errors:
+        return
+    cancelled = [e for e in errors if isinstance(e, ExtractionCancelled)]
+    if len(cancelled) < len(errors):
+        raise next(e for e in errors if not isinstance(e, ExtractionCancelled))
+    cancelled[0].progress = {
+        'pagesParsed': sum(
+            c.progress.get('pagesParsed', 0) if isinstance(c, ExtractionCancelled) else len(group)
+            for c, group in zip(chunks, groups)
+        ),
+        'pageCount': page_count,
+    }
+    raise cancelled[0]
+
+
+def _observe_parse(result: Dict, digest: Optional[str] = None) -> Dict:
+    """
+    Record a fresh parse's stage times, page count and worker cache
+    lookups as metrics, removing them from result. With the PDF's digest, the cost model learns from it too.
+    """
+    format_name = result.get(FORMAT_KEY)
+    timings = result.pop(STAGE_TIMINGS_KEY, {})
+    observe_stages(format_name, timings)
+    observe_worker_caches(result.pop(CACHE_COUNTS_KEY, {}))
+    page_count = result.pop(PAGE_COUNT_KEY, None)
+    if page_count is not None:
+        PAGES.observe(page_count)
+        if digest:
+            cost_model.observe(digest, format_name, page_count, sum(timings.values()))
+    log.info(
+        "Parsed %s PDF: %s pages, %d games", format_name, page_count, result['gameCount'],
+        extra={
+            'format': format_name,
+            'pages': page_count,
+            'games': result['gameCount'],
+            'stageMs': {stage: round(seconds * 1000, 1) for stage, seconds in timings.items()},
+        },
+    )
+    return result
+
+
+def _validate_result(result: Dict) -> None:
+    """Reject results with no games or more than MAX_GAMES."""
+    # Validate game count (skip if awaiting school selection)
+    if result['gameCount'] == 0 and not result.get('requiresSchoolSelection'):
+        raise HTTPException(
+            status_code=400,
+            detail="No games found in PDF. This can happen with scanned or image-based PDFs."
+        )
+
+    if result['gameCount'] > MAX_GAMES:
+        # Extraction stops at the first page past the limit
+        count = f"{result['gameCount']}+" if result.get('truncated') else result['gameCount']
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many games ({count}). Maximum is {MAX_GAMES}."
+        )
+
+
+async def _read_pdf_upload(file: UploadFile) -> bytes:
+    """Read an uploaded PDF, rejecting other file types (by name and first bytes) and oversized files."""
     # Validate file type
     if not file.filename.lower().endswith('.pdf'):
         raise HTTPException(status_code=400, detail="File must be a PDF")
 
     # Read file content
     content = await file.read()
+    _check_pdf_size(len(content))
+    _check_pdf_magic(content)
+    return content
 
-    # Validate file size
-    if len(content) > MAX_PDF_SIZE_BYTES:
+
+def _check_pdf_size(size: int) -> None:
+    if size > MAX_PDF_SIZE_BYTES:
         raise HTTPException(
             status_code=400,
             detail=f"File too large. Maximum size is 10MB."
         )
 
-    pdf_file = io.BytesIO(content)
 
+@asynccontextmanager
+async def _spooled_pdf_body(request: Request) -> AsyncIterator[Tuple[str, str]]:
+    """
+    Stream a raw PDF request body to a temp file, yielding (path, sha256).
+    Oversized bodies are rejected from Content-Length before any is read,
+    and bodies that don't start like a PDF after their first PDF_MAGIC_WINDOW
+    bytes. The file is removed on exit.
+    """
+    length = request.headers.get('content-length')
+    if length and length.isdigit():
+        _check_pdf_size(int(length))
+
+    fd, path = tempfile.mkstemp(prefix='pdf-upload-', suffix='.pdf')
     try:
-        # Extract first page for format detection
-        with pdfplumber.open(pdf_file) as pdf:
-            first_page_text = pdf.pages[0].extract_text()
-
-        pdf_file.seek(0)
-
-        # Detect and route to correct extractor
-        if detect_cif_bracket_format(first_page_text):
-            print("[PDF Extract] Detected CIF bracket format")
-            result = extract_cif_bracket_format(pdf_file)
-        elif detect_iowa_hs_format(first_page_text):
-            print(f"[PDF Extract] Detected Iowa HS format (school filter: {school})")
-            result = extract_iowa_hs_format(pdf_file, school_filter=school)
-        elif detect_schedule_star_format(first_page_text):
-            print("[PDF Extract] Detected Schedule Star format")
-            result = extract_schedule_star_format(pdf_file)
-        elif detect_texas_isd_format(first_page_text):
-            print(f"[PDF Extract] Detected Texas ISD format (school filter: {school})")
-            result = extract_texas_isd_format(pdf_file, school_filter=school)
+        digest = hashlib.sha256()
+        size = 0
+        head: Optional[bytes] = b''
+        with os.fdopen(fd, 'wb') as f:
+            async for chunk in request.stream():
+                # Content-Length may be absent or wrong
+                size += len(chunk)
+                _check_pdf_size(size)
+                if head is not None:
+                    head += chunk
+                    if len(head) >= PDF_MAGIC_WINDOW:
+                        _check_pdf_magic(head)
+                        head = None
+                digest.update(chunk)
+                f.write(chunk)
+        if head is not None:
+            _check_pdf_magic(head)
+        yield path, digest.hexdigest()
+    finally:
+        os.unlink(path)
+
+
+def _check_pdf_magic(head: bytes) -> None:
+    # Readers accept the header anywhere in the first 1KB
+    if PDF_MAGIC not in head[:PDF_MAGIC_WINDOW]:
+        raise HTTPException(status_code=400, detail="File must be a PDF")
+
+
+def _finalize_result(result: Dict, digest: str) -> Dict:
+    """
+    Strip internal keys from an extraction result and add its contentHash.
+    The full map of a multi-school PDF is kept as a document session so
+    picking a school later doesn't need another upload.
+    """
+    result['contentHash'] = digest
+    format_name = result.pop(FORMAT_KEY, None)
+    games_by_school = result.pop(SESSION_GAMES_KEY, None)
+    if games_by_school:
+        token = document_sessions.create(digest, format_name, games_by_school)
+        if token:
+            result['documentToken'] = token
+    return result
+
+
+async def _extract_pdf(
+    content: PdfSource,
+    school: Optional[str],
+    profile_path: Optional[str] = None,
+    digest: Optional[str] = None,
+    deadline: Optional[DeadlineToken] = None,
+    lane: Optional[str] = None,
+) -> Dict:
+    """
+    Extract and validate one PDF, the shared core of /extract and /extract/batch.
+    With profile_path, the PDF is parsed under cProfile, bypassing the cache.
+    A spooled upload is passed by path with the digest computed while spooling.
+    lane forces a scheduling lane instead of the one its estimated cost picks.
+    """
+    # Parsing is CPU-bound; keep it off the event loop. Identical
+    # uploads are served from the cache or share one in-flight parse.
+    digest = digest or ResultCache.digest(content)
+    format_name = None
+    try:
+        if profile_path:
+            # Profiled times are inflated; don't let the cost model learn from them
+            lane, cost = await _schedule(content, digest, lane)
+            result = _observe_parse(await extraction_pool.run(
+                run_profiled, run_extraction, profile_path, content, school, None, deadline, lane=lane, cost=cost
+            ))
         else:
-            print("[PDF Extract] Trying MaxPreps format")
-            result = extract_maxpreps_schedule(pdf_file)
+            result = await result_cache.get_or_compute(
+                ResultCache.key(digest, school=school),
+                lambda: _run_extraction(content, school, deadline, digest, lane),
+            )
+        format_name = result.get(FORMAT_KEY)
+        result = _finalize_result(result, digest)
+
+        _validate_result(result)
+    except BaseException as e:
+        observe_outcome(format_name, _outcome(e))
+        raise
+
+    observe_outcome(format_name, 'success', result['gameCount'])
+    _remember_games(digest, school, result)
+    return result
+
 
-        # If no games found with MaxPreps, try table extraction fallback
-        if result['gameCount'] == 0 and not result.get('requiresSchoolSelection'):
-            pdf_file.seek(0)
-            result = extract_table_schedule(pdf_file)
+def _remember_games(digest: str, school: Optional[str], result: Dict) -> None:
+    """Keep a result's games as the snapshot /extract/diff finds by its contentHash."""
+    if not result.get('requiresSchoolSelection'):
+        snapshots.put(ResultCache.key(digest, school=school), result['games'])
 
-        # Validate game count (skip if awaiting school selection)
-        if result['gameCount'] == 0 and not result.get('requiresSchoolSelection'):
+
+async def _previous_games(since: str, school: Optional[str]) -> Optional[List[Dict]]:
+    """
+    Games of the extraction since names, for school: a documentToken, or
+    the contentHash of an earlier upload extracted with the same school.
+    None when it is unknown or expired. A documentToken needs a school it
+    has games for (or "__all__"), as for /documents/{token}/games.
+    """
+    session = document_sessions.get(since)
+    if session is not None:
+        if not school:
             raise HTTPException(
                 status_code=400,
-                detail="No games found in PDF. This can happen with scanned or image-based PDFs."
+                detail="school is required to diff against a multi-school document"
             )
+        result = MULTI_SCHOOL_RESPONSES[session.format](session.games_by_school, school, session.game_counts)
+        if not result['success']:
+            raise HTTPException(status_code=404, detail=result['error'])
+        return result['games']
+    key = ResultCache.key(since, school=school)
+    games = snapshots.get(key)
+    if games is None:
+        # Evicted from the snapshots but maybe still cached, or on disk
+        cached = await result_cache.lookup(key)
+        games = cached.get('games') if cached is not None else None
+    return games
+
+
+def _check_layout(layout: str) -> None:
+    if layout not in LAYOUTS:
+        raise HTTPException(status_code=400, detail=f"layout must be one of: {', '.join(LAYOUTS)}")
+
+
+def _json_response(request: Request, content: Dict, layout: str = 'games') -> Response:
+    """
+    content encoded with orjson in the requested layout, gzipped when the
+    client accepts it and the body is at least PDF_GZIP_MIN_BYTES.
+    """
+    if layout == 'columnar':
+        content = columnar(content)
+    body = encode_json(content)
+    headers = {'Vary': 'Accept-Encoding'}
+    if len(body) >= PDF_GZIP_MIN_BYTES and 'gzip' in request.headers.get('accept-encoding', ''):
+        body = gzip_body(body)
+        headers['Content-Encoding'] = 'gzip'
+    return Response(body, media_type='application/json', headers=headers)
+
+
+def _outcome(error: BaseException) -> str:
+    """Metrics outcome label for an extraction that raised error."""
+    if isinstance(error, PoolSaturated):
+        return 'busy'
+    if isinstance(error, HTTPException):
+        return 'rejected'
+    if isinstance(error, ExtractionCancelled):
+        return 'timeout' if error.reason == DEADLINE else 'disconnected'
+    if isinstance(error, (asyncio.CancelledError, asyncio.TimeoutError)):
+        return 'cancelled'
+    return 'error'
+
+
+def _check_profile_token(token: str) -> None:
+    if not profiles.authorized(token):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+@app.post("/extract")
+async def extract_schedule(
+    request: Request,
+    file: UploadFile = File(...),
+    school: Optional[str] = None,
+    profile: Optional[str] = None,
+    layout: str = 'games',
+    timeout: Optional[str] = None,
+):
+    """
+    Extract game schedule from uploaded PDF file.
+
+    Args:
+        file: PDF file upload
+        school: Optional school name filter for multi-school PDFs (e.g., Texas ISD format)
+        profile: Profiling token (or send it as X-Profile-Token). Profiles this
+            extraction and returns a profileId for GET /profiles/{id}.
+        layout: "games" (a list of game objects) or "columnar" (field arrays
+            plus a deduplicated teams table)
+        timeout: Seconds the extraction may run (or send X-Request-Timeout),
+            at most PDF_REQUEST_TIMEOUT_SECONDS. An extraction still running
+            then is stopped at its next page and answered with a 504 saying
+            how many pages it parsed.
+    """
+    _check_layout(layout)
+    profile_token = _profile_token(request, profile)
+    seconds = _request_timeout(request, timeout)
+    content = await _read_pdf_upload(file)
+    return await _extract_response(request, content, school, profile_token, layout, seconds)
+
+
+@app.post("/extract/diff")
+async def extract_schedule_diff(
+    request: Request,
+    since: str,
+    file: UploadFile = File(...),
+    school: Optional[str] = None,
+    timeout: Optional[str] = None,
+):
+    """
+    Extract an updated PDF and return only what changed since an earlier extraction.
+
+    Args:
+        since: documentToken or contentHash from the earlier /extract response
+        file: PDF file upload, the updated schedule
+        school: School for multi-school PDFs, as for /extract; with a
+            contentHash, the earlier extraction must have used the same school
+        timeout: As for /extract
+
+    Instead of games, the response has added and removed games, changed
+    games ({game, previous, fields}, fields naming which of time, location
+    and score differ) and unchangedCount. Games are matched by date and teams.
+    """
+    seconds = _request_timeout(request, timeout)
+    previous = await _previous_games(since, school)
+    if previous is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Previous extraction not found or expired. Extract the earlier PDF again first."
+        )
+    content = await _read_pdf_upload(file)
+    return await _extract_response(request, content, school, None, 'games', seconds, previous=previous)
+
+
+@app.post("/extract/raw")
+async def extract_schedule_raw(
+    request: Request,
+    school: Optional[str] = None,
+    profile: Optional[str] = None,
+    layout: str = 'games',
+    timeout: Optional[str] = None,
+):
+    """
+    Same as /extract, with the PDF as the raw request body
+    (Content-Type: application/pdf) instead of a multipart upload.
+
+    The body is streamed to a temp file that workers memory map, so it is
+    never held in memory or copied to a worker. Oversized bodies are
+    rejected from Content-Length and non-PDFs from their first bytes,
+    without reading the rest.
+    """
+    _check_layout(layout)
+    profile_token = _profile_token(request, profile)
+    seconds = _request_timeout(request, timeout)
+    async with _spooled_pdf_body(request) as (path, digest):
+        return await _extract_response(request, path, school, profile_token, layout, seconds, digest)
+
 
-        if result['gameCount'] > MAX_GAMES:
+def _request_timeout(request: Request, timeout: Optional[str]) -> float:
+    """
+    Seconds a request's extraction may run: X-Request-Timeout or ?timeout=,
+    capped at PDF_REQUEST_TIMEOUT_SECONDS. The query parameter arrives as
+    text so a bad value in either place gets the same 400.
+    """
+    value = request.headers.get('x-request-timeout') or timeout
+    if value is None:
+        return PDF_REQUEST_TIMEOUT_SECONDS
+    try:
+        seconds = float(value)
+    except ValueError:
+        seconds = 0.0
+    if not seconds > 0:
+        raise HTTPException(status_code=400, detail="timeout must be a positive number of seconds")
+    return min(seconds, PDF_REQUEST_TIMEOUT_SECONDS)
+
+
+async def _until_deadline(request: Optional[Request], deadline: Deadline, work: Awaitable[Dict]) -> Dict:
+    """
+    Await work, an extraction running under deadline. If the client
+    disconnects the extraction is told to stop. A worker that hasn't
+    reached a checkpoint PDF_DEADLINE_GRACE_SECONDS after the deadline (one
+    very long page, or the task still queued) is abandoned: the request
+    stops waiting and the worker stops at its next checkpoint.
+    """
+    task = asyncio.ensure_future(work)
+    reason = DEADLINE
+    expires_at = deadline.token.expires_at
+    give_up_at = None if expires_at is None else expires_at + PDF_DEADLINE_GRACE_SECONDS
+    try:
+        while not task.done():
+            wait = DISCONNECT_POLL_SECONDS
+            if give_up_at is not None:
+                wait = min(wait, give_up_at - time.time())
+                if wait <= 0:
+                    break
+            await asyncio.wait({task}, timeout=wait)
+            if not task.done() and not deadline.cancelled and request is not None and await request.is_disconnected():
+                # Give the worker its grace period to stop on its own, so
+                # the pages it parsed are counted
+                log.info("Client disconnected, cancelling extraction")
+                reason = DISCONNECT
+                deadline.cancel()
+                give_up_at = time.time() + PDF_DEADLINE_GRACE_SECONDS
+        if task.done():
+            return task.result()
+    finally:
+        task.cancel()
+    raise ExtractionCancelled(reason)
+
+
+def _cancelled_response(error: ExtractionCancelled, seconds: float) -> Response:
+    """The response to an extraction stopped at its deadline or by a disconnect, with its progress."""
+    observe_abandoned(error.reason, error.progress.get('pagesParsed'))
+    log.info(
+        "Extraction stopped (%s): %s", error.reason, error.progress,
+        extra={'reason': error.reason, **error.progress},
+    )
+    if error.reason == DEADLINE:
+        status_code, detail = 504, f"Extraction did not finish within {seconds:g}s"
+    else:
+        # nginx's "client closed request"; nobody is left to read it
+        status_code, detail = 499, "Client closed request"
+    return Response(
+        encode_json({'detail': detail, 'reason': error.reason, **error.progress}),
+        status_code=status_code,
+        media_type='application/json',
+    )
+
+
+def _profile_token(request: Request, profile: Optional[str]) -> Optional[str]:
+    """The profiling token sent with a request, checked if present."""
+    token = request.headers.get('x-profile-token') or profile
+    if token is not None:
+        _check_profile_token(token)
+    return token
+
+
+async def _extract_response(
+    request: Request,
+    content: PdfSource,
+    school: Optional[str],
+    profile_token: Optional[str],
+    layout: str,
+    seconds: float,
+    digest: Optional[str] = None,
+    previous: Optional[List[Dict]] = None,
+) -> Response:
+    """
+    Extract one uploaded PDF into the /extract response, mapping failures to
+    HTTP errors. With previous games, the response is the diff against them.
+    """
+    profile_id = profile_path = None
+    if profile_token is not None:
+        profile_id, profile_path = profiles.new_path()
+
+    try:
+        with Deadline(seconds) as deadline:
+            result = await _until_deadline(
+                request, deadline, _extract_pdf(content, school, profile_path, digest, deadline.token)
+            )
+        if profile_id:
+            result['profileId'] = profile_id
+        if previous is not None:
+            result = diff_result(result, previous)
+        return _json_response(request, result, layout)
+
+    except ExtractionCancelled as e:
+        return _cancelled_response(e, seconds)
+    except PoolSaturated as e:
+        raise HTTPException(
+            status_code=429,
+            detail="PDF service is busy. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to extract schedule: {str(e)}"
+        )
+
+
+class _BatchBudget:
+    """
+    Files and bytes a batch has taken so far, checked against
+    PDF_BATCH_MAX_FILES and PDF_BATCH_MAX_BYTES before anything is read.
+    """
+
+    def __init__(self):
+        self.files = 0
+        self.bytes = 0
+
+    def take(self, files: int, size: int) -> None:
+        self.files += files
+        self.bytes += size
+        if self.files > PDF_BATCH_MAX_FILES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Too many files (at least {self.files}). Maximum is {PDF_BATCH_MAX_FILES}."
+            )
+        if self.bytes > PDF_BATCH_MAX_BYTES:
             raise HTTPException(
                 status_code=400,
-                detail=f"Too many games ({result['gameCount']}). Maximum is {MAX_GAMES}."
+                detail=f"Batch too large. Maximum is {PDF_BATCH_MAX_BYTES // (1024 * 1024)}MB of PDFs."
             )
 
-        return result
 
-    except HTTPException:
-        raise
+def _zip_pdf_entries(archive: zipfile.ZipFile) -> List[zipfile.ZipInfo]:
+    """The PDF entries of a zip, skipping folders, macOS resource forks and other files."""
+    infos = []
+    for info in archive.infolist():
+        name = info.filename
+        basename = name.rsplit('/', 1)[-1]
+        if info.is_dir() or name.startswith('__MACOSX/') or basename.startswith('.'):
+            continue
+        if basename.lower().endswith('.pdf'):
+            infos.append(info)
+    return infos
+
+
+def _read_zip_entries(archive_name: str, data: bytes, budget: _BatchBudget) -> List[Tuple[str, object]]:
+    """
+    (name, bytes or HTTPException) for each PDF inside a zip upload. The
+    entries' count and declared sizes are charged to budget before any
+    entry is inflated.
+    """
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(data))
+    except zipfile.BadZipFile:
+        return [(archive_name, HTTPException(status_code=400, detail="File is not a valid zip archive"))]
+
+    entries = []
+    with archive:
+        infos = _zip_pdf_entries(archive)
+        # Oversized entries are rejected unread, so they don't count
+        budget.take(len(infos), sum(info.file_size for info in infos if info.file_size <= MAX_PDF_SIZE_BYTES))
+        for info in infos:
+            name = info.filename
+            # Check the declared size first so a zip bomb is never inflated
+            try:
+                _check_pdf_size(info.file_size)
+                content = archive.read(info)
+                _check_pdf_magic(content)
+                entries.append((name, content))
+            except HTTPException as e:
+                entries.append((name, e))
+            except (zipfile.BadZipFile, RuntimeError, NotImplementedError) as e:
+                entries.append((name, HTTPException(status_code=400, detail=f"Could not read {name} from zip: {e}")))
+    return entries
+
+
+async def _read_batch_uploads(files: List[UploadFile]) -> List[Tuple[str, object]]:
+    """
+    (filename, bytes or HTTPException) for every PDF in a batch upload, with
+    zip archives expanded. Invalid files become per-file errors. Raises
+    once the batch holds more files or PDF bytes than allowed, before
+    reading them.
+    """
+    budget = _BatchBudget()
+    # Every plain file counts as one PDF; zips are counted as they're opened
+    budget.take(sum(1 for file in files if not (file.filename or '').lower().endswith('.zip')), 0)
+    entries = []
+    for file in files:
+        filename = file.filename or 'upload'
+        if filename.lower().endswith('.zip'):
+            entries.extend(_read_zip_entries(filename, await file.read(), budget))
+            continue
+        # Spooled by the multipart parser, so its size is known unread
+        if file.size is not None and file.size <= MAX_PDF_SIZE_BYTES:
+            budget.take(0, file.size)
+        try:
+            entries.append((filename, await _read_pdf_upload(file)))
+        except HTTPException as e:
+            entries.append((filename, e))
+    return entries
+
+
+async def _extract_batch_entry(
+    filename: str,
+    content: object,
+    school: Optional[str],
+    slots: asyncio.Semaphore,
+) -> Dict:
+    """Extract one file of a batch, turning any failure into a per-file error."""
+    if isinstance(content, HTTPException):
+        return {'filename': filename, 'status': content.status_code, 'error': content.detail}
+
+    try:
+        async with slots:
+            # The time limit starts once the file gets a slot, so files
+            # waiting behind the rest of the batch aren't penalized
+            with Deadline(PDF_BATCH_FILE_TIMEOUT_SECONDS) as deadline:
+                result = await _until_deadline(
+                    None, deadline, _extract_pdf(content, school, deadline=deadline.token, lane=BULK)
+                )
+    except HTTPException as e:
+        return {'filename': filename, 'status': e.status_code, 'error': e.detail}
+    except ExtractionCancelled as e:
+        observe_abandoned(e.reason, e.progress.get('pagesParsed'))
+        return {
+            'filename': filename,
+            'status': 504,
+            'error': f"Extraction took longer than {PDF_BATCH_FILE_TIMEOUT_SECONDS}s",
+            **e.progress,
+        }
+    except PoolSaturated:
+        return {'filename': filename, 'status': 429, 'error': "PDF service is busy. Please retry shortly."}
+    except Exception as e:
+        return {'filename': filename, 'status': 500, 'error': f"Failed to extract schedule: {str(e)}"}
+
+    return {'filename': filename, 'status': 200, 'result': result}
+
+
+def _batch_school(school_by_file: Dict[str, str], filename: str, default: Optional[str]) -> Optional[str]:
+    """School for a batch file, matched by full name or, for zip entries, by base name."""
+    if filename in school_by_file:
+        return school_by_file[filename]
+    return school_by_file.get(filename.rsplit('/', 1)[-1], default)
+
+
+@app.post("/extract/batch")
+async def extract_schedule_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    schools: Optional[str] = Form(None),
+    school: Optional[str] = None,
+):
+    """
+    Extract schedules from many PDFs in one request.
+
+    Args:
+        files: PDF files and/or zip archives of PDFs
+        schools: Optional JSON object mapping a filename (or path inside a zip) to its school
+        school: Optional school for files not listed in `schools`
+
+    Files are extracted in parallel, each with its own time limit. The
+    response lists a result or an error for every file, in upload order.
+    """
+    school_by_file = {}
+    if schools:
+        try:
+            school_by_file = json.loads(schools)
+        except ValueError:
+            school_by_file = None
+        if not isinstance(school_by_file, dict):
+            raise HTTPException(status_code=400, detail="schools must be a JSON object of filename to school")
+
+    entries = await _read_batch_uploads(files)
+    if not entries:
+        raise HTTPException(status_code=400, detail="No PDF files found in upload")
+
+    # Batch files run in the bulk lane, behind interactive uploads. Keep one
+    # batch from taking more than that lane's workers, so the rest of its
+    # files wait here instead of filling the lane's queue
+    slots = asyncio.Semaphore(extraction_pool.limit(BULK))
+    results = await asyncio.gather(*(
+        _extract_batch_entry(name, content, _batch_school(school_by_file, name, school), slots)
+        for name, content in entries
+    ))
+
+    succeeded = sum(1 for r in results if r['status'] == 200)
+    return _json_response(request, {
+        'success': succeeded > 0,
+        'fileCount': len(results),
+        'succeeded': succeeded,
+        'failed': len(results) - succeeded,
+        'results': results,
+    })
+
+
+def _format_stream_event(event: Dict, sse: bool) -> str:
+    if sse:
+        return f"event: {event['type']}\ndata: {encode_json(event).decode()}\n\n"
+    return encode_json(event).decode() + "\n"
+
+
+async def _replay_cached_result(result: Dict) -> AsyncIterator[Dict]:
+    """Stream events for a result that is already cached."""
+    yield {
+        'type': 'metadata',
+        'format': result.get(FORMAT_KEY),
+        'mainTeam': result.get('mainTeam'),
+        'mainCity': result.get('mainCity'),
+        'mainState': result.get('mainState'),
+    }
+    yield {'type': 'games', 'page': None, 'games': result['games']}
+    yield {'type': 'result', 'result': result}
+
+
+@app.post("/extract/stream")
+async def extract_schedule_stream(
+    request: Request,
+    file: UploadFile = File(...),
+    school: Optional[str] = None,
+    timeout: Optional[str] = None,
+):
+    """
+    Streaming variant of /extract that sends games as pages are parsed.
+    Takes the same timeout as /extract; a client that disconnects stops
+    the extraction at its next page.
+
+    The body is newline-delimited JSON, or server-sent events when the client
+    sends "Accept: text/event-stream". Events, in order:
+      - {"type": "metadata", "format", "mainTeam", "mainCity", "mainState"}
+      - {"type": "games", "page", "games"} for each parsed page
+      - {"type": "summary", ...} with the remaining /extract fields (no games)
+    A failure after the stream has started is sent as {"type": "error", "status", "detail"}.
+    """
+    seconds = _request_timeout(request, timeout)
+    content = await _read_pdf_upload(file)
+    sse = 'text/event-stream' in request.headers.get('accept', '')
+
+    digest = ResultCache.digest(content)
+    cache_key = ResultCache.key(digest, school=school)
+    cached = await result_cache.lookup(cache_key)
+    # Closed when the body ends, including when the client goes away
+    deadline = Deadline(seconds)
+    if cached is not None:
+        events = _replay_cached_result(cached)
+    else:
+        lane, cost = await _schedule(content, digest)
+        events = extraction_pool.stream(iter_extraction_events, content, school, deadline.token, lane=lane, cost=cost)
+
+    # Start the extraction before responding so a full queue is still a 429
+    try:
+        first_event = await events.__anext__()
+    except ExtractionCancelled as e:
+        deadline.close()
+        observe_outcome(None, _outcome(e))
+        return _cancelled_response(e, seconds)
+    except PoolSaturated as e:
+        deadline.close()
+        observe_outcome(None, 'busy')
+        raise HTTPException(
+            status_code=429,
+            detail="PDF service is busy. Please retry shortly.",
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except Exception as e:
+        deadline.close()
+        observe_outcome(None, 'error')
         raise HTTPException(
             status_code=500,
             detail=f"Failed to extract schedule: {str(e)}"
         )
 
+    async def body() -> AsyncIterator[str]:
+        event = first_event
+        format_name = None
+        try:
+            while True:
+                if event['type'] == 'result':
+                    result = event['result']
+                    format_name = result.get(FORMAT_KEY)
+                    if cached is None:
+                        await result_cache.store(cache_key, _observe_parse(result, digest))
+                    result = _finalize_result(dict(result), digest)
+                    _validate_result(result)
+                    observe_outcome(format_name, 'success', result['gameCount'])
+                    _remember_games(digest, school, result)
+                    result.pop('games', None)
+                    yield _format_stream_event({'type': 'summary', **result}, sse)
+                else:
+                    yield _format_stream_event(event, sse)
+                try:
+                    event = await events.__anext__()
+                except StopAsyncIteration:
+                    break
+        except HTTPException as e:
+            observe_outcome(format_name, 'rejected')
+            yield _format_stream_event({'type': 'error', 'status': e.status_code, 'detail': e.detail}, sse)
+        except ExtractionCancelled as e:
+            observe_outcome(format_name, _outcome(e))
+            observe_abandoned(e.reason, e.progress.get('pagesParsed'))
+            yield _format_stream_event({
+                'type': 'error',
+                'status': 504,
+                'detail': f"Extraction did not finish within {seconds:g}s",
+                'reason': e.reason,
+                **e.progress,
+            }, sse)
+        except Exception as e:
+            observe_outcome(format_name, 'error')
+            yield _format_stream_event(
+                {'type': 'error', 'status': 500, 'detail': f"Failed to extract schedule: {str(e)}"}, sse
+            )
+        finally:
+            deadline.close()
+
+    media_type = 'text/event-stream' if sse else 'application/x-ndjson'
+    return StreamingResponse(body(), media_type=media_type)
+
+
+@app.get("/documents/{token}/games")
+async def document_games(request: Request, token: str, school: Optional[str] = None, layout: str = 'games'):
+    """
+    Serve games from a multi-school PDF extracted earlier, without re-uploading it.
+
+    Args:
+        token: documentToken returned by /extract
+        school: School name, or "__all__" for every school. If omitted, returns the school list.
+        layout: "games" or "columnar", as for /extract
+    """
+    _check_layout(layout)
+    session = document_sessions.get(token)
+    if session is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Document not found or expired. Please upload the PDF again."
+        )
+
+    result = MULTI_SCHOOL_RESPONSES[session.format](session.games_by_school, school, session.game_counts)
+    if school and not result['success']:
+        raise HTTPException(status_code=404, detail=result['error'])
+
+    _validate_result(result)
+
+    result['documentToken'] = token
+    return _json_response(request, result, layout)
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return {
+        **result_cache.stats(),
+        'pages': page_cache.stats(),
+        'sessions': document_sessions.stats(),
+    }
+
+
+@app.get("/pool/stats")
+async def pool_stats():
+    return {**extraction_pool.stats(), 'secondsPerPage': cost_model.seconds_per_page()}
+
+
+@app.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str, request: Request, format: str = 'pstats', profile: Optional[str] = None):
+    """
+    Download a profile captured by /extract with a profiling token.
+
+    Args:
+        profile_id: profileId from the /extract response
+        format: "pstats" for the raw file (snakeviz, pstats), or "text" for the top functions
+        profile: Profiling token, if not sent as X-Profile-Token
+    """
+    _check_profile_token(request.headers.get('x-profile-token') or profile or '')
+    if format == 'text':
+        summary = profiles.summary(profile_id)
+        if summary is not None:
+            return PlainTextResponse(summary)
+    elif format == 'pstats':
+        path = profiles.path(profile_id)
+        if path is not None:
+            return FileResponse(path, media_type='application/octet-stream', filename=f"{profile_id}.pstats")
+    else:
+        raise HTTPException(status_code=400, detail="format must be pstats or text")
+    raise HTTPException(status_code=404, detail="Profile not found")
+
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once every worker has started and run the warm-up
+    PDF, 503 while starting up or if warm-up failed.
+    """
+    status_code = 200 if readiness.ready else 503
+    return Response(encode_json(readiness.as_dict()), status_code=status_code, media_type='application/json')
+
+
+@app.get("/metrics")
+async def metrics():
+    """Prometheus metrics: stage latencies, outcomes by format, pool queue depth."""
+    return Response(render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
 
 @app.get("/")
 async def root():
@@ -1124,6 +2895,16 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "/extract": "POST - Extract schedule from PDF file",
+            "/extract/raw": "POST - Extract schedule from a raw application/pdf request body",
+            "/extract/stream": "POST - Extract schedule, streaming games page by page (NDJSON or SSE)",
+            "/extract/diff": "POST - Extract an updated schedule and return only games added, removed or changed",
+            "/extract/batch": "POST - Extract schedules from many PDFs or a zip of PDFs",
+            "/documents/{token}/games": "GET - Games for a school from a multi-school PDF already extracted",
+            "/cache/stats": "GET - Extraction result, page and document session cache counters",
+            "/pool/stats": "GET - Worker pool lanes and the cost model's seconds per page",
+            "/metrics": "GET - Prometheus metrics",
+            "/ready": "GET - Readiness: 200 once worker processes are started and warmed up",
+            "/profiles/{id}": "GET - Download a profile captured with a profiling token",
             "/docs": "GET - API documentation"
         }
     }
@@ -0,0 +1,91 @@
+"""
+On-demand cProfile captures of single extractions.
+
+An admin sends the profiling token with one /extract request; that PDF is
+parsed under cProfile in its worker process and the stats are written to
+PDF_PROFILE_DIR under a random id, downloadable from /profiles/{id}.
+Requests without the token take the normal path, so profiling costs them
+nothing. Only the newest PDF_PROFILE_MAX_FILES profiles are kept.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import secrets
+from typing import Any, Callable, Optional, Tuple
+
+from config import PDF_PROFILE_DIR, PDF_PROFILE_MAX_FILES, PDF_PROFILE_TOKEN
+
+_PROFILE_ID = re.compile(r'[0-9a-f]{32}')
+
+
+def run_profiled(fn: Callable[..., Any], path: str, *args: Any) -> Any:
+    """Worker task: fn(*args) under cProfile, with the stats dumped to path."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return fn(*args)
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+
+
+class ProfileStore:
+    """Profile files in a directory, named by id."""
+
+    def __init__(
+        self,
+        directory: str = PDF_PROFILE_DIR,
+        token: Optional[str] = PDF_PROFILE_TOKEN,
+        max_files: int = PDF_PROFILE_MAX_FILES,
+    ):
+        self.directory = directory
+        self.token = token
+        self.max_files = max_files
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.token)
+
+    def authorized(self, token: str) -> bool:
+        return self.enabled and secrets.compare_digest(token.encode(), self.token.encode())
+
+    def new_path(self) -> Tuple[str, str]:
+        """A fresh (id, path) to dump a profile to, making room for it first."""
+        os.makedirs(self.directory, exist_ok=True)
+        self._prune(self.max_files - 1)
+        profile_id = secrets.token_hex(16)
+        return profile_id, self._path(profile_id)
+
+    def path(self, profile_id: str) -> Optional[str]:
+        """Path of a stored profile, or None for an unknown or malformed id."""
+        if not _PROFILE_ID.fullmatch(profile_id):
+            return None
+        path = self._path(profile_id)
+        return path if os.path.exists(path) else None
+
+    def summary(self, profile_id: str, sort: str = 'cumulative', limit: int = 60) -> Optional[str]:
+        """pstats text report of the top `limit` functions, or None if not found."""
+        path = self.path(profile_id)
+        if path is None:
+            return None
+        out = io.StringIO()
+        pstats.Stats(path, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def _path(self, profile_id: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.pstats")
+
+    def _prune(self, keep: int) -> None:
+        paths = [
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.endswith('.pstats')
+        ]
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:max(0, len(paths) - keep)]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,209 @@
+"""
+Content-addressed cache of extraction results.
+
+Results are keyed by the SHA-256 of the PDF bytes plus the extraction
+parameters. A bounded in-memory LRU sits in front of an optional SQLite
+file that several uvicorn workers can share and that survives restarts.
+Concurrent requests for the same key are coalesced so only one parse runs.
+"""
+import asyncio
+import hashlib
+import json
+import sqlite3
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, Optional
+
+from config import PDF_CACHE_DB, PDF_CACHE_DB_MAX_ENTRIES, PDF_CACHE_MAX_BYTES
+from deadlines import ExtractionCancelled
+
+# Bump when extractor output changes so stale disk entries are ignored
+CACHE_VERSION = "3"
+
+
+class ResultCache:
+    """LRU of serialized results bounded by total bytes, with single-flight."""
+
+    def __init__(
+        self,
+        max_bytes: int = PDF_CACHE_MAX_BYTES,
+        db_path: Optional[str] = PDF_CACHE_DB,
+        db_max_entries: int = PDF_CACHE_DB_MAX_ENTRIES,
+    ):
+        self.max_bytes = max_bytes
+        self.db_path = db_path
+        self.db_max_entries = db_max_entries
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        if db_path:
+            self._init_db()
+
+    @staticmethod
+    def digest(content: bytes) -> str:
+        return hashlib.sha256(content).hexdigest()
+
+    @staticmethod
+    def key(digest: str, **params: Optional[str]) -> str:
+        param_str = "&".join(f"{k}={v}" for k, v in sorted(params.items()) if v is not None)
+        return f"v{CACHE_VERSION}:{digest}:{param_str}"
+
+    def stats(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self._size,
+            'maxBytes': self.max_bytes,
+            'hits': self.hits,
+            'diskHits': self.disk_hits,
+            'misses': self.misses,
+            'coalesced': self.coalesced,
+            'evictions': self.evictions,
+            'diskEnabled': bool(self.db_path),
+        }
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Dict]]) -> Dict:
+        """
+        Return the cached result for key, or run compute() once for all
+        concurrent callers asking for the same key.
+        Each caller gets its own copy of the result.
+        """
+        while True:
+            data = self._get_memory(key)
+            if data is not None:
+                self.hits += 1
+                return json.loads(data)
+
+            pending = self._inflight.get(key)
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return json.loads(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                # The leading request was cancelled (client went away or
+                # its deadline passed) rather than this one: take over the work
+                if pending.cancelled():
+                    continue
+                raise
+
+        future = asyncio.get_running_loop().create_future()
+        # Mark exceptions as retrieved when nobody else was waiting
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        try:
+            data = await self._get_disk(key)
+            if data is not None:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+                result = await compute()
+                data = json.dumps(result).encode()
+                await self._put_disk(key, data)
+            self._put_memory(key, data)
+            future.set_result(data)
+        except (asyncio.CancelledError, ExtractionCancelled):
+            # Stopped for this request's own deadline or disconnect; waiters
+            # with time left take over instead of failing with it
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            del self._inflight[key]
+        return json.loads(data)
+
+    async def lookup(self, key: str) -> Optional[Dict]:
+        """Return a copy of the cached result for key without computing it."""
+        data = self._get_memory(key)
+        if data is not None:
+            self.hits += 1
+            return json.loads(data)
+        data = await self._get_disk(key)
+        if data is not None:
+            self.disk_hits += 1
+            self._put_memory(key, data)
+            return json.loads(data)
+        self.misses += 1
+        return None
+
+    async def store(self, key: str, result: Dict) -> None:
+        """Cache a result computed outside get_or_compute()."""
+        data = json.dumps(result).encode()
+        await self._put_disk(key, data)
+        self._put_memory(key, data)
+
+    def _get_memory(self, key: str) -> Optional[bytes]:
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+        return data
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(old)
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    # Disk tier: a new connection per call keeps this thread- and
+    # process-safe; sqlite3 work runs off the event loop.
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL)"
+            )
+        conn.close()
+
+    async def _get_disk(self, key: str) -> Optional[bytes]:
+        if not self.db_path:
+            return None
+        return await asyncio.to_thread(self._get_disk_sync, key)
+
+    def _get_disk_sync(self, key: str) -> Optional[bytes]:
+        conn = self._connect()
+        try:
+            row = conn.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone()
+            return row[0] if row else None
+        finally:
+            conn.close()
+
+    async def _put_disk(self, key: str, data: bytes) -> None:
+        if not self.db_path:
+            return
+        await asyncio.to_thread(self._put_disk_sync, key, data)
+
+    def _put_disk_sync(self, key: str, data: bytes) -> None:
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO results (key, value, created) VALUES (?, ?, ?)",
+                    (key, data, time.time()),
+                )
+                # Drop the oldest rows once over the entry limit
+                conn.execute(
+                    "DELETE FROM results WHERE key IN ("
+                    "SELECT key FROM results ORDER BY created DESC LIMIT -1 OFFSET ?)",
+                    (self.db_max_entries,),
+                )
+        finally:
+            conn.close()
@@ -0,0 +1,131 @@
+"""
+Game-level diffs between two extractions of the same schedule.
+
+A nightly re-import of updated schedules would otherwise resubmit every
+game, resolving both teams and adding each game again, even when the PDF
+changed by one score. /extract/diff compares the new upload against a
+previous extraction and returns only the games added, removed or changed,
+so downstream work scales with the changes.
+
+A game is identified by its date and its two teams (in either order), so
+moving a game to the other team's venue is a change rather than a removal
+and an addition. A rescheduled game (new date) is removed and added. Two
+games between the same teams on the same day are matched in order. A match
+is changed when its time, location (home and away side, cities, states) or
+score differs.
+
+Previous extractions are found by documentToken, or by the contentHash
+every /extract response carries: the games of each extraction are kept
+here, by content hash and school, as compact GameRecords in a bounded LRU.
+"""
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from config import PDF_SNAPSHOT_MAX_BYTES
+from game_records import encode_json, pack_games, unpack_games
+
+if TYPE_CHECKING:
+    from game_records import GameRecord
+
+# Groups of game fields a diff reports as changed
+DIFF_FIELDS: Dict[str, Tuple[str, ...]] = {
+    'time': ('time',),
+    'location': ('homeTeam', 'awayTeam', 'homeCity', 'homeState', 'awayCity', 'awayState'),
+    'score': ('homeScore', 'awayScore', 'isCompleted'),
+}
+
+
+def game_key(game: Dict) -> Tuple:
+    """A game's identity across extractions: its date and its pair of teams."""
+    teams = sorted((game.get('homeTeam') or '', game.get('awayTeam') or ''))
+    return (game.get('date'), teams[0], teams[1])
+
+
+def _by_key(games: Iterable[Dict]) -> "OrderedDict[Tuple, Dict]":
+    """Games by key, numbering repeats of a key (doubleheaders) in order."""
+    keyed: "OrderedDict[Tuple, Dict]" = OrderedDict()
+    for game in games:
+        key = game_key(game)
+        n = 0
+        while (key, n) in keyed:
+            n += 1
+        keyed[(key, n)] = game
+    return keyed
+
+
+def diff_games(previous: Iterable[Dict], current: Iterable[Dict]) -> Dict:
+    """
+    Games added to, removed from and changed in current relative to
+    previous. A changed entry holds the current game, the previous one and
+    the DIFF_FIELDS groups that differ.
+    """
+    before = _by_key(previous)
+    after = _by_key(current)
+    added = [game for key, game in after.items() if key not in before]
+    removed = [game for key, game in before.items() if key not in after]
+    changed = []
+    for key, game in after.items():
+        old = before.get(key)
+        if old is None:
+            continue
+        fields = [
+            name for name, group in DIFF_FIELDS.items()
+            if any(game.get(field) != old.get(field) for field in group)
+        ]
+        if fields:
+            changed.append({'game': game, 'previous': old, 'fields': fields})
+    return {
+        'added': added,
+        'removed': removed,
+        'changed': changed,
+        'unchangedCount': len(after) - len(added) - len(changed),
+    }
+
+
+def diff_result(result: Dict, previous: List[Dict]) -> Dict:
+    """
+    An /extract result with its games replaced by their diff against
+    previous. A school selection prompt has no games and is returned as is.
+    """
+    if result.get('requiresSchoolSelection'):
+        return result
+    games = result.pop('games', [])
+    return {**result, **diff_games(previous, games), 'previousGameCount': len(previous)}
+
+
+class ScheduleSnapshots:
+    """Games of recent extractions by (content hash, school) key, bounded LRU by size."""
+
+    def __init__(self, max_bytes: int = PDF_SNAPSHOT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._snapshots: "OrderedDict[str, Tuple[List[GameRecord], int]]" = OrderedDict()
+        self._size = 0
+
+    def put(self, key: str, games: List[Dict]) -> None:
+        if key in self._snapshots:
+            # Same PDF and school, so the same games
+            self._snapshots.move_to_end(key)
+            return
+        records = pack_games(games)
+        size = len(encode_json(records))
+        if size > self.max_bytes:
+            return
+        self._snapshots[key] = (records, size)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted) = self._snapshots.popitem(last=False)
+            self._size -= evicted
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            return None
+        self._snapshots.move_to_end(key)
+        return unpack_games(snapshot[0])
+
+    def stats(self) -> Dict:
+        return {
+            'snapshots': len(self._snapshots),
+            'bytes': self._size,
+            'maxBytes': self.max_bytes,
+        }
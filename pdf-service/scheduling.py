@@ -0,0 +1,223 @@
+"""
+Cost-aware scheduling of extractions across lanes.
+
+A district-wide Texas or Iowa PDF can hold a worker for seconds while a
+two-page team schedule takes tens of milliseconds. Sharing one FIFO queue,
+a burst of league documents makes every small upload wait behind them. So
+each extraction gets a cheap cost estimate when it is admitted, before any
+parsing, and goes into a lane:
+
+- interactive: estimated to finish quickly. May use every worker.
+- bulk: league-sized documents and batch files. May use at most
+  PDF_BULK_WORKERS workers, so some are always left for interactive work.
+
+When a worker frees up and both lanes have work waiting, lanes are served
+as a weighted fair queue on estimated cost: each lane's virtual time
+advances by cost / weight per extraction started, and the lane furthest
+behind goes next. Interactive work is strongly favoured without bulk work
+ever starving.
+
+The estimate is pages x seconds per page. Pages come from the page tree's
+/Count when it is stored uncompressed, otherwise from the file size.
+Seconds per page are learned per format from finished extractions. A
+document already seen (by digest) is estimated with its real page count
+and detected format.
+"""
+import asyncio
+import mmap
+import re
+from collections import OrderedDict, deque
+from typing import Deque, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+from config import PDF_BULK_QUEUE_SIZE, PDF_BULK_WORKERS, PDF_INTERACTIVE_MAX_MS, PDF_INTERACTIVE_WEIGHT, PDF_QUEUE_SIZE
+
+INTERACTIVE = 'interactive'
+BULK = 'bulk'
+
+# Pages assumed per byte when the page tree's /Count is compressed away
+BYTES_PER_PAGE = 16 * 1024
+
+# Starting seconds per page by format (benchmarks/run.py medians, rounded
+# up), refined as extractions finish. None: format not yet known.
+SECONDS_PER_PAGE: Dict[Optional[str], float] = {
+    None: 0.1,
+    'maxpreps': 0.02,
+    'schedule_star': 0.02,
+    'cif_bracket': 0.01,
+    'texas_isd': 0.15,
+    'iowa_hs': 0.2,
+    'table': 0.06,
+}
+
+# Weight of each new observation in the learned seconds per page
+LEARNING_RATE = 0.2
+
+# Documents whose format and page count are remembered by digest
+KNOWN_DOCUMENTS = 1024
+
+_PAGE_COUNT = re.compile(rb'/Count\s+(\d+)')
+
+
+class CostEstimate(NamedTuple):
+    pages: int
+    format: Optional[str]
+    seconds: float
+
+
+def estimate_pages(content: Union[bytes, str]) -> int:
+    """
+    Page count from the largest uncompressed /Count (the page tree's root),
+    or from the file size when the page tree sits in a compressed object
+    stream. content is PDF bytes or the path of a PDF file.
+    """
+    if isinstance(content, str):
+        with open(content, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return _estimate_pages(data)
+    return _estimate_pages(content)
+
+
+def _estimate_pages(data) -> int:
+    counts = [int(count) for count in _PAGE_COUNT.findall(data)]
+    if counts:
+        return max(1, max(counts))
+    return max(1, len(data) // BYTES_PER_PAGE)
+
+
+class CostModel:
+    """Estimates how long an extraction will hold a worker, and picks its lane."""
+
+    def __init__(self, interactive_max_seconds: float = PDF_INTERACTIVE_MAX_MS / 1000):
+        self.interactive_max_seconds = interactive_max_seconds
+        self._seconds_per_page = dict(SECONDS_PER_PAGE)
+        self._documents: "OrderedDict[str, Tuple[Optional[str], int]]" = OrderedDict()
+
+    async def estimate(self, digest: Optional[str], content: Union[bytes, str]) -> CostEstimate:
+        known = self._documents.get(digest) if digest else None
+        if known is not None:
+            self._documents.move_to_end(digest)
+            format_name, pages = known
+        else:
+            # Scans the whole upload (up to 10MB); keep it off the event loop
+            loop = asyncio.get_running_loop()
+            format_name, pages = None, await loop.run_in_executor(None, estimate_pages, content)
+        return CostEstimate(pages, format_name, self.seconds(format_name, pages))
+
+    def seconds(self, format_name: Optional[str], pages: int) -> float:
+        """Estimated seconds to extract pages pages of format_name."""
+        return pages * self._seconds_per_page.get(format_name, self._seconds_per_page[None])
+
+    def lane(self, estimate: CostEstimate) -> str:
+        return INTERACTIVE if estimate.seconds <= self.interactive_max_seconds else BULK
+
+    def observe(self, digest: Optional[str], format_name: Optional[str], pages: Optional[int], seconds: float) -> None:
+        """Learn from a finished extraction of pages pages in seconds."""
+        if not pages:
+            return
+        if digest:
+            self._documents[digest] = (format_name, pages)
+            self._documents.move_to_end(digest)
+            while len(self._documents) > KNOWN_DOCUMENTS:
+                self._documents.popitem(last=False)
+        per_page = seconds / pages
+        for key in {format_name, None}:
+            previous = self._seconds_per_page.get(key, per_page)
+            self._seconds_per_page[key] = (1 - LEARNING_RATE) * previous + LEARNING_RATE * per_page
+
+    def seconds_per_page(self) -> Dict[str, float]:
+        return {key or 'unknown': round(value, 4) for key, value in self._seconds_per_page.items()}
+
+
+class Lane:
+    """One lane's limits, its waiting extractions and its fair-queue clock."""
+
+    def __init__(self, name: str, limit: int, queue_size: int, weight: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.weight = weight
+        self.running = 0
+        # (granted when set, estimated cost), in arrival order
+        self.waiting: Deque[Tuple[asyncio.Future, float]] = deque()
+        self.virtual = 0.0
+        # Moving average of how long one extraction holds a worker (seconds)
+        self.avg_run_seconds = 1.0
+
+    @property
+    def queued(self) -> int:
+        return len(self.waiting)
+
+    @property
+    def available(self) -> int:
+        """Extractions this lane can admit right now."""
+        return max(0, self.limit + self.queue_size - self.running - self.queued)
+
+
+def default_lanes(workers: int, queue_size: int = PDF_QUEUE_SIZE) -> Sequence[Lane]:
+    return (
+        Lane(INTERACTIVE, workers, queue_size, PDF_INTERACTIVE_WEIGHT),
+        Lane(BULK, max(1, min(workers, PDF_BULK_WORKERS or workers // 2)), PDF_BULK_QUEUE_SIZE, 1),
+    )
+
+
+class LaneScheduler:
+    """
+    Hands out worker slots. At most `workers` run at once across lanes and
+    at most lane.limit within a lane. Runs on the event loop, so the
+    counters need no locking.
+    """
+
+    def __init__(self, workers: int, lanes: Sequence[Lane]):
+        self.workers = workers
+        self.lanes: Dict[str, Lane] = {lane.name: lane for lane in lanes}
+        # Slots held outside any lane (the pool's warm-up tasks)
+        self.reserved = 0
+        # Virtual time of the most recently started extraction
+        self._virtual = 0.0
+
+    @property
+    def running(self) -> int:
+        return self.reserved + sum(lane.running for lane in self.lanes.values())
+
+    def full(self, lane: str) -> bool:
+        return self.lanes[lane].available == 0
+
+    async def acquire(self, lane_name: str, cost: float) -> None:
+        """Wait for a slot in lane_name for an extraction of estimated cost (seconds)."""
+        lane = self.lanes[lane_name]
+        if not lane.waiting:
+            # A lane that was idle doesn't bank credit from its idle time
+            lane.virtual = max(lane.virtual, self._virtual)
+        granted = asyncio.get_running_loop().create_future()
+        entry = (granted, cost)
+        lane.waiting.append(entry)
+        self._dispatch()
+        try:
+            await granted
+        except asyncio.CancelledError:
+            if granted.done() and not granted.cancelled():
+                # Granted just as the caller gave up
+                self.release(lane_name)
+            elif entry in lane.waiting:
+                lane.waiting.remove(entry)
+            raise
+
+    def release(self, lane_name: Optional[str]) -> None:
+        if lane_name is None:
+            self.reserved -= 1
+        else:
+            self.lanes[lane_name].running -= 1
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self.running < self.workers:
+            eligible = [lane for lane in self.lanes.values() if lane.waiting and lane.running < lane.limit]
+            if not eligible:
+                return
+            lane = min(eligible, key=lambda l: l.virtual)
+            granted, cost = lane.waiting.popleft()
+            if granted.cancelled():
+                continue
+            self._virtual = lane.virtual
+            lane.virtual += cost / lane.weight
+            lane.running += 1
+            granted.set_result(None)
@@ -0,0 +1,59 @@
+"""
+Leveled, structured logging for the service and its worker processes.
+
+Records go through a QueueHandler, so a request thread only enqueues them;
+formatting and writing to stderr happen on a listener thread. Per-page and
+per-game detail is logged at DEBUG and skipped at the default INFO level.
+With PDF_LOG_FORMAT=json each record is one JSON object, including any
+fields passed through `extra=`.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+from config import PDF_LOG_FORMAT, PDF_LOG_LEVEL
+
+# Attributes every LogRecord has; anything else came from extra=
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((k, v) for k, v in vars(record).items() if k not in _RECORD_ATTRS)
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+def configure_logging(level: str = PDF_LOG_LEVEL, fmt: str = PDF_LOG_FORMAT) -> None:
+    """Route the service's loggers through a background writer. Safe to call twice."""
+    global _listener
+    if _listener is not None:
+        return
+
+    handler = logging.StreamHandler()
+    if fmt == 'json':
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+
+    records: queue.Queue = queue.Queue(-1)
+    _listener = logging.handlers.QueueListener(records, handler)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    logger = logging.getLogger('pdf_service')
+    logger.setLevel(level.upper())
+    logger.addHandler(logging.handlers.QueueHandler(records))
+    logger.propagate = False
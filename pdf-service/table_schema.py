@@ -0,0 +1,86 @@
+"""
+Column mapping for schedule tables.
+
+A TableSchema names the columns an extractor needs and the header
+substrings that identify each one. A table's header row is mapped to column
+indices once per distinct header row and the mapping is cached: a document
+repeats the same header on every page, and a publisher repeats it across
+documents. ColumnMap.rows() then returns only the cells an extractor reads
+from each row, in the schema's order, with one itemgetter call per row.
+"""
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, Optional, Sequence, Tuple
+
+# Distinct header rows remembered per schema
+SCHEMA_CACHE_SIZE = 256
+
+
+class ColumnMap:
+    """Where a schema's fields sit in tables with one particular header row."""
+
+    __slots__ = ('indices', 'width', '_cells')
+
+    def __init__(self, indices: Dict[str, Optional[int]], take: Sequence[str], width_fields: Sequence[str]):
+        self.indices = indices
+        present = [indices[f] for f in width_fields if indices[f] is not None]
+        # Rows too short to reach these columns are skipped
+        self.width = max(present) + 1 if present else 0
+        positions = [indices[f] for f in take]
+        if None in positions:
+            self._cells = lambda row: tuple(None if i is None else row[i] for i in positions)
+        elif len(positions) == 1:
+            getter = itemgetter(positions[0])
+            self._cells = lambda row: (getter(row),)
+        else:
+            self._cells = itemgetter(*positions)
+
+    def rows(self, rows: Iterable[Sequence]) -> Iterator[Tuple]:
+        """The taken cells of each row, None for fields the header lacks."""
+        width = self.width
+        cells = self._cells
+        for row in rows:
+            if row and len(row) >= width:
+                yield cells(row)
+
+
+class TableSchema:
+    """
+    fields maps each field name to the lowercase substrings identifying its
+    header; the first column whose header contains any of them is used.
+    A table matches when every group in `required` has a field present.
+    `take` lists the fields rows() returns, and `width_fields` the ones a
+    row must be long enough to hold (default: take).
+    """
+
+    def __init__(
+        self,
+        fields: Dict[str, Tuple[str, ...]],
+        required: Sequence[Tuple[str, ...]],
+        take: Sequence[str],
+        width_fields: Optional[Sequence[str]] = None,
+        cache_size: int = SCHEMA_CACHE_SIZE,
+    ):
+        self.fields = fields
+        self.required = required
+        self.take = tuple(take)
+        self.width_fields = tuple(take if width_fields is None else width_fields)
+        self._columns = lru_cache(maxsize=cache_size)(self._infer)
+
+    def columns(self, header_row: Sequence[Optional[str]]) -> Optional[ColumnMap]:
+        """The column mapping for a header row, or None if the table doesn't match."""
+        return self._columns(tuple(header_row))
+
+    def cache_info(self):
+        """Hits and misses of the header row cache (functools' CacheInfo), for metrics."""
+        return self._columns.cache_info()
+
+    def _infer(self, header_row: Tuple[Optional[str], ...]) -> Optional[ColumnMap]:
+        headers = [str(h).lower() if h else "" for h in header_row]
+        indices = {
+            name: next((i for i, h in enumerate(headers) if any(key in h for key in keys)), None)
+            for name, keys in self.fields.items()
+        }
+        if not all(any(indices[f] is not None for f in group) for group in self.required):
+            return None
+        return ColumnMap(indices, self.take, self.width_fields)
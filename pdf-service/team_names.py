@@ -0,0 +1,61 @@
+"""
+Memoized team-name normalization.
+
+Schedule grids repeat the same few dozen opponent cells hundreds of times:
+every school in a district plays the same opponents, and weekly re-issues
+repeat them all. A NamePipeline runs a cell through a fixed chain of
+cleanup steps once and remembers the result, so each repeat costs only a
+dict lookup. Each worker process keeps its own bounded memo, shared by every
+request that process handles. The steps are plain functions over
+precompiled patterns; any extractor can build its own pipeline from them.
+"""
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict
+
+from config import PDF_NAME_CACHE_SIZE
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def collapse_whitespace(name: str) -> str:
+    """Newlines and runs of whitespace to single spaces, trimmed."""
+    return _WHITESPACE.sub(' ', name).strip()
+
+
+class NamePipeline:
+    """
+    steps run left to right, each taking the previous step's output. The
+    last step may return any hashable value, e.g. a (name, city) tuple.
+    """
+
+    def __init__(self, *steps: Callable[[Any], Any], max_entries: int = PDF_NAME_CACHE_SIZE):
+        self.steps = steps
+        self.max_entries = max_entries
+        self._normalize = lru_cache(maxsize=max_entries)(self._run) if max_entries > 0 else self._run
+
+    def __call__(self, raw: str) -> Any:
+        return self._normalize(raw)
+
+    def _run(self, raw: str) -> Any:
+        value = raw
+        for step in self.steps:
+            value = step(value)
+        return value
+
+    def clear(self) -> None:
+        if hasattr(self._normalize, 'cache_clear'):
+            self._normalize.cache_clear()
+
+    def stats(self) -> Dict:
+        if not hasattr(self._normalize, 'cache_info'):
+            return {'entries': 0, 'maxEntries': 0, 'hits': 0, 'misses': 0, 'hitRate': 0.0}
+        info = self._normalize.cache_info()
+        lookups = info.hits + info.misses
+        return {
+            'entries': info.currsize,
+            'maxEntries': info.maxsize,
+            'hits': info.hits,
+            'misses': info.misses,
+            'hitRate': info.hits / lookups if lookups else 0.0,
+        }
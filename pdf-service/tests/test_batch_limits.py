@@ -0,0 +1,93 @@
+"""Batch file and byte limits are enforced before any PDF is read or inflated."""
+import io
+import zipfile
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import pdf_service
+from benchmarks.synthetic import GENERATORS
+from pdf_service import _BatchBudget, _read_zip_entries
+
+PDF = GENERATORS['maxpreps']()
+
+
+def _zip(entries) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, data in entries:
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def no_inflating(monkeypatch):
+    def read(*args, **kwargs):
+        raise AssertionError("entry inflated")
+    monkeypatch.setattr(zipfile.ZipFile, 'read', read)
+
+
+def test_zip_entries_are_read_within_limits():
+    data = _zip([('a.pdf', PDF), ('week2/b.PDF', PDF), ('notes.txt', b'x'), ('__MACOSX/._a.pdf', b'x')])
+    budget = _BatchBudget()
+    entries = _read_zip_entries('schedules.zip', data, budget)
+    assert [(name, content) for name, content in entries] == [('a.pdf', PDF), ('week2/b.PDF', PDF)]
+    assert (budget.files, budget.bytes) == (2, 2 * len(PDF))
+
+
+def test_too_many_zip_entries_rejected_unread(monkeypatch, no_inflating):
+    monkeypatch.setattr(pdf_service, 'PDF_BATCH_MAX_FILES', 3)
+    with pytest.raises(HTTPException) as e:
+        _read_zip_entries('schedules.zip', _zip([(f'{i}.pdf', PDF) for i in range(4)]), _BatchBudget())
+    assert e.value.status_code == 400
+    assert e.value.detail == "Too many files (at least 4). Maximum is 3."
+
+
+def test_zip_bytes_over_cap_rejected_unread(monkeypatch, no_inflating):
+    monkeypatch.setattr(pdf_service, 'PDF_BATCH_MAX_BYTES', 1024 * 1024)
+    entry = b'%PDF-1.4\n' + b'0' * (600 * 1024)
+    with pytest.raises(HTTPException) as e:
+        _read_zip_entries('schedules.zip', _zip([('a.pdf', entry), ('b.pdf', entry)]), _BatchBudget())
+    assert e.value.detail == "Batch too large. Maximum is 1MB of PDFs."
+
+
+def test_oversized_entry_is_a_file_error_not_charged(monkeypatch):
+    monkeypatch.setattr(pdf_service, 'MAX_PDF_SIZE_BYTES', 1024)
+    data = _zip([('big.pdf', b'%PDF-1.4\n' + b'0' * 4096), ('ok.pdf', b'%PDF-1.4\n')])
+    budget = _BatchBudget()
+    entries = _read_zip_entries('schedules.zip', data, budget)
+    assert isinstance(entries[0][1], HTTPException) and entries[0][1].status_code == 400
+    assert entries[1] == ('ok.pdf', b'%PDF-1.4\n')
+    assert (budget.files, budget.bytes) == (2, len(b'%PDF-1.4\n'))
+
+
+def test_budget_spans_the_whole_batch(monkeypatch):
+    monkeypatch.setattr(pdf_service, 'PDF_BATCH_MAX_FILES', 3)
+    budget = _BatchBudget()
+    budget.take(2, 0)
+    with pytest.raises(HTTPException):
+        _read_zip_entries('schedules.zip', _zip([('a.pdf', PDF), ('b.pdf', PDF)]), budget)
+
+
+def test_plain_files_counted_before_reading(monkeypatch):
+    monkeypatch.setattr(pdf_service, 'PDF_BATCH_MAX_FILES', 2)
+
+    async def read_upload(file):
+        raise AssertionError("upload read")
+    monkeypatch.setattr(pdf_service, '_read_pdf_upload', read_upload)
+
+    response = TestClient(pdf_service.app).post(
+        '/extract/batch', files=[('files', (f'{i}.pdf', PDF, 'application/pdf')) for i in range(3)]
+    )
+    assert response.status_code == 400
+    assert response.json() == {'detail': "Too many files (at least 3). Maximum is 2."}
+
+
+def test_plain_file_bytes_over_cap(monkeypatch):
+    monkeypatch.setattr(pdf_service, 'PDF_BATCH_MAX_BYTES', len(PDF) + 1)
+    response = TestClient(pdf_service.app).post(
+        '/extract/batch', files=[('files', (f'{i}.pdf', PDF, 'application/pdf')) for i in range(2)]
+    )
+    assert response.status_code == 400
+    assert response.json()['detail'].startswith("Batch too large.")
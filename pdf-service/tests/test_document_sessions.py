@@ -0,0 +1,74 @@
+"""DocumentSessions: token reuse, TTL expiry and the byte cap."""
+import pytest
+
+import document_sessions
+from document_sessions import DocumentSessions
+from game_records import encode_json, pack_games
+
+
+def _games(school: str, count: int):
+    return [
+        {'date': f'9/{day}', 'time': '7:00 PM', 'homeTeam': school, 'awayTeam': f'Opponent {day}', 'isCompleted': False}
+        for day in range(1, count + 1)
+    ]
+
+
+def _size(games_by_school) -> int:
+    return len(encode_json({school: pack_games(games) for school, games in games_by_school.items()}))
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(document_sessions.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_session_keeps_games_and_counts():
+    sessions = DocumentSessions(ttl_seconds=60, max_bytes=1 << 20)
+    games_by_school = {'Austin': _games('Austin', 3), 'Bowie': _games('Bowie', 1)}
+    token = sessions.create('doc', 'texas_isd', games_by_school)
+
+    session = sessions.get(token)
+    assert session.format == 'texas_isd'
+    assert session.game_counts == {'Austin': 3, 'Bowie': 1}
+    assert session.games_by_school['Bowie'][0]['awayTeam'] == 'Opponent 1'
+    assert sessions.create('doc', 'texas_isd', games_by_school) == token
+    assert sessions.stats()['sessions'] == 1
+
+
+def test_sessions_expire_after_ttl(clock):
+    sessions = DocumentSessions(ttl_seconds=60, max_bytes=1 << 20)
+    token = sessions.create('doc', 'iowa_hs', {'Ames': _games('Ames', 2)})
+
+    clock[0] += 59
+    assert sessions.get(token) is not None
+    # Uploading the document again pushes the expiry back
+    assert sessions.create('doc', 'iowa_hs', {'Ames': _games('Ames', 2)}) == token
+    clock[0] += 59
+    assert sessions.get(token) is not None
+    clock[0] += 1
+    assert sessions.get(token) is None
+    assert sessions.stats()['bytes'] == 0
+    assert sessions.create('doc', 'iowa_hs', {'Ames': _games('Ames', 2)}) != token
+
+
+def test_byte_cap_drops_least_recently_used():
+    games_by_school = {'Austin': _games('Austin', 5)}
+    size = _size(games_by_school)
+    sessions = DocumentSessions(ttl_seconds=60, max_bytes=size * 2)
+
+    first = sessions.create('a', 'texas_isd', games_by_school)
+    second = sessions.create('b', 'texas_isd', games_by_school)
+    sessions.get(first)
+    third = sessions.create('c', 'texas_isd', games_by_school)
+
+    assert sessions.get(second) is None
+    assert sessions.get(first) is not None and sessions.get(third) is not None
+    assert sessions.stats()['bytes'] == size * 2
+
+
+def test_map_larger_than_store_is_not_kept():
+    sessions = DocumentSessions(ttl_seconds=60, max_bytes=64)
+    assert sessions.create('doc', 'texas_isd', {'Austin': _games('Austin', 20)}) is None
+    assert sessions.stats()['sessions'] == 0
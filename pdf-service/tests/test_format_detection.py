@@ -0,0 +1,53 @@
+"""FormatRegistry ranking, and detection of each synthetic format."""
+import io
+
+import pdfplumber
+import pytest
+
+from benchmarks.synthetic import GENERATORS
+from format_detection import FormatRegistry
+from pdf_service import FORMATS
+from text_backends import stream_text
+
+
+def _registry() -> FormatRegistry:
+    registry = FormatRegistry()
+    registry.register('two_of_three', indicators=['Varsity', 'Schedule', r'Home\s+Away'], threshold=2)(None)
+    registry.register('one_of_one', indicators=['Schedule'], priority=50)(None)
+    registry.register('one_of_one_late', indicators=[('schedule', 0)], priority=200)(None)
+    registry.register('by_name_only')(None)
+    return registry
+
+
+def test_rank_orders_by_confidence_then_priority():
+    ranked = _registry().rank("Varsity Football Schedule")
+    assert [c.name for c in ranked] == ['one_of_one', 'two_of_three']
+    assert ranked[1].matched == 2
+    assert ranked[1].confidence == pytest.approx(2 / 3)
+
+
+def test_threshold_and_case():
+    registry = _registry()
+    assert registry.rank("Varsity only") == []
+    assert registry.detects('one_of_one_late', "schedule")
+    assert not registry.detects('one_of_one', "schedule")
+    assert [c.name for c in registry.rank("Home  Away Schedule")] == ['one_of_one', 'two_of_three']
+
+
+def test_format_without_indicators_is_never_detected():
+    registry = _registry()
+    assert not registry.detects('by_name_only', "Varsity Football Schedule")
+    assert registry.names() == ['two_of_three', 'one_of_one', 'one_of_one_late', 'by_name_only']
+
+
+@pytest.mark.parametrize('name', ['schedule_star', 'cif_bracket', 'texas_isd', 'iowa_hs'])
+def test_synthetic_pdfs_rank_their_own_format_first(name):
+    with pdfplumber.open(io.BytesIO(GENERATORS[name]())) as pdf:
+        text = stream_text(pdf.pages[0])
+    assert FORMATS.rank(text)[0].name == name
+
+
+def test_maxpreps_is_the_fallback():
+    with pdfplumber.open(io.BytesIO(GENERATORS['maxpreps']())) as pdf:
+        text = stream_text(pdf.pages[0])
+    assert FORMATS.rank(text) == []
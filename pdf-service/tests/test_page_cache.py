@@ -0,0 +1,81 @@
+"""PageCache storage, and republished documents merged from cached and fresh pages."""
+import pytest
+from fastapi.testclient import TestClient
+
+import pdf_service
+from benchmarks.pdf_writer import build_pdf
+from benchmarks.synthetic import PAGE_BUILDERS
+from page_cache import PageCache, hash_prefix
+from result_cache import ResultCache
+
+HASH_A = 'a' * 64
+HASH_B = 'b' * 64
+
+
+def test_lookup_returns_cached_pages_by_index():
+    cache = PageCache(max_bytes=1 << 20)
+    cache.store('texas_isd', HASH_A, [{'page': 1, 'gamesBySchool': {}}])
+    cache.store('texas_isd', HASH_B, [])
+
+    found = cache.lookup('texas_isd', [HASH_B, None, HASH_A, 'c' * 64])
+    assert found == {0: [], 2: [{'page': 1, 'gamesBySchool': {}}]}
+    assert cache.lookup('iowa_hs', [HASH_A]) == {}
+    # Copies, so a caller renumbering events doesn't change the cache
+    found[2][0]['page'] = 3
+    assert cache.lookup('texas_isd', [HASH_A])[0][0]['page'] == 1
+    assert cache.known() == {hash_prefix(HASH_A), hash_prefix(HASH_B)}
+    assert (cache.hits, cache.misses) == (3, 3)
+
+
+def test_store_evicts_least_recently_used():
+    events = [{'page': 1, 'gamesBySchool': {'Austin': []}}]
+    cache = PageCache(max_bytes=2 * len(str(events)))
+    cache.store('texas_isd', HASH_A, events)
+    cache.store('texas_isd', HASH_B, events)
+    cache.lookup('texas_isd', [HASH_A])
+    cache.store('texas_isd', 'c' * 64, events)
+
+    assert cache.lookup('texas_isd', [HASH_A, HASH_B]).keys() == {0}
+    assert cache.evictions == 1
+    disabled = PageCache(max_bytes=0)
+    disabled.store('texas_isd', HASH_A, events)
+    assert disabled.stats()['entries'] == 0
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(pdf_service, 'PDF_WARMUP', False)
+    monkeypatch.setattr(pdf_service, 'result_cache', ResultCache(db_path=None))
+    monkeypatch.setattr(pdf_service, 'page_cache', PageCache())
+    with TestClient(pdf_service.app) as client:
+        yield client
+
+
+def _extract(client: TestClient, pages) -> dict:
+    response = client.post(
+        '/extract', files={'file': ('schedule.pdf', build_pdf(pages), 'application/pdf')},
+        params={'school': '__all__'},
+    )
+    assert response.status_code == 200
+    result = response.json()
+    result.pop('documentToken', None)
+    return result
+
+
+@pytest.mark.parametrize('name, options', [
+    ('texas_isd', {'pages': 4, 'games': 12}),
+    ('iowa_hs', {'pages': 4, 'schools': 4}),
+])
+def test_republished_pages_merge_in_page_order(client, monkeypatch, name, options):
+    first = PAGE_BUILDERS[name](seed=1, **options)
+    other = PAGE_BUILDERS[name](seed=2, **options)
+    _extract(client, first)
+
+    # One page changed, and the unchanged pages moved around it
+    republished = [first[2], other[1], first[0], first[3]]
+    merged = _extract(client, republished)
+    assert pdf_service.page_cache.hits == 3
+
+    monkeypatch.setattr(pdf_service, 'result_cache', ResultCache(db_path=None))
+    monkeypatch.setattr(pdf_service, 'page_cache', PageCache(max_bytes=0))
+    assert merged == _extract(client, republished)
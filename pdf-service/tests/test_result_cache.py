@@ -0,0 +1,70 @@
+"""ResultCache single-flight: one compute per key, and takeover when the leader is cancelled."""
+import asyncio
+
+import pytest
+
+from result_cache import ResultCache
+
+
+def test_concurrent_callers_share_one_compute():
+    cache = ResultCache(db_path=None)
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {'games': [1, 2]}
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_compute('k', compute) for _ in range(3)))
+
+    results = asyncio.run(main())
+    assert calls == [1]
+    assert results == [{'games': [1, 2]}] * 3
+    # Each caller gets its own copy
+    results[0]['games'].append(3)
+    assert results[1] == {'games': [1, 2]}
+    assert (cache.misses, cache.coalesced) == (1, 2)
+
+    assert asyncio.run(cache.get_or_compute('k', compute)) == {'games': [1, 2]}
+    assert cache.hits == 1
+
+
+def test_waiter_takes_over_when_leader_is_cancelled():
+    cache = ResultCache(db_path=None)
+
+    async def main():
+        async def stuck():
+            await asyncio.Event().wait()
+
+        async def compute():
+            return {'by': 'waiter'}
+
+        leader = asyncio.ensure_future(cache.get_or_compute('k', stuck))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(cache.get_or_compute('k', compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(main()) == {'by': 'waiter'}
+    assert cache.coalesced == 1
+    assert cache.misses == 2
+
+
+def test_failure_reaches_waiters():
+    cache = ResultCache(db_path=None)
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError('bad pdf')
+
+    async def main():
+        return await asyncio.gather(
+            cache.get_or_compute('k', compute), cache.get_or_compute('k', compute), return_exceptions=True
+        )
+
+    assert [type(e) for e in asyncio.run(main())] == [ValueError, ValueError]
+    assert cache.stats()['entries'] == 0
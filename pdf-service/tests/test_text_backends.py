@@ -0,0 +1,16 @@
+"""The stream text backend gives pdfplumber's page text on the synthetic formats."""
+import io
+
+import pdfplumber
+import pytest
+
+from benchmarks.synthetic import GENERATORS
+from text_backends import pdfplumber_text, stream_text
+
+
+@pytest.mark.parametrize('name', sorted(GENERATORS))
+def test_stream_text_matches_pdfplumber(name):
+    with pdfplumber.open(io.BytesIO(GENERATORS[name](pages=3))) as pdf:
+        for page in pdf.pages:
+            assert stream_text(page) == pdfplumber_text(page)
+
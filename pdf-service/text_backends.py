@@ -0,0 +1,207 @@
+"""
+Page text extraction backends.
+
+The line-based extractors (MaxPreps, Schedule Star, CIF brackets) only run
+regexes over page text in reading order. For them, pdfplumber's
+extract_text() does more work than needed: it builds a full LTChar object
+and a pdfplumber char dict for every glyph before grouping them into lines.
+The "stream" backend runs the same pdfminer content-stream interpreter but
+keeps only each glyph's text and box. It then groups them the way
+pdfplumber does with its default settings: lines are clusters of `top`
+within 3pt, and a word breaks at whitespace or a gap over 3pt. Lines are
+joined with newlines and words with single spaces. stream_words() likewise
+mirrors extract_words() for the grid extractors. A page's glyphs are kept on
+the page object, so its text and words share one interpreter pass.
+
+A page whose text is rotated or set in a vertical font gets
+pdfplumber's output instead, since pdfplumber orders such text
+differently. Formats choose a backend when they register;
+benchmarks/text_backends.py compares the two on timing and output.
+"""
+import itertools
+from typing import Callable, Dict, Iterator, List, NamedTuple
+
+from pdfminer.pdfdevice import PDFTextDevice
+from pdfminer.pdffont import PDFUnicodeNotDefined
+from pdfminer.pdfinterp import PDFPageInterpreter
+from pdfminer.utils import apply_matrix_pt
+
+# pdfplumber's defaults for extract_text()
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+
+# pdfplumber expands these when extracting text
+LIGATURES = {
+    "ﬀ": "ff",
+    "ﬃ": "ffi",
+    "ﬄ": "ffl",
+    "ﬁ": "fi",
+    "ﬂ": "fl",
+    "ﬆ": "st",
+    "ﬅ": "st",
+}
+
+class Glyph(NamedTuple):
+    """One rendered character, in pdfplumber's page coordinates."""
+    top: float
+    bottom: float
+    x0: float
+    x1: float
+    text: str
+    fontname: str
+
+
+class NeedsLayout(Exception):
+    """The page has text that only the pdfplumber backend orders correctly."""
+
+
+def pdfplumber_text(page) -> str:
+    return page.extract_text() or ""
+
+
+def stream_text(page) -> str:
+    """Page text from the content stream, grouped like pdfplumber's extract_text()."""
+    lines = []
+    for line in _iter_lines(page_glyphs(page), Y_TOLERANCE):
+        words = [_word_text(word) for word in _iter_words(line, False, X_TOLERANCE, Y_TOLERANCE)]
+        if words:
+            lines.append(' '.join(words))
+    return '\n'.join(lines)
+
+
+def pdfplumber_words(page, **options) -> List[Dict]:
+    return page.extract_words(**options)
+
+
+def stream_words(
+    page,
+    keep_blank_chars: bool = False,
+    x_tolerance: float = X_TOLERANCE,
+    y_tolerance: float = Y_TOLERANCE,
+) -> List[Dict]:
+    """
+    Words from the content stream, as extract_words() with the same options
+    returns them, plus the first character's fontname.
+    """
+    words = []
+    for line in _iter_lines(page_glyphs(page), y_tolerance):
+        for word in _iter_words(line, keep_blank_chars, x_tolerance, y_tolerance):
+            words.append({
+                'text': _word_text(word),
+                'x0': min(g.x0 for g in word),
+                'x1': max(g.x1 for g in word),
+                'top': min(g.top for g in word),
+                'bottom': max(g.bottom for g in word),
+                'fontname': word[0].fontname,
+            })
+    return words
+
+
+def page_glyphs(page) -> List[Glyph]:
+    """A page's glyphs in content stream order, interpreted once per page."""
+    glyphs = getattr(page, '_stream_glyphs', None)
+    if glyphs is None:
+        collector = _GlyphCollector(page)
+        try:
+            PDFPageInterpreter(page.pdf.rsrcmgr, collector).process_page(page.page_obj)
+            glyphs = collector.glyphs
+        except NeedsLayout:
+            glyphs = NeedsLayout
+        page._stream_glyphs = glyphs
+    if glyphs is NeedsLayout:
+        raise NeedsLayout()
+    return glyphs
+
+
+def _iter_lines(glyphs: List[Glyph], tolerance: float) -> Iterator[List[Glyph]]:
+    """
+    Lines top to bottom: glyphs whose sorted `top` values chain within
+    tolerance, each sorted by x0 (stably, as pdfplumber does).
+    """
+    if not glyphs:
+        return
+    cluster_of = {}
+    cluster = 0
+    last = None
+    for top in sorted(set(g.top for g in glyphs)):
+        if last is not None and top > last + tolerance:
+            cluster += 1
+        cluster_of[top] = cluster
+        last = top
+    ordered = sorted(glyphs, key=lambda g: cluster_of[g.top])
+    for _, line in itertools.groupby(ordered, key=lambda g: cluster_of[g.top]):
+        yield sorted(line, key=lambda g: g.x0)
+
+
+def _iter_words(line: List[Glyph], keep_blank_chars: bool, x_tolerance: float, y_tolerance: float) -> Iterator[List[Glyph]]:
+    """Split a line where pdfplumber's WordExtractor would."""
+    word: List[Glyph] = []
+    for glyph in line:
+        if not keep_blank_chars and glyph.text.isspace():
+            if word:
+                yield word
+            word = []
+            continue
+        if word:
+            prev = word[-1]
+            if glyph.x0 > prev.x1 + x_tolerance or abs(glyph.top - prev.top) > y_tolerance:
+                yield word
+                word = []
+        word.append(glyph)
+    if word:
+        yield word
+
+
+def _word_text(word: List[Glyph]) -> str:
+    return ''.join(LIGATURES.get(g.text, g.text) for g in word)
+
+
+class _GlyphCollector(PDFTextDevice):
+    """pdfminer device that records glyph boxes as LTChar and pdfplumber would compute them."""
+
+    def __init__(self, page):
+        super().__init__(page.pdf.rsrcmgr)
+        self.glyphs: List[Glyph] = []
+        # pdfplumber's conversion from pdfminer coordinates
+        self._height = page.height
+        self._mediabox_x0, self._mediabox_top = page.mediabox[0], page.mediabox[1]
+
+    def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate) -> float:
+        if font.is_vertical():
+            raise NeedsLayout()
+        a, b, c, d, _e, _f = matrix
+        if not (a * d * scaling > 0 and b * c <= 0):
+            raise NeedsLayout()
+
+        try:
+            text = font.to_unichr(cid)
+        except PDFUnicodeNotDefined:
+            text = f"(cid:{cid})"
+        adv = font.char_width(cid) * fontsize * scaling
+        bottom = font.get_descent() * fontsize + rise
+        corners = [
+            apply_matrix_pt(matrix, point)
+            for point in ((0, bottom), (0, bottom + fontsize), (adv, bottom), (adv, bottom + fontsize))
+        ]
+        xs = [p[0] for p in corners]
+        ys = [p[1] for p in corners]
+        self.glyphs.append(Glyph(
+            top=self._height - max(ys) + self._mediabox_top,
+            bottom=self._height - min(ys) + self._mediabox_top,
+            x0=min(xs) + self._mediabox_x0,
+            x1=max(xs) + self._mediabox_x0,
+            text=text,
+            fontname=font.fontname,
+        ))
+        return adv
+
+
+TEXT_BACKENDS: Dict[str, Callable[..., str]] = {
+    'pdfplumber': pdfplumber_text,
+    'stream': stream_text,
+}
+
+WORD_BACKENDS: Dict[str, Callable[..., List[Dict]]] = {
+    'pdfplumber': pdfplumber_words,
+    'stream': stream_words,
+}
@@ -0,0 +1,60 @@
+"""
+Startup warm-up and readiness.
+
+A fresh process pays for more than its imports on its first request:
+worker processes are spawned on demand and each imports the parser stack,
+and the first page any worker parses runs code paths (font metrics, layout
+analysis, the table finder, every extractor's patterns) for the first time.
+On a deploy or scale-out that lands on whichever requests arrive first.
+
+At startup the service instead starts every worker, and each runs the
+warm-up PDF (warmup.pdf: one small page of every format) through format
+detection and every extractor before taking work. Readiness records when
+that finished; /ready answers 503 until then, so a load balancer only
+routes traffic to warm processes.
+
+warmup.pdf is generated with `python -m benchmarks.synthetic warmup warmup.pdf`.
+"""
+import os
+import time
+from typing import Dict, Optional
+
+WARMUP_PDF = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'warmup.pdf')
+
+STARTING = 'starting'
+READY = 'ready'
+FAILED = 'failed'
+
+
+def read_warmup_pdf() -> bytes:
+    with open(WARMUP_PDF, 'rb') as f:
+        return f.read()
+
+
+class Readiness:
+    """Startup state reported by /ready, timed from when it was created."""
+
+    def __init__(self):
+        self.state = STARTING
+        self.started = time.perf_counter()
+        self.seconds: Optional[float] = None
+        self.detail: Dict = {}
+
+    @property
+    def ready(self) -> bool:
+        return self.state == READY
+
+    def mark_ready(self, **detail) -> None:
+        self._finish(READY, detail)
+
+    def mark_failed(self, error: str) -> None:
+        self._finish(FAILED, {'error': error})
+
+    def _finish(self, state: str, detail: Dict) -> None:
+        self.state = state
+        self.seconds = time.perf_counter() - self.started
+        self.detail = detail
+
+    def as_dict(self) -> Dict:
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self.started
+        return {'status': self.state, 'startupSeconds': round(seconds, 3), **self.detail}
@@ -0,0 +1,302 @@
+"""
+Bounded process pool for CPU-bound PDF extraction.
+
+pdfplumber/pdfminer are pure Python, so extraction runs in worker processes
+instead of threads. Each extraction is admitted to a lane (see scheduling):
+a fixed number of requests may wait in each lane, and once a lane's queue
+is full new requests for it are rejected immediately so the caller can
+retry instead of piling up behind a large PDF. Waiting happens on the event
+loop, and a task is only handed to the executor once a worker is free for
+it, so the lanes' order is the order workers pick work up in.
+
+Worker processes start on demand, so the first requests after a deploy
+would each wait for a process to spawn and import the parser stack.
+warm_up() starts them all up front, each running the pool's initializer.
+"""
+import asyncio
+import functools
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.shared_memory import SharedMemory
+from queue import Empty
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, Optional, Sequence
+
+from config import PDF_QUEUE_SIZE, PDF_WORKERS
+from scheduling import INTERACTIVE, Lane, LaneScheduler, default_lanes
+
+
+class PoolSaturated(Exception):
+    """Raised when every worker is busy and the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Extraction queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class ExtractionPool:
+    """
+    Process pool with admission control.
+
+    At most `workers` extractions run at once, and each lane limits how
+    many of them it runs and how many more wait (by default the
+    interactive lane may use every worker and queue `queue_size`).
+    Admission is decided on the event loop, so the counters need no locking.
+    """
+
+    def __init__(
+        self,
+        workers: int = PDF_WORKERS,
+        queue_size: int = PDF_QUEUE_SIZE,
+        initializer: Optional[Callable[[], Any]] = None,
+        lanes: Optional[Sequence[Lane]] = None,
+    ):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.scheduler = LaneScheduler(workers, lanes or default_lanes(workers, queue_size))
+        # Called with (lane, seconds waited) as each task gets a worker
+        self.wait_observer: Optional[Callable[[str, float], None]] = None
+        # Run by every worker process as it starts; must not raise, or the
+        # executor treats the pool as broken
+        self.initializer = initializer
+        self._executor: Optional[ProcessPoolExecutor] = None
+        # Started on first stream() or warm_up(); serves the queues that
+        # carry streamed items and the warm-up barrier
+        self._manager = None
+
+    @property
+    def lanes(self) -> Dict[str, Lane]:
+        return self.scheduler.lanes
+
+    @property
+    def running(self) -> int:
+        return self.scheduler.running
+
+    @property
+    def queued(self) -> int:
+        return sum(lane.queued for lane in self.lanes.values())
+
+    def available(self, lane: str = INTERACTIVE) -> int:
+        """Tasks that can be admitted to lane right now without PoolSaturated."""
+        return self.lanes[lane].available
+
+    def limit(self, lane: str = INTERACTIVE) -> int:
+        """Most tasks of lane that run at once."""
+        return min(self.workers, self.lanes[lane].limit)
+
+    def stats(self) -> Dict:
+        return {
+            'workers': self.workers,
+            'running': self.running,
+            'queued': self.queued,
+            'lanes': {
+                name: {
+                    'limit': lane.limit,
+                    'queueSize': lane.queue_size,
+                    'weight': lane.weight,
+                    'running': lane.running,
+                    'queued': lane.queued,
+                    'avgRunSeconds': round(lane.avg_run_seconds, 3),
+                }
+                for name, lane in self.lanes.items()
+            },
+        }
+
+    def start(self) -> None:
+        if self._executor is None:
+            # spawn: forking a process that already runs an event loop and
+            # uvicorn's threads is not safe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=self.initializer,
+            )
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
+
+    async def warm_up(self, timeout: float) -> int:
+        """
+        Start every worker process now and wait until each has run the
+        initializer. Returns the number of distinct worker processes seen.
+
+        One task per worker, each waiting at a barrier for the others, so no
+        worker can finish its task and take another's while one is still
+        starting.
+        """
+        self.start()
+        loop = asyncio.get_running_loop()
+        if self._manager is None:
+            self._manager = multiprocessing.get_context("spawn").Manager()
+        barrier = self._manager.Barrier(self.workers)
+        futures = []
+        for _ in range(self.workers):
+            # Held outside the lanes; requests arriving meanwhile wait
+            self.scheduler.reserved += 1
+            future = self._executor.submit(_meet, barrier, timeout)
+            future.add_done_callback(functools.partial(self._release_soon, loop, None))
+            futures.append(asyncio.wrap_future(future, loop=loop))
+        pids = await asyncio.gather(*futures)
+        return len(set(pids))
+
+    def retry_after(self, lane: str = INTERACTIVE) -> int:
+        """Rough number of seconds until a slot in lane frees up."""
+        state = self.lanes[lane]
+        backlog = state.queued + 1
+        return max(1, math.ceil(state.avg_run_seconds * backlog / state.limit))
+
+    async def _acquire(self, lane: str, cost: float) -> None:
+        """Admit a task to lane (or raise PoolSaturated) and wait for its worker."""
+        if self.scheduler.full(lane):
+            raise PoolSaturated(self.retry_after(lane))
+        self.start()
+        waited = time.perf_counter()
+        await self.scheduler.acquire(lane, cost)
+        if self.wait_observer is not None:
+            self.wait_observer(lane, time.perf_counter() - waited)
+
+    def _observe_run(self, lane: str, elapsed: float) -> None:
+        state = self.lanes[lane]
+        state.avg_run_seconds = 0.8 * state.avg_run_seconds + 0.2 * elapsed
+
+    async def run(self, fn: Callable[..., Any], *args: Any, lane: str = INTERACTIVE, cost: float = 0.0) -> Any:
+        """
+        Run fn(*args) in a worker process, or raise PoolSaturated. lane and
+        cost (estimated seconds) decide when it gets a worker.
+        """
+        await self._acquire(lane, cost)
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._executor.submit(_timed_call, fn, *args)
+        except BaseException:
+            self.scheduler.release(lane)
+            raise
+        # A caller that stops waiting (timeout, disconnect) can't interrupt
+        # the worker running its task; keep the slot counted until it
+        # really finishes.
+        future.add_done_callback(functools.partial(self._release_soon, loop, lane))
+        try:
+            elapsed, result = await asyncio.wrap_future(future, loop=loop)
+            self._observe_run(lane, elapsed)
+            return result
+        except BrokenProcessPool:
+            # A worker died (e.g. killed for memory); start a fresh pool for
+            # the next request and report this one as failed
+            self.shutdown()
+            raise
+
+    def _release_soon(self, loop: asyncio.AbstractEventLoop, lane: Optional[str], _future) -> None:
+        # Called from the executor's thread; counters belong to the loop
+        if not loop.is_closed():
+            loop.call_soon_threadsafe(self.scheduler.release, lane)
+
+    async def stream(
+        self,
+        fn: Callable[..., Iterator[Any]],
+        *args: Any,
+        lane: str = INTERACTIVE,
+        cost: float = 0.0,
+    ) -> AsyncIterator[Any]:
+        """
+        Run the generator function fn(*args) in a worker process and yield
+        its items as the worker produces them. Raises PoolSaturated on the
+        first iteration when the lane's queue is full.
+        """
+        await self._acquire(lane, cost)
+        loop = asyncio.get_running_loop()
+        try:
+            if self._manager is None:
+                self._manager = multiprocessing.get_context("spawn").Manager()
+            queue = self._manager.Queue()
+            future = self._executor.submit(_stream_call, queue, fn, *args)
+        except BaseException:
+            self.scheduler.release(lane)
+            raise
+        # As in run(): a consumer that stops reading doesn't stop the
+        # worker, so the slot is held until the worker finishes.
+        future.add_done_callback(functools.partial(self._release_soon, loop, lane))
+        try:
+            while True:
+                try:
+                    kind, value = await loop.run_in_executor(None, functools.partial(queue.get, timeout=0.5))
+                except Empty:
+                    # Nothing new yet. If the worker died this raises;
+                    # otherwise its end marker is already queued.
+                    if future.done():
+                        future.result()
+                    continue
+                if kind == "item":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    break
+            elapsed = await asyncio.wrap_future(future, loop=loop)
+            self._observe_run(lane, elapsed)
+        except BrokenProcessPool:
+            self.shutdown()
+            raise
+
+
+class SharedBytes:
+    """
+    Bytes copied once into a shared memory block so several worker tasks can
+    read them by name instead of each task pickling its own copy. The block
+    is freed when the context exits.
+    """
+
+    def __init__(self, data: bytes):
+        self.size = len(data)
+        self._shm = SharedMemory(create=True, size=max(1, self.size))
+        self._shm.buf[:self.size] = data
+        self.name = self._shm.name
+
+    def __enter__(self) -> "SharedBytes":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._shm.close()
+        self._shm.unlink()
+
+    @staticmethod
+    def read(name: str, size: int) -> bytes:
+        """Copy the bytes out of a block created by another process."""
+        shm = SharedMemory(name=name)
+        try:
+            return bytes(shm.buf[:size])
+        finally:
+            shm.close()
+
+
+def _timed_call(fn: Callable[..., Any], *args: Any):
+    """Runs inside the worker so queue wait time is not counted."""
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def _meet(barrier, timeout: float) -> int:
+    """Runs inside the worker: wait for the other workers' warm-up tasks."""
+    barrier.wait(timeout)
+    return os.getpid()
+
+
+def _stream_call(queue, fn: Callable[..., Iterator[Any]], *args: Any) -> float:
+    """Runs inside the worker: forwards each item of fn(*args) to queue."""
+    start = time.perf_counter()
+    try:
+        for item in fn(*args):
+            queue.put(("item", item))
+    except Exception as e:
+        queue.put(("error", e))
+    else:
+        queue.put(("done", None))
+    return time.perf_counter() - start